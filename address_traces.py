@@ -0,0 +1,185 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from traces import OP_READ, OP_WRITE, concatenate_traces, write_trace
+
+# Memory addresses captured from real programs, turned into page references.
+#   LACKEY: valgrind --tool=lackey --trace-mem=yes output, e.g. " L 0421ebc0,4".
+#     I is an instruction fetch, L a load, S a store and M a modify (a load then a store).
+#   RAW: one address per line, as "[R|W] [process_id:]address". Addresses are
+#     decimal or 0x-prefixed hex, or bare hex with base=16.
+ADDRESS_FORMATS = ("LACKEY", "RAW")
+
+# Which accesses become references: every access, or only the reads or writes
+ADDRESS_OPERATIONS = ("ALL", "READS", "WRITES")
+
+# Simulator sizes are in KB; addresses are in bytes
+KB = 1024
+
+def split_address(address, page_bytes):
+    """(page_num, offset) of a byte address."""
+    return divmod(address, page_bytes)
+
+def lackey_accesses(lines, process_id=1, instructions=True):
+    """(process_id, address, size, op) accesses from Lackey output.
+
+    Valgrind's own messages and any other lines that are not accesses are
+    skipped, since the traced program's output is mixed in with the trace.
+    """
+    process_id = str(process_id)
+    for line in lines:
+        fields = line.split()
+        if len(fields) != 2 or fields[0] not in ("I", "L", "S", "M"):
+            continue
+        kind = fields[0]
+        if kind == "I" and not instructions:
+            continue
+        address, _, size = fields[1].partition(",")
+        try:
+            address, size = int(address, 16), int(size or 1)
+        except ValueError:
+            continue
+        if kind != "S":
+            yield process_id, address, size, OP_READ
+        if kind in ("S", "M"):
+            yield process_id, address, size, OP_WRITE
+
+def raw_accesses(lines, process_id=1, base=0):
+    """(process_id, address, 1, op) accesses from a raw address dump; blank and # lines are skipped."""
+    process_id = str(process_id)
+    for line in lines:
+        fields = line.replace(",", " ").split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        op = OP_READ
+        if fields[0].upper() in ("R", "W"):
+            op = OP_WRITE if fields[0].upper() == "W" else OP_READ
+            fields = fields[1:]
+        if len(fields) != 1:
+            raise ValueError(f"Expected '[R|W] [process_id:]address', got {line.strip()!r}")
+        process, _, address = fields[0].rpartition(":")
+        yield process or process_id, int(address, base), 1, op
+
+def address_pages(accesses, page_bytes, operations="ALL", with_ops=False):
+    """(process_id, page_num[, op]) references for accesses, page_bytes to a page.
+
+    An access that straddles a page boundary references every page it touches.
+    """
+    if operations not in ADDRESS_OPERATIONS:
+        raise ValueError(f"Operations must be one of {', '.join(ADDRESS_OPERATIONS)}")
+    if page_bytes <= 0:
+        raise ValueError("Page size must be positive")
+    for process_id, address, size, op in accesses:
+        if operations == "READS" and op != OP_READ or operations == "WRITES" and op != OP_WRITE:
+            continue
+        first = address // page_bytes
+        last = (address + max(size, 1) - 1) // page_bytes
+        for page_num in range(first, last + 1):
+            yield (process_id, page_num, op) if with_ops else (process_id, page_num)
+
+def read_lines(path, start=0, end=None, chunk_bytes=1 << 20):
+    """Text lines of path from byte start to end, read chunk_bytes at a time.
+
+    start and end must fall on line boundaries, as line_ranges gives them.
+    """
+    with open(path, "rb") as f:
+        if end is None:
+            end = os.fstat(f.fileno()).st_size
+        f.seek(start)
+        left = end - start
+        while left > 0:
+            lines = f.readlines(min(chunk_bytes, left))
+            if not lines:
+                break
+            for line in lines:
+                # readlines can run a line past the hint; lines after the range are dropped
+                if left <= 0:
+                    return
+                left -= len(line)
+                yield line.decode("ascii", errors="replace")
+
+def line_ranges(path, parts):
+    """Split path into up to parts (start, end) byte ranges that each hold whole lines."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for part in range(1, parts):
+            f.seek(max(size * part // parts, bounds[-1]))
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                f.readline()  # Move to the start of the next line
+            bounds.append(f.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def address_references(path, format="LACKEY", page_bytes=4 * KB, operations="ALL", with_ops=False,
+                       process_id=1, instructions=True, base=0, start=0, end=None):
+    # References from one range of an address trace file, read as they are needed
+    if format not in ADDRESS_FORMATS:
+        raise ValueError(f"Address format must be one of {', '.join(ADDRESS_FORMATS)}")
+    lines = read_lines(path, start, end)
+    if format == "LACKEY":
+        accesses = lackey_accesses(lines, process_id, instructions)
+    else:
+        accesses = raw_accesses(lines, process_id, base)
+    return address_pages(accesses, page_bytes, operations, with_ops)
+
+class AddressTrace:
+    """An address trace file read as (process_id, page_num) references.
+
+    Like a TraceFile it can be handed to replay_trace, and each iteration
+    reads the file again, a chunk at a time. Options are those of
+    address_references.
+    """
+    def __init__(self, path, **options):
+        self.path = path
+        self.options = options
+
+    def __iter__(self):
+        return address_references(self.path, **self.options)
+
+def import_range(path, destination, start, end, compress, options):
+    # Convert one range of the text trace to a binary trace part, in a worker process
+    references = address_references(path, with_ops=True, start=start, end=end, **options)
+    return write_trace(destination, references, compress)
+
+def import_address_trace(path, destination, compress=False, workers=1, min_part_bytes=4 << 20, **options):
+    """Convert an address trace file to a binary trace (see traces.py).
+
+    Operations are kept in the records. With several workers the file is
+    split into line-aligned ranges of at least min_part_bytes, parsed in
+    parallel into parts that are joined in order. Options are those of
+    address_references. Returns the number of references written.
+    """
+    parts = min(workers, os.path.getsize(path) // max(min_part_bytes, 1))
+    ranges = line_ranges(path, max(parts, 1))
+    if len(ranges) <= 1:
+        return write_trace(destination, address_references(path, with_ops=True, **options), compress)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(destination))) as part_directory:
+        part_paths = [os.path.join(part_directory, f"{i}.trace") for i in range(len(ranges))]
+        with ProcessPoolExecutor(min(workers, len(ranges))) as pool:
+            futures = [pool.submit(import_range, path, part_path, start, end, compress, options)
+                       for part_path, (start, end) in zip(part_paths, ranges)]
+            for future in futures:
+                future.result()
+        return concatenate_traces(part_paths, destination)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert an address trace to the binary page trace format")
+    parser.add_argument("source", help="Lackey output (--trace-mem=yes) or a raw address dump")
+    parser.add_argument("destination")
+    parser.add_argument("--format", choices=ADDRESS_FORMATS, default="LACKEY")
+    parser.add_argument("--page-size", type=int, default=4, help="page size in KB, as in the simulators")
+    parser.add_argument("--operations", choices=ADDRESS_OPERATIONS, default="ALL")
+    parser.add_argument("--process-id", type=int, default=1, help="process of addresses given without one")
+    parser.add_argument("--no-instructions", action="store_true", help="skip Lackey instruction fetches")
+    parser.add_argument("--base", type=int, default=0, help="base of raw addresses; 16 for bare hex")
+    parser.add_argument("--compress", action="store_true", help="write delta/run-length records")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    written = import_address_trace(args.source, args.destination, args.compress, args.workers,
+                                   format=args.format, page_bytes=args.page_size * KB,
+                                   operations=args.operations, process_id=args.process_id,
+                                   instructions=not args.no_instructions, base=args.base)
+    print(f"Wrote {written} references to {args.destination}")
@@ -0,0 +1,171 @@
+import collections
+
+# How the Paging and Virtual Memory simulators share frames between processes:
+# GLOBAL lets every fault evict any page; the others give each process a quota
+# and evict from the faulting process's own pages once it is at its quota
+FRAME_ALLOCATIONS = ("GLOBAL", "WORKING_SET", "PFF")
+
+# Samples of per-process quotas and fault rates kept for the history
+ALLOCATION_HISTORY_LIMIT = 1024
+
+class ProcessFrames:
+    """A process's resident frames, quota and share of the reference window."""
+    __slots__ = ("frames", "quota", "counts", "distinct", "window_references", "window_faults",
+                 "references", "faults")
+
+    def __init__(self, quota):
+        self.frames = collections.OrderedDict()  # frame -> None, next victim first
+        self.quota = quota
+        self.counts = {}  # page_num -> occurrences in the window
+        self.distinct = 0  # Pages in the window: the working set size
+        self.window_references = 0
+        self.window_faults = 0
+        self.references = 0
+        self.faults = 0
+
+    def fault_rate(self):
+        return self.window_faults / self.window_references if self.window_references else 0.0
+
+class LocalFrameAllocator:
+    """Per-process frame quotas for the Paging and Virtual Memory simulators.
+
+    The window is the last window references across all processes, slid
+    in O(1) per reference, so a process that stops running drops out of it.
+    WORKING_SET sets each process's quota to the number of distinct pages
+    it has in the window. PFF (page-fault frequency) grows the quota by a
+    frame when a fault finds the process's fault rate in the window above
+    high, and shrinks it by one when the rate is below low.
+
+    A process over or at its quota replaces one of its own pages, oldest
+    first (least recently used first when the simulator touches frames on
+    hits, as it does for LRU). A process under its quota takes a frame
+    from the process furthest over its own quota; when no process is over
+    quota, memory is overcommitted and the process replaces its own page.
+    """
+    def __init__(self, mode, frames, window=64, low=0.02, high=0.1, sample_every=None):
+        if mode not in FRAME_ALLOCATIONS[1:]:
+            raise ValueError(f"Local frame allocation must be one of {', '.join(FRAME_ALLOCATIONS[1:])}")
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        if not 0 <= low <= high <= 1:
+            raise ValueError("PFF bounds must satisfy 0 <= low <= high <= 1")
+        self.mode = mode
+        self.total_frames = frames
+        self.window = window
+        self.low = low
+        self.high = high
+        self.sample_every = sample_every or window
+        self.reset()
+
+    def reset(self):
+        self.processes = {}  # process_id -> ProcessFrames
+        self.frame_owners = {}  # frame -> process_id
+        self.recent = collections.deque()  # (process, page_num, faulted) in the window, oldest first
+        self.references = 0
+        self.steals = 0  # Faults that took a frame from another process
+        self.history = collections.deque(maxlen=ALLOCATION_HISTORY_LIMIT)
+
+    def _process(self, process_id):
+        process = self.processes.get(process_id)
+        if process is None:
+            # A working set starts empty; PFF starts every process at one frame
+            process = self.processes[process_id] = ProcessFrames(0 if self.mode == "WORKING_SET" else 1)
+        return process
+
+    def reference(self, process_id, page_num, faulted):
+        # Slide the window and update the process's quota; call before the fault is handled
+        process = self._process(process_id)
+        self.recent.append((process, page_num, faulted))
+        count = process.counts.get(page_num, 0)
+        process.counts[page_num] = count + 1
+        if count == 0:
+            process.distinct += 1
+        process.window_references += 1
+        process.window_faults += faulted
+        process.references += 1
+        if len(self.recent) > self.window:
+            self._expire()
+        if faulted:
+            process.faults += 1
+        if self.mode == "WORKING_SET":
+            process.quota = process.distinct
+        elif faulted:
+            rate = process.fault_rate()
+            if rate > self.high:
+                process.quota = min(process.quota + 1, self.total_frames)
+            elif rate < self.low:
+                process.quota = max(process.quota - 1, 1)
+        self.references += 1
+        if self.references % self.sample_every == 0:
+            self.history.append({"Reference": self.references, "Processes": self._snapshot()})
+
+    def _expire(self):
+        # Drop the oldest reference from the window
+        process, page_num, faulted = self.recent.popleft()
+        count = process.counts[page_num] - 1
+        if count:
+            process.counts[page_num] = count
+        else:
+            del process.counts[page_num]
+            process.distinct -= 1
+            if self.mode == "WORKING_SET":
+                process.quota = process.distinct
+        process.window_references -= 1
+        process.window_faults -= faulted
+
+    def load(self, frame, page):
+        process_id = page[0]
+        self._process(process_id).frames[frame] = None
+        self.frame_owners[frame] = process_id
+
+    def touch(self, frame):
+        process_id = self.frame_owners.get(frame)
+        if process_id is not None:
+            self.processes[process_id].frames.move_to_end(frame)
+
+    def evict(self, process_id):
+        # Frame to give the faulting process, or None if no frame is tracked
+        process = self._process(process_id)
+        victim = process if process.frames else None
+        if victim is None or len(process.frames) < process.quota:
+            # Under quota: take a frame from the process furthest over its own quota, if one is over
+            over = max((other for other in self.processes.values() if other is not process and other.frames),
+                       key=lambda other: len(other.frames) - other.quota, default=None)
+            if over is not None and (victim is None or len(over.frames) > over.quota):
+                victim = over
+        if victim is None:
+            return None
+        if victim is not process:
+            self.steals += 1
+        frame, _ = victim.frames.popitem(last=False)
+        del self.frame_owners[frame]
+        return frame
+
+    def _snapshot(self):
+        return {
+            str(process_id): {
+                "Quota": process.quota,
+                "Resident Frames": len(process.frames),
+                "Working Set": process.distinct,
+                "Fault Rate": process.fault_rate()
+            }
+            for process_id, process in self.processes.items()
+        }
+
+    def stats(self):
+        processes = self._snapshot()
+        for process_id, process in self.processes.items():
+            processes[str(process_id)]["References"] = process.references
+            processes[str(process_id)]["Page Faults"] = process.faults
+        total_quota = sum(process.quota for process in self.processes.values())
+        return {
+            "Frame Allocation": self.mode,
+            "Window": self.window,
+            "PFF Bounds": [self.low, self.high],
+            "Frames": self.total_frames,
+            "Total Quota": total_quota,
+            "Overcommitted": total_quota > self.total_frames,
+            "Steals": self.steals,
+            "Processes": processes,
+            "History": list(self.history)
+        }
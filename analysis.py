@@ -0,0 +1,101 @@
+class FenwickTree:
+    """Binary indexed tree over slot counts, used to count distinct pages above a stack slot."""
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """Sum of slots 0..index inclusive."""
+        total = 0
+        index += 1
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+class StackDistanceAnalyzer:
+    """Mattson LRU stack distances for a (process_id, page_num) reference stream.
+
+    Every page keeps a marker at the slot of its last reference. The stack
+    distance of a re-reference is the number of markers at or after its old
+    slot, so each reference costs O(log M) for M distinct pages. Slots are
+    renumbered when they run out, which keeps the tree at O(M) size.
+    """
+    def __init__(self):
+        self.last_slot = {}  # (process_id, page_num) -> slot of its last reference
+        self.next_slot = 0
+        self.tree = FenwickTree(16)
+        self.histogram = {}  # stack distance -> number of references
+        self.cold_misses = 0
+        self.references = 0
+
+    def _compact(self):
+        # Renumber live markers to 0..M-1 in reference order and grow the tree
+        pages = sorted(self.last_slot, key=self.last_slot.get)
+        self.tree = FenwickTree(max(16, 2 * len(pages)))
+        for slot, page in enumerate(pages):
+            self.last_slot[page] = slot
+            self.tree.add(slot, 1)
+        self.next_slot = len(pages)
+
+    def record(self, process_id, page_num):
+        page = (str(process_id), page_num)
+        slot = self.last_slot.get(page)
+        if slot is None:
+            self.cold_misses += 1
+        else:
+            distance = len(self.last_slot) - self.tree.prefix_sum(slot) + 1
+            self.histogram[distance] = self.histogram.get(distance, 0) + 1
+            self.tree.add(slot, -1)
+        if self.next_slot == self.tree.size:
+            if slot is not None:
+                del self.last_slot[page]
+            self._compact()
+        self.last_slot[page] = self.next_slot
+        self.tree.add(self.next_slot, 1)
+        self.next_slot += 1
+        self.references += 1
+
+    def feed(self, references):
+        for process_id, page_num in references:
+            self.record(process_id, page_num)
+        return self
+
+    def fault_curve(self, max_frames=None):
+        """LRU results for every frame count from 1 to max_frames.
+
+        "Misses" counts every reference whose page was not resident. "Page
+        Faults" follows MemoryManagementSimulator, where the first pages to
+        arrive fill free frames without counting as faults.
+        """
+        distinct_pages = len(self.last_slot)
+        if max_frames is None:
+            max_frames = max(distinct_pages, 1)
+        # misses[m] = cold misses + references with stack distance > m
+        curve = []
+        misses = self.references
+        for frames in range(1, max_frames + 1):
+            misses -= self.histogram.get(frames, 0)
+            curve.append({
+                "Frames": frames,
+                "Misses": misses,
+                "Page Faults": misses - min(distinct_pages, frames),
+                "Miss Ratio": misses / self.references if self.references else 0.0
+            })
+        return curve
+
+def lru_miss_ratio_curve(references, max_frames=None):
+    """Single-pass LRU fault counts for every memory size on one trace."""
+    analyzer = StackDistanceAnalyzer().feed(references)
+    return {
+        "References": analyzer.references,
+        "Distinct Pages": len(analyzer.last_slot),
+        "Cold Misses": analyzer.cold_misses,
+        "Curve": analyzer.fault_curve(max_frames)
+    }
@@ -0,0 +1,310 @@
+import collections
+import contextlib
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+import main
+from main import MemoryManagementSimulator, SegmentationMemorySimulator, VirtualMemorySimulator
+from workloads import LoopPages, SequentialPages, UniformPages, Workload, ZipfPages
+
+# Reference shapes, each a model over a given number of pages per process
+BENCHMARK_SHAPES = {
+    "LOOP": LoopPages,
+    "ZIPF": ZipfPages,
+    "UNIFORM": UniformPages,
+    "SEQUENTIAL": lambda pages: SequentialPages(pages, run=16),
+}
+
+# The default matrix, and a smaller one for a quick local check
+FRAME_COUNTS = (16, 128, 1024)
+TRACE_SIZES = (10_000, 100_000)
+QUICK_FRAME_COUNTS = (16, 128)
+QUICK_TRACE_SIZES = (5_000,)
+
+# Per-request HTTP benchmarks send at most this many requests; each one costs a full request cycle
+HTTP_REQUESTS = 2000
+
+# Processes in every workload; each has twice as many pages as there are frames
+BENCHMARK_PROCESSES = 2
+
+# Largest segment a segmentation benchmark asks for; memory holds about frames segments
+SEGMENT_MAX_SIZE = 8
+
+def benchmark_workload(shape, frames, seed):
+    # Round-robin processes in bursts, so each process's pattern survives the interleaving
+    pages = 2 * frames // BENCHMARK_PROCESSES
+    return Workload([(str(process_id), BENCHMARK_SHAPES[shape](pages))
+                     for process_id in range(1, BENCHMARK_PROCESSES + 1)], quantum=16, seed=seed)
+
+# Each benchmark sets up a fresh simulator outside the timing and returns a callable
+# that runs the timed part and gives back (operations, counters)
+def bench_page_request(workload, frames, count, algorithm):
+    simulator = MemoryManagementSimulator(total_memory=frames, page_size=1)
+    simulator.set_algorithm(algorithm)
+    for process_id, pages in workload.page_counts().items():
+        for page_num in range(pages):
+            simulator.allocate_paging(process_id, page_num)
+    references = list(workload.references(count))
+
+    def run():
+        for process_id, page_num in references:
+            simulator.simulate_page_request(process_id, page_num, verbose=False)
+        return len(references), {"Page Faults": simulator.page_faults}
+    return run
+
+def virtual_simulator(workload, frames, algorithm):
+    # Swap holds every page of every process, plus room to swap out while all frames are full
+    page_counts = workload.page_counts()
+    simulator = VirtualMemorySimulator(total_memory=frames, page_size=1,
+                                       swap_size=sum(page_counts.values()) + frames)
+    simulator.set_algorithm(algorithm)
+    for process_id, pages in page_counts.items():
+        simulator.allocate_virtual(process_id, pages)
+    return simulator
+
+def bench_virtual_page_request(workload, frames, count, algorithm):
+    simulator = virtual_simulator(workload, frames, algorithm)
+    references = list(workload.references(count))
+
+    def run():
+        for process_id, page_num in references:
+            simulator.simulate_virtual_page_request(process_id, page_num, verbose=False)
+        return len(references), {"Page Faults": simulator.page_faults, "Swap Operations": simulator.swap_operations}
+    return run
+
+def bench_page_fault_with_swap(workload, frames, count, algorithm):
+    # Only the fault path: every non-resident reference goes straight to handle_page_fault_with_swap
+    simulator = virtual_simulator(workload, frames, algorithm)
+    references = list(workload.references(count))
+
+    def run():
+        faults = 0
+        for process_id, page_num in references:
+            if (process_id, page_num) not in simulator.page_frames:
+                simulator.handle_page_fault_with_swap(process_id, page_num)
+                faults += 1
+        return faults, {"Swap Operations": simulator.swap_operations}
+    return run
+
+def bench_segmentation(workload, frames, count, algorithm):
+    # Allocate each referenced segment; every fourth request frees the oldest live one
+    simulator = SegmentationMemorySimulator(total_memory=frames * SEGMENT_MAX_SIZE // 2)
+    simulator.set_algorithm(algorithm)
+    requests = list(workload.segment_requests(count, max_size=SEGMENT_MAX_SIZE))
+
+    def run():
+        live = collections.OrderedDict()
+        deallocations = 0
+        for i, (process_id, segment_id, size) in enumerate(requests):
+            if simulator.allocate_segmentation(process_id, segment_id, size):
+                live[(process_id, segment_id)] = None
+            if i % 4 == 3 and live:
+                simulator.deallocate_segment(*live.popitem(last=False)[0])
+                deallocations += 1
+        return len(requests) + deallocations, {"Evictions": simulator.evictions,
+                                               "Allocation Failures": simulator.allocation_failures}
+    return run
+
+def http_client(kind, simulator):
+    # A test client on its own session, with the benchmark's simulator in place of the default one
+    session_id = f"benchmark-{uuid.uuid4().hex}"
+    setattr(main.sessions.get(session_id), kind, simulator)
+    client = main.app.test_client()
+    client.environ_base["HTTP_" + main.SESSION_CONFIG["header"].upper().replace("-", "_")] = session_id
+    return client, session_id
+
+def bench_http_page_request(workload, frames, count, algorithm):
+    simulator = MemoryManagementSimulator(total_memory=frames, page_size=1)
+    simulator.set_algorithm(algorithm)
+    for process_id, pages in workload.page_counts().items():
+        for page_num in range(pages):
+            simulator.allocate_paging(process_id, page_num)
+    client, session_id = http_client("paging", simulator)
+    references = list(workload.references(min(count, HTTP_REQUESTS)))
+
+    def run():
+        try:
+            for process_id, page_num in references:
+                client.post("/simulate_page_request", json={"process_id": process_id, "page_num": page_num})
+        finally:
+            main.sessions.remove(session_id)
+        return len(references), {"Page Faults": simulator.page_faults}
+    return run
+
+def bench_http_allocate_segmentation(workload, frames, count, algorithm):
+    simulator = SegmentationMemorySimulator(total_memory=frames * SEGMENT_MAX_SIZE // 2)
+    simulator.set_algorithm(algorithm)
+    client, session_id = http_client("segmentation", simulator)
+    requests = list(workload.segment_requests(min(count, HTTP_REQUESTS), max_size=SEGMENT_MAX_SIZE))
+
+    def run():
+        try:
+            for process_id, segment_id, size in requests:
+                client.post("/allocate_segmentation",
+                            json={"process_id": process_id, "segment_id": segment_id, "size": size})
+        finally:
+            main.sessions.remove(session_id)
+        return len(requests), {"Evictions": simulator.evictions}
+    return run
+
+def bench_http_trace(workload, frames, count, algorithm):
+    # The whole trace in one /simulate_trace request: JSON decoding plus the batch replay
+    simulator = MemoryManagementSimulator(total_memory=frames, page_size=1)
+    simulator.set_algorithm(algorithm)
+    client, session_id = http_client("paging", simulator)
+    sequence = [[process_id, page_num] for process_id, page_num in workload.references(count)]
+
+    def run():
+        try:
+            stats = client.post("/simulate_trace", json={"sequence": sequence}).json
+        finally:
+            main.sessions.remove(session_id)
+        return stats["References"], {"Page Faults": stats["Page Faults"]}
+    return run
+
+BENCHMARKS = {
+    "page_request": bench_page_request,
+    "virtual_page_request": bench_virtual_page_request,
+    "page_fault_with_swap": bench_page_fault_with_swap,
+    "segmentation": bench_segmentation,
+    "http_page_request": bench_http_page_request,
+    "http_allocate_segmentation": bench_http_allocate_segmentation,
+    "http_trace": bench_http_trace,
+}
+
+def time_benchmark(benchmark, workload, frames, count, algorithm, repeats):
+    # Median of repeats, each on a fresh simulator with the garbage collector paused
+    timings = []
+    for _ in range(repeats):
+        run = benchmark(workload, frames, count, algorithm)
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            operations, counters = run()
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    median = statistics.median(timings)
+    result = {
+        "Operations": operations,
+        "Median Seconds": median,
+        "Min Seconds": min(timings),
+        "Operations Per Second": operations / median if median > 0 else 0.0
+    }
+    result.update(counters)
+    return result
+
+def run_benchmarks(benchmarks=None, shapes=None, frame_counts=FRAME_COUNTS, trace_sizes=TRACE_SIZES,
+                   algorithm="LRU", repeats=3, seed=1, progress=None):
+    """Time every benchmark x shape x frame count x trace size.
+
+    Workloads are seeded, so every run replays the same references.
+    Returns a JSON-ready dict with the environment and one result per
+    combination. progress, if given, is called with each result.
+    """
+    benchmarks = list(benchmarks or BENCHMARKS)
+    shapes = list(shapes or BENCHMARK_SHAPES)
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Benchmark must be one of {', '.join(BENCHMARKS)}")
+    for shape in shapes:
+        if shape not in BENCHMARK_SHAPES:
+            raise ValueError(f"Shape must be one of {', '.join(BENCHMARK_SHAPES)}")
+    if repeats <= 0:
+        raise ValueError("Repeats must be at least one")
+    # The simulators log at DEBUG and INFO, and the request routes print page faults;
+    # both would swamp the timings and the output. Printing to devnull is still timed.
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.WARNING)
+    results = []
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for name, shape, frames, count in itertools.product(benchmarks, shapes, frame_counts, trace_sizes):
+                workload = benchmark_workload(shape, frames, seed)
+                result = {"Benchmark": name, "Shape": shape, "Frames": frames, "References": count}
+                result.update(time_benchmark(BENCHMARKS[name], workload, frames, count, algorithm, repeats))
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    finally:
+        root.setLevel(level)
+    return {
+        "Python": platform.python_version(),
+        "Implementation": platform.python_implementation(),
+        "Platform": platform.platform(),
+        "Algorithm": algorithm,
+        "Repeats": repeats,
+        "Seed": seed,
+        "Results": results
+    }
+
+def result_key(result):
+    return result["Benchmark"], result["Shape"], result["Frames"], result["References"]
+
+def compare_results(baseline, current, tolerance=0.2):
+    """Combinations that ran more than tolerance slower than in the baseline.
+
+    Both arguments are run_benchmarks results; combinations missing from
+    either side are skipped.
+    """
+    before = {result_key(result): result for result in baseline["Results"]}
+    regressions = []
+    for result in current["Results"]:
+        old = before.get(result_key(result))
+        if old is None or not old["Operations Per Second"]:
+            continue
+        change = result["Operations Per Second"] / old["Operations Per Second"] - 1
+        if change < -tolerance:
+            regression = dict(zip(("Benchmark", "Shape", "Frames", "References"), result_key(result)))
+            regression.update({"Baseline": old["Operations Per Second"],
+                               "Current": result["Operations Per Second"], "Change": change})
+            regressions.append(regression)
+    return regressions
+
+def print_result(result):
+    print(f"{result['Benchmark']:<28} {result['Shape']:<11} {result['Frames']:>6} frames "
+          f"{result['References']:>8} refs {result['Operations Per Second']:>12,.0f} ops/s", file=sys.stderr)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the simulator hot paths and HTTP routes")
+    parser.add_argument("--quick", action="store_true", help="a smaller matrix for a fast local check")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS)
+    parser.add_argument("--shapes", nargs="+", choices=BENCHMARK_SHAPES)
+    parser.add_argument("--frames", nargs="+", type=int)
+    parser.add_argument("--references", nargs="+", type=int, help="trace sizes")
+    parser.add_argument("--algorithm", default="LRU", choices=("FIFO", "LRU"))
+    parser.add_argument("--repeats", type=int)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON results here instead of to stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed before a regression")
+    args = parser.parse_args()
+    results = run_benchmarks(
+        args.benchmarks, args.shapes,
+        args.frames or (QUICK_FRAME_COUNTS if args.quick else FRAME_COUNTS),
+        args.references or (QUICK_TRACE_SIZES if args.quick else TRACE_SIZES),
+        args.algorithm, args.repeats or (1 if args.quick else 3), args.seed, progress=print_result
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), results, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression['Benchmark']} {regression['Shape']} {regression['Frames']} frames "
+                  f"{regression['References']} refs: {regression['Change']:+.0%}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,121 @@
+import heapq
+
+class BuddyAllocator:
+    """Binary buddy allocator over a power-of-two memory.
+
+    Blocks of order k are min_block * 2**k units long. Each order has a
+    free list (a min-heap of block bases, so the lowest address is used
+    first) and a bitmap with one byte per block of that order, set while
+    the block is free. Heap entries whose bit was cleared by a merge are
+    skipped on pop. Allocation splits the smallest free block that fits
+    and freeing merges a block with its buddy while the buddy is free, so
+    both take O(log n) steps. on_change, if given, is called with the base
+    of every block that joins or leaves a free list.
+    """
+    def __init__(self, total_memory, min_block=1, on_change=None):
+        units = total_memory // min_block
+        if min_block <= 0 or units * min_block != total_memory or units & (units - 1):
+            raise ValueError("Buddy memory must be a power-of-two multiple of the minimum block size")
+        self.total_memory = total_memory
+        self.min_block = min_block
+        self.max_order = units.bit_length() - 1
+        self.on_change = on_change
+        self.reset()
+
+    def reset(self):
+        self.free_lists = [[] for _ in range(self.max_order + 1)]  # Min-heaps of bases, possibly stale
+        self.free_bits = [bytearray((self.total_memory // self.min_block) >> order)
+                          for order in range(self.max_order + 1)]
+        self.free_counts = [0] * (self.max_order + 1)
+        self.allocated = {}  # base -> order of the allocated block
+        self.free_memory = 0
+        self.operations = 0  # Splits and merges
+        self._push(self.max_order, 0)
+
+    def block_size(self, order):
+        return self.min_block << order
+
+    def order_for(self, size):
+        # Smallest order whose blocks hold size units, or None if even the whole memory is too small
+        units = max(-(-size // self.min_block), 1)
+        order = (units - 1).bit_length()
+        return order if order <= self.max_order else None
+
+    def _bit(self, order, base):
+        return (base // self.min_block) >> order
+
+    def _push(self, order, base):
+        heapq.heappush(self.free_lists[order], base)
+        self.free_bits[order][self._bit(order, base)] = 1
+        self.free_counts[order] += 1
+        self.free_memory += self.block_size(order)
+        if self.on_change is not None:
+            self.on_change(base)
+        if len(self.free_lists[order]) > 2 * self.free_counts[order] + 16:
+            self.free_lists[order] = self.free_bases(order)
+            heapq.heapify(self.free_lists[order])
+
+    def _take(self, order, base):
+        self.free_bits[order][self._bit(order, base)] = 0
+        self.free_counts[order] -= 1
+        self.free_memory -= self.block_size(order)
+        if self.on_change is not None:
+            self.on_change(base)
+
+    def _pop(self, order):
+        heap = self.free_lists[order]
+        while heap:
+            base = heapq.heappop(heap)
+            if self.free_bits[order][self._bit(order, base)]:
+                self._take(order, base)
+                return base
+        return None
+
+    def free_bases(self, order):
+        # Free blocks of one order in address order
+        bits = self.free_bits[order]
+        return sorted({base for base in self.free_lists[order] if bits[self._bit(order, base)]})
+
+    def free_order(self, base):
+        # Order of the free block starting at base, or None if no free block starts there
+        for order in range(self.max_order + 1):
+            if base % self.block_size(order):
+                break
+            if self.free_bits[order][self._bit(order, base)]:
+                return order
+        return None
+
+    def allocate(self, size):
+        """Allocate a block for size units; returns (base, block_size) or None."""
+        order = self.order_for(size)
+        if order is None:
+            return None
+        source = order
+        while source <= self.max_order and not self.free_counts[source]:
+            source += 1
+        if source > self.max_order:
+            return None
+        base = self._pop(source)
+        # Split down to the requested order, freeing the upper half each time
+        while source > order:
+            source -= 1
+            self._push(source, base + self.block_size(source))
+            self.operations += 1
+        self.allocated[base] = order
+        return base, self.block_size(order)
+
+    def free(self, base):
+        """Free the block at base, merging with free buddies; returns the block size."""
+        order = self.allocated.pop(base)
+        block_size = self.block_size(order)
+        while order < self.max_order:
+            size = self.block_size(order)
+            buddy = base + size if (base // size) % 2 == 0 else base - size
+            if not self.free_bits[order][self._bit(order, buddy)]:
+                break
+            self._take(order, buddy)
+            base = min(base, buddy)
+            order += 1
+            self.operations += 1
+        self._push(order, base)
+        return block_size
@@ -0,0 +1,86 @@
+import bisect
+import collections
+
+# Changes kept per simulator before older versions fall back to a full snapshot
+CHANGE_LOG_LIMIT = 4096
+
+class ChangeLog:
+    """State version counter with a bounded log of what changed.
+
+    Every mark() bumps the version and records an (area, key) pair such as
+    ("frames", 3). changes_since() groups the keys changed after a version
+    by area, or returns None when the log no longer reaches back that far
+    and the caller needs a full snapshot instead.
+    """
+    def __init__(self, limit=CHANGE_LOG_LIMIT):
+        self.version = 0
+        self.floor = 0  # Oldest version changes_since() can answer
+        self.entries = collections.deque(maxlen=limit)  # (version, area, key), oldest first
+
+    def mark(self, area, key):
+        if len(self.entries) == self.entries.maxlen:
+            self.floor = self.entries[0][0]
+        self.version += 1
+        self.entries.append((self.version, area, key))
+
+    def reset(self):
+        # Everything changed at once, so older versions need a full snapshot
+        self.version += 1
+        self.floor = self.version
+        self.entries.clear()
+
+    def changes_since(self, since):
+        if since < self.floor or since > self.version:
+            return None
+        changed = {}
+        for version, area, key in reversed(self.entries):
+            if version <= since:
+                break
+            changed.setdefault(area, set()).add(key)
+        return changed
+
+def _merge_by_base(entries, changes):
+    # Address-ordered entries that start with their base, updated from [base, entry] pairs
+    by_base = {entry[0]: entry for entry in entries}
+    for base, entry in changes:
+        if entry is None:
+            by_base.pop(base, None)
+        else:
+            by_base[base] = entry
+    return [by_base[base] for base in sorted(by_base)]
+
+def apply_state_changes(state, changes):
+    """Merge a display diff (a response to ?since=) into the full state it was taken against."""
+    for key, value in changes.items():
+        if key in ("Memory Frames", "Swap Space"):
+            for index, entry in value:
+                state[key][index] = entry
+        elif key == "Page Table":
+            for process_id, entries in value.items():
+                pages = state[key].setdefault(process_id, [])
+                for index, entry in entries:
+                    if index == len(pages):
+                        pages.append(entry)
+                    else:
+                        pages[index] = entry
+        elif key in ("Memory State", "Free Blocks"):
+            state[key] = _merge_by_base(state[key], value)
+        elif key == "Free Lists":
+            # Each base leaves the free list it was on and joins the one for its block size, if any
+            for base, block_size in value:
+                for size, bases in list(state[key].items()):
+                    if base in bases:
+                        bases.remove(base)
+                        if not bases:
+                            del state[key][size]
+                if block_size is not None:
+                    bisect.insort(state[key].setdefault(str(block_size), []), base)
+        elif key in ("Disk Storage", "Segment Table", "Block Table", "Caches", "Object Table"):
+            for name, entry in value.items():
+                if entry is None:
+                    state[key].pop(name, None)
+                else:
+                    state[key][name] = entry
+        elif key not in ("Since", "Full"):
+            state[key] = value
+    return state
@@ -0,0 +1,186 @@
+import array
+import sys
+
+# Storage backends for the Paging and Virtual Memory simulators
+STORAGE_BACKENDS = ("objects", "compact")
+
+# Low bits of a page key that hold the interned process number
+PROCESS_BITS = 20
+
+class ProcessIds:
+    """Interns process ID strings as small ints, shared by one simulator's stores."""
+    __slots__ = ("numbers", "names")
+
+    def __init__(self):
+        self.numbers = {}  # process_id -> number
+        self.names = []  # number -> process_id
+
+    def intern(self, process_id):
+        number = self.numbers.get(process_id)
+        if number is None:
+            number = len(self.names)
+            if number >> PROCESS_BITS:
+                raise ValueError(f"Compact storage holds at most {1 << PROCESS_BITS} processes")
+            self.numbers[process_id] = number
+            self.names.append(process_id)
+        return number
+
+    def key(self, page):
+        # One int for a (process_id, page_num) page, so it can key a dict without a tuple
+        process_id, page_num = page
+        return (page_num << PROCESS_BITS) | self.intern(process_id)
+
+    def find_key(self, page):
+        # Like key(), but None for a process that was never interned
+        number = self.numbers.get(page[0])
+        return None if number is None else (page[1] << PROCESS_BITS) | number
+
+    def page(self, key):
+        return self.names[key & ((1 << PROCESS_BITS) - 1)], key >> PROCESS_BITS
+
+class PageArray:
+    """Fixed-length list of (process_id, page_num) pages or None, kept in two typed arrays."""
+    __slots__ = ("ids", "processes", "page_nums")
+
+    def __init__(self, length, ids):
+        self.ids = ids
+        self.processes = array.array("i", [-1]) * length  # Interned process number, -1 when empty
+        self.page_nums = array.array("q", [0]) * length
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __getitem__(self, index):
+        process = self.processes[index]
+        if process < 0:
+            return None
+        return self.ids.names[process], self.page_nums[index]
+
+    def __setitem__(self, index, page):
+        if page is None:
+            self.processes[index] = -1
+        else:
+            self.processes[index] = self.ids.intern(page[0])
+            self.page_nums[index] = page[1]
+
+    def __iter__(self):
+        names = self.ids.names
+        for process, page_num in zip(self.processes, self.page_nums):
+            yield None if process < 0 else (names[process], page_num)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+class EntryArray:
+    """Growable list of page table entries, one typed array per field.
+
+    fields gives an array typecode per entry field; "b" fields are flags
+    and come back as bools, so entries read the same as the tuples they
+    replace.
+    """
+    __slots__ = ("columns", "flags")
+
+    def __init__(self, fields):
+        self.columns = tuple(array.array(typecode) for typecode in fields)
+        self.flags = tuple(typecode == "b" for typecode in fields)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        return tuple(bool(column[index]) if flag else column[index]
+                     for column, flag in zip(self.columns, self.flags))
+
+    def __setitem__(self, index, entry):
+        for column, value in zip(self.columns, entry):
+            column[index] = value
+
+    def append(self, entry):
+        for column, value in zip(self.columns, entry):
+            column.append(value)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+class PageDict:
+    """Dict keyed by (process_id, page_num) pages, stored under single-int keys.
+
+    With pages_as_values the value of every entry is its own page (as in
+    the Paging simulator's disk), so no value is stored at all.
+    """
+    __slots__ = ("ids", "entries", "pages_as_values")
+
+    def __init__(self, ids, pages_as_values=False):
+        self.ids = ids
+        self.entries = {}  # page key -> value (None with pages_as_values)
+        self.pages_as_values = pages_as_values
+
+    def _value(self, key, value):
+        return self.ids.page(key) if self.pages_as_values else value
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, page):
+        return self.ids.find_key(page) in self.entries
+
+    def __getitem__(self, page):
+        key = self.ids.find_key(page)
+        if key not in self.entries:
+            raise KeyError(page)
+        return self._value(key, self.entries[key])
+
+    def get(self, page, default=None):
+        key = self.ids.find_key(page)
+        return self._value(key, self.entries[key]) if key in self.entries else default
+
+    def __setitem__(self, page, value):
+        self.entries[self.ids.key(page)] = None if self.pages_as_values else value
+
+    def __delitem__(self, page):
+        key = self.ids.find_key(page)
+        if key not in self.entries:
+            raise KeyError(page)
+        del self.entries[key]
+
+    def __iter__(self):
+        for key in self.entries:
+            yield self.ids.page(key)
+
+    def items(self):
+        for key, value in self.entries.items():
+            yield self.ids.page(key), self._value(key, value)
+
+# Stores for one simulator: plain lists and dicts when ids is None (the objects backend),
+# or the compact classes above sharing the simulator's ProcessIds
+def page_list(length, ids):
+    return [None] * length if ids is None else PageArray(length, ids)
+
+def entry_list(fields, ids):
+    return [] if ids is None else EntryArray(fields)
+
+def page_dict(ids, pages_as_values=False):
+    return {} if ids is None else PageDict(ids, pages_as_values)
+
+def deep_sizeof(obj, seen=None):
+    """Bytes used by obj and everything it references, counting shared objects once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__") and not isinstance(obj, (str, bytes, array.array)):
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += deep_sizeof(getattr(obj, name), seen)
+    return size
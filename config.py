@@ -10,4 +10,32 @@ CONFIG = {
 # Authentication details
 AUTHORIZED_USERS = {
     "admin": "password123"
-}
\ No newline at end of file
+}
+
+# Per-client simulator sessions (see sessions.py)
+SESSION_CONFIG = {
+    "header": "X-Session-ID",  # Request header that names the session
+    "default_session": "default",  # Used by clients that send no session ID
+    "max_bytes": 256 * 1024 * 1024,  # Estimated memory cap across all sessions
+    "max_sessions": 1000,
+    "idle_timeout": 3600,  # Seconds before an unused session is dropped
+    "storage_backend": "objects"  # "compact" keeps Paging and Virtual Memory state in typed arrays
+}
+
+# Parameter sweeps (POST /sweep)
+SWEEP_CONFIG = {
+    "workers": None,  # Worker processes per sweep; None uses every CPU
+    "max_points": 4096  # Most algorithm x page size x frame count combinations in one sweep
+}
+
+# Binary traces uploaded with POST /upload_trace (see traces.py)
+TRACE_CONFIG = {
+    "directory": "traces",  # Where uploaded traces are kept
+    "chunk_references": 65536,  # References decoded at a time while replaying a trace file
+    "import_workers": None  # Processes parsing an address trace (POST /import_address_trace); None uses every CPU
+}
+
+# Generated workloads passed to the trace routes as 'workload' (see workloads.py)
+WORKLOAD_CONFIG = {
+    "max_references": 10_000_000  # Most references one request may generate
+}
@@ -0,0 +1,31 @@
+import threading
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_KEEPALIVE = 15
+
+class EventChannel:
+    """Change counter that wakes a session's event stream subscribers.
+
+    Writers call publish() after changing a simulator. Subscribers remember
+    the last sequence number they saw and block in wait() until it moves,
+    the timeout passes or the channel is closed with its session.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.closed = False
+
+    def publish(self):
+        with self.condition:
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def wait(self, seen, timeout=None):
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence != seen or self.closed, timeout)
+            return self.sequence
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,243 @@
+import bisect
+
+# Hole selection strategies for contiguous allocation
+PLACEMENT_STRATEGIES = ("FIRST_FIT", "BEST_FIT", "WORST_FIT", "NEXT_FIT")
+
+# Holes per chunk of the address index; first and next fit skip whole chunks by their largest hole
+CHUNK_SIZE = 64
+
+class SortedChunks:
+    """Sorted items kept in chunks of up to 2 * CHUNK_SIZE.
+
+    Adding or removing an item bisects the chunk firsts, then shifts at
+    most 2 * CHUNK_SIZE slots inside one chunk, so updates stay
+    O(log n + CHUNK_SIZE) instead of moving the whole list.
+    """
+    def __init__(self):
+        self.chunks = []
+        self.firsts = []  # First item of each chunk
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def _chunk_index(self, item):
+        return max(bisect.bisect_right(self.firsts, item) - 1, 0)
+
+    def add(self, item):
+        if not self.chunks:
+            self.chunks.append([item])
+            self.firsts.append(item)
+            return
+        i = self._chunk_index(item)
+        chunk = self.chunks[i]
+        bisect.insort(chunk, item)
+        self.firsts[i] = chunk[0]
+        if len(chunk) > 2 * CHUNK_SIZE:
+            self.chunks.insert(i + 1, chunk[CHUNK_SIZE:])
+            self.firsts.insert(i + 1, chunk[CHUNK_SIZE])
+            del chunk[CHUNK_SIZE:]
+
+    def remove(self, item):
+        i = self._chunk_index(item)
+        chunk = self.chunks[i]
+        del chunk[bisect.bisect_left(chunk, item)]
+        if chunk:
+            self.firsts[i] = chunk[0]
+        else:
+            del self.chunks[i]
+            del self.firsts[i]
+
+    def ceiling(self, item):
+        # Smallest item at or above item, or None
+        if not self.chunks:
+            return None
+        i = self._chunk_index(item)
+        j = bisect.bisect_left(self.chunks[i], item)
+        if j < len(self.chunks[i]):
+            return self.chunks[i][j]
+        return self.chunks[i + 1][0] if i + 1 < len(self.chunks) else None
+
+    def last(self):
+        return self.chunks[-1][-1] if self.chunks else None
+
+class FreeSpaceManager:
+    """Free holes of a contiguous memory, indexed by address and by size.
+
+    Hole start addresses are kept in order, split into chunks of up to
+    2 * CHUNK_SIZE that each remember their largest hole. Freeing a block
+    finds its neighbours by bisection and merges with them, and first and
+    next fit skip every chunk whose largest hole is too small. by_size keeps
+    (size, base) pairs in order in SortedChunks, so best fit is the first
+    pair that is large enough and worst fit is the last pair. Adding or
+    removing a hole and best and worst fit are O(log n + CHUNK_SIZE), plus
+    O(n / CHUNK_SIZE) to shift the chunk lists when a chunk splits or
+    empties; first and next fit are O(n / CHUNK_SIZE + CHUNK_SIZE).
+    total_free is updated on every change instead of summed. on_change,
+    if given, is called with the base of every hole added or removed.
+    """
+    def __init__(self, total_memory, strategy="FIRST_FIT", on_change=None):
+        self.total_memory = total_memory
+        self.on_change = on_change
+        self.sizes = {}
+        self.set_strategy(strategy)
+        self.reset()
+
+    def set_strategy(self, strategy):
+        if strategy not in PLACEMENT_STRATEGIES:
+            raise ValueError(f"Placement must be one of {', '.join(PLACEMENT_STRATEGIES)}")
+        self.strategy = strategy
+
+    def reset(self, used=0):
+        # One hole above the first used units, which is also the state after compaction
+        if self.on_change is not None:
+            for base in self.sizes:
+                self.on_change(base)
+        self.chunks = []  # Runs of hole start addresses, ascending across all chunks
+        self.chunk_starts = []  # First address of each chunk
+        self.chunk_largest = []  # Largest hole in each chunk
+        self.sizes = {}  # base -> hole size
+        self.by_size = SortedChunks()  # (size, base), ascending
+        self.total_free = 0
+        self.next_fit_address = used  # NEXT_FIT resumes its search from here
+        self._add_hole(used, self.total_memory - used)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __iter__(self):
+        # (base, size) holes in address order
+        for chunk in self.chunks:
+            for base in chunk:
+                yield base, self.sizes[base]
+
+    def largest(self):
+        return self.by_size.last()[0] if self.by_size else 0
+
+    def fragmentation(self):
+        # External fragmentation: share of free space outside the largest hole
+        return 1 - self.largest() / self.total_free if self.total_free else 0.0
+
+    def _chunk_index(self, address):
+        # Chunk that holds address, or would hold it if it were a hole
+        return max(bisect.bisect_right(self.chunk_starts, address) - 1, 0)
+
+    def _add_hole(self, base, size):
+        if size <= 0:
+            return
+        self.by_size.add((size, base))
+        self.sizes[base] = size
+        self.total_free += size
+        if self.on_change is not None:
+            self.on_change(base)
+        if not self.chunks:
+            self.chunks.append([base])
+            self.chunk_starts.append(base)
+            self.chunk_largest.append(size)
+            return
+        i = self._chunk_index(base)
+        chunk = self.chunks[i]
+        bisect.insort(chunk, base)
+        self.chunk_starts[i] = chunk[0]
+        self.chunk_largest[i] = max(self.chunk_largest[i], size)
+        if len(chunk) > 2 * CHUNK_SIZE:
+            upper = chunk[CHUNK_SIZE:]
+            del chunk[CHUNK_SIZE:]
+            self.chunks.insert(i + 1, upper)
+            self.chunk_starts.insert(i + 1, upper[0])
+            self.chunk_largest.insert(i + 1, max(self.sizes[b] for b in upper))
+            self.chunk_largest[i] = max(self.sizes[b] for b in chunk)
+
+    def _remove_hole(self, base):
+        size = self.sizes.pop(base)
+        self.by_size.remove((size, base))
+        self.total_free -= size
+        if self.on_change is not None:
+            self.on_change(base)
+        i = self._chunk_index(base)
+        chunk = self.chunks[i]
+        del chunk[bisect.bisect_left(chunk, base)]
+        if not chunk:
+            del self.chunks[i]
+            del self.chunk_starts[i]
+            del self.chunk_largest[i]
+        else:
+            self.chunk_starts[i] = chunk[0]
+            if size == self.chunk_largest[i]:
+                self.chunk_largest[i] = max(self.sizes[b] for b in chunk)
+        return size
+
+    def _neighbours(self, address):
+        # Holes just below and at or above address, or None
+        if not self.chunks:
+            return None, None
+        i = self._chunk_index(address)
+        chunk = self.chunks[i]
+        j = bisect.bisect_left(chunk, address)
+        if j > 0:
+            below = chunk[j - 1]
+        else:
+            below = self.chunks[i - 1][-1] if i > 0 else None
+        if j < len(chunk):
+            above = chunk[j]
+        else:
+            above = self.chunks[i + 1][0] if i + 1 < len(self.chunks) else None
+        return below, above
+
+    def _scan(self, size, address=0):
+        # Lowest-addressed hole of at least size from address on, wrapping around to the start
+        count = len(self.chunks)
+        first = self._chunk_index(address)
+        offset = bisect.bisect_left(self.chunks[first], address)
+        for step in range(count + 1):
+            i = (first + step) % count
+            if self.chunk_largest[i] < size:
+                continue
+            chunk = self.chunks[i]
+            start = offset if step == 0 else 0
+            end = offset if step == count else len(chunk)
+            for j in range(start, end):
+                if self.sizes[chunk[j]] >= size:
+                    return chunk[j]
+        return None
+
+    def _find_hole(self, size):
+        if self.largest() < size:
+            return None
+        if self.strategy == "BEST_FIT":
+            # Smallest hole that fits, lowest address among equal sizes
+            return self.by_size.ceiling((size, -1))[1]
+        if self.strategy == "WORST_FIT":
+            # Largest hole, lowest address among equal sizes
+            return self.by_size.ceiling((self.largest(), -1))[1]
+        if self.strategy == "NEXT_FIT":
+            return self._scan(size, self.next_fit_address)
+        return self._scan(size)
+
+    def allocate(self, size):
+        """Carve size units out of a hole chosen by the strategy; returns the base or None."""
+        if size <= 0:
+            raise ValueError(f"Allocation size must be positive, not {size}")
+        base = self._find_hole(size)
+        if base is None:
+            return None
+        hole_size = self._remove_hole(base)
+        self._add_hole(base + size, hole_size - size)
+        self.next_fit_address = base + size
+        return base
+
+    def free(self, base, size):
+        """Return a block, merging it with the holes right before and after it."""
+        below, above = self._neighbours(base)
+        if above == base + size:
+            size += self._remove_hole(above)
+        if below is not None and below + self.sizes[below] == base:
+            size += self._remove_hole(below)
+            base = below
+        self._add_hole(base, size)
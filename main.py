@@ -1,8 +1,33 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from functools import wraps
 import collections
 from collections import namedtuple
+import bisect
+import heapq
 import random
+import base64
+import json
 import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from allocation import FRAME_ALLOCATIONS, LocalFrameAllocator
+from address_traces import ADDRESS_FORMATS, ADDRESS_OPERATIONS, KB, import_address_trace
+from analysis import lru_miss_ratio_curve
+from buddy import BuddyAllocator
+from changes import ChangeLog
+from compact import ProcessIds, STORAGE_BACKENDS, deep_sizeof, entry_list, page_dict, page_list
+from events import EVENT_KEEPALIVE
+from freespace import FreeSpaceManager
+from slab import SlabAllocator, SLAB_SIZE_CLASSES
+from page_tables import make_page_table
+from tlb import TLB
+from traces import TRACE_HEADER, TraceFile, read_header
+from workloads import WorkloadTrace, workload_from_spec
+from policies import BeladyOptimal, FRAME_POLICIES
+from sessions import SessionRegistry
+from config import SESSION_CONFIG, SWEEP_CONFIG, TRACE_CONFIG, WORKLOAD_CONFIG
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -11,62 +36,254 @@ logger = logging.getLogger(__name__)
 # Create the Flask app
 app = Flask(__name__)
 
+# Replacement algorithms accepted by the Paging and Virtual Memory simulators
+PAGE_REPLACEMENT_ALGORITHMS = ["FIFO", "LRU", "OPT"] + list(FRAME_POLICIES)
+
+# Algorithms that can replace within one process's frames under local frame allocation
+LOCAL_REPLACEMENT_ALGORITHMS = ["FIFO", "LRU"]
+
+# When the Segmentation simulator slides segments together to merge its holes
+COMPACTION_POLICIES = ["NEVER", "ALWAYS", "ON_FAILURE", "THRESHOLD"]
+
+# Packs one bit per trace step (least significant bit first) for batch replay results
+class TraceBitmap:
+    def __init__(self):
+        self.data = bytearray()
+        self.length = 0
+
+    def append(self, bit):
+        if self.length % 8 == 0:
+            self.data.append(0)
+        if bit:
+            self.data[-1] |= 1 << (self.length % 8)
+        self.length += 1
+
+    def to_base64(self):
+        return base64.b64encode(bytes(self.data)).decode("ascii")
+
+def storage_footprint(simulator, stores):
+    # Bytes of each store, measured in order so shared objects (process ID
+    # strings, the interned ID table) count once, where they first appear
+    seen = set()
+    footprint = {"Backend": simulator.backend, "Frames": simulator.frames}
+    for name, store in stores.items():
+        footprint[name] = deep_sizeof(store, seen)
+    total = sum(footprint[name] for name in stores)
+    entries = sum(len(pages) for pages in simulator.page_table.values())
+    footprint["Total Bytes"] = total
+    footprint["Bytes Per Frame"] = footprint["Frame Bytes"] / simulator.frames if simulator.frames else 0.0
+    footprint["Page Table Entries"] = entries
+    footprint["Bytes Per Page Table Entry"] = footprint["Page Table Bytes"] / entries if entries else 0.0
+    return footprint
+
+def tlb_counters(tlb):
+    # Lookups answered by a simulator's TLB, all zero while it has none
+    if tlb is None:
+        return {"TLB Hits": 0, "TLB Misses": 0, "TLB Flushes": 0}
+    return {"TLB Hits": tlb.hits, "TLB Misses": tlb.misses, "TLB Flushes": tlb.flushes}
+
+def tlb_replay_stats(tlb, before, page_size):
+    # TLB counters for one trace replay, given tlb_counters() from before it
+    stats = {key: value - before[key] for key, value in tlb_counters(tlb).items()}
+    lookups = stats["TLB Hits"] + stats["TLB Misses"]
+    stats["TLB Hit Ratio"] = stats["TLB Hits"] / lookups if lookups else 0.0
+    stats["TLB Reach"] = tlb.entries * page_size if tlb is not None else 0
+    return stats
+
 # Define the MemoryManagementSimulator class (Paging Mode)
 class MemoryManagementSimulator:
-    def __init__(self, total_memory=32, page_size=4):
+    def __init__(self, total_memory=32, page_size=4, backend="objects"):
         self.total_memory = total_memory
         self.page_size = page_size
         self.frames = total_memory // page_size
-        self.memory = [None] * self.frames
+        self.set_backend(backend)
+        self.memory = page_list(self.frames, self.process_ids)
         self.page_table = {}
-        self.disk = {}
+        self.disk = page_dict(self.process_ids, pages_as_values=True)
+        self.page_frames = {}  # Reverse index: (process_id, page_num) -> frame
+        self.page_entries = page_dict(self.process_ids)  # (process_id, page_num) -> position in page_table[process_id]
+        self.page_table_organization = "FLAT"
+        self.page_walker = make_page_table("FLAT", self.frames, self.page_table, self.page_entries)  # Translates each request
+        self.translations = 0
+        self.walk_steps = 0  # Page table reads over all translations
+        self.tlb = None  # Optional TLB in front of the page table walk
+        self.free_frames = []  # Min-heap of released frames below next_free_frame
+        self.next_free_frame = 0  # Frames from here up have never been used
         self.page_replacement_algorithm = "FIFO"  # Default algorithm
         self.page_queue = collections.deque()  # For FIFO
-        self.page_access = {}  # For LRU: tracks the last access time of each frame
+        self.page_access = collections.OrderedDict()  # For LRU: frames from least to most recently used
+        self.optimal = BeladyOptimal(self.frames)  # For OPT: next-use index over the loaded trace
+        self.policy = None  # For CLOCK, SECOND_CHANCE and ARC: replacement state from policies.py
+        self.policy_operations = 0  # Bookkeeping steps taken by FIFO and LRU
+        self.frame_allocation = "GLOBAL"
+        self.allocator = None  # For WORKING_SET and PFF: per-process quotas and resident frames
+        self.pending_load = None  # Page allocate_paging just loaded for the upcoming request
+        self.changes = ChangeLog()  # State version and changed frames, page entries and disk pages
         self.page_faults = 0
         self.last_page_fault = None
-        self.access_counter = 0  # To track the order of accesses for LRU
+
+    def set_backend(self, backend):
+        # Storage for frames, page tables and disk; takes effect from the next reset
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Backend must be one of {', '.join(STORAGE_BACKENDS)}")
+        self.backend = backend
+        self.process_ids = ProcessIds() if backend == "compact" else None
+
+    def set_page_table(self, organization):
+        # Rebuild the translations in the chosen organization from the current page tables
+        page_walker = make_page_table(organization, self.frames, self.page_table, self.page_entries)
+        for process_id, pages in self.page_table.items():
+            for page_num, frame in pages:
+                page_walker.map(process_id, page_num, frame)
+        self.page_table_organization = organization
+        self.page_walker = page_walker
+        self.translations = self.walk_steps = 0  # Walk depths are per organization
+
+    def page_table_stats(self):
+        return {
+            "Page Table Organization": self.page_table_organization,
+            "Page Table Bytes": self.page_walker.overhead_bytes(),
+            "Translations": self.translations,
+            "Walk Steps": self.walk_steps,
+            "Average Walk Depth": self.walk_steps / self.translations if self.translations else 0.0
+        }
+
+    def set_tlb(self, entries, associativity=None, replacement="LRU", flush_on_switch=False):
+        # A fresh TLB in front of the page table; 0 entries takes it out again
+        self.tlb = TLB(entries, associativity, replacement, flush_on_switch) if entries else None
+
+    def set_frame_allocation(self, allocation, window=64, low=0.02, high=0.1):
+        # GLOBAL, or per-process quotas from a working-set window or the page-fault frequency
+        if allocation not in FRAME_ALLOCATIONS:
+            raise ValueError(f"Frame allocation must be one of {', '.join(FRAME_ALLOCATIONS)}")
+        allocator = None
+        if allocation != "GLOBAL":
+            if self.page_replacement_algorithm not in LOCAL_REPLACEMENT_ALGORITHMS:
+                raise ValueError(f"Local frame allocation needs {' or '.join(LOCAL_REPLACEMENT_ALGORITHMS)}")
+            allocator = LocalFrameAllocator(allocation, self.frames, window, low, high)
+            for frame, page in enumerate(self.memory):
+                if page is not None:
+                    allocator.load(frame, page)
+        self.frame_allocation = allocation
+        self.allocator = allocator
+        # Replacement order starts over, as it does when the algorithm changes
+        self.set_algorithm(self.page_replacement_algorithm)
+
+    def frame_allocation_stats(self):
+        if self.allocator is None:
+            return {"Frame Allocation": self.frame_allocation}
+        return self.allocator.stats()
 
     def set_algorithm(self, algorithm):
-        if algorithm not in ["FIFO", "LRU"]:
-            raise ValueError("Algorithm must be 'FIFO' or 'LRU'")
+        if algorithm not in PAGE_REPLACEMENT_ALGORITHMS:
+            raise ValueError(f"Algorithm must be one of {', '.join(PAGE_REPLACEMENT_ALGORITHMS)}")
+        if self.allocator is not None and algorithm not in LOCAL_REPLACEMENT_ALGORITHMS:
+            raise ValueError(f"Local frame allocation needs {' or '.join(LOCAL_REPLACEMENT_ALGORITHMS)}")
         self.page_replacement_algorithm = algorithm
         # Reset the page queue and access tracking when changing algorithms
         self.page_queue = collections.deque()
-        self.page_access = {}
-        self.access_counter = 0
+        self.page_access = collections.OrderedDict()
+        self.optimal.clear()
+        self.policy = FRAME_POLICIES[algorithm](self.frames) if algorithm in FRAME_POLICIES else None
+
+    def load_trace(self, references):
+        # OPT is offline: it needs the whole (process_id, page_num) trace before the first request
+        self.optimal.load_trace(references)
+
+    def _touch_frame(self, frame):
+        # Mark the frame as most recently used for LRU
+        self.page_access[frame] = None
+        self.page_access.move_to_end(frame)
+        self.policy_operations += 1
+
+    def bookkeeping_operations(self):
+        # Work done by the replacement algorithm, to compare policies by cost as well as hit ratio
+        operations = self.policy_operations + self.optimal.operations
+        if self.policy is not None:
+            operations += self.policy.operations
+        return operations
+
+    def _allocate_frame(self):
+        # Hand out the lowest free frame, same as self.memory.index(None).
+        # A fault frees one frame and refills it right away, so the heap
+        # rarely holds more than one entry.
+        if self.free_frames:
+            return heapq.heappop(self.free_frames)
+        if self.next_free_frame < self.frames:
+            frame = self.next_free_frame
+            self.next_free_frame += 1
+            return frame
+        return None
+
+    def _release_frame(self, frame):
+        heapq.heappush(self.free_frames, frame)
+
+    def _set_page_entry(self, process_id, page_num, frame):
+        # Update the page table entry in place, or append it if the page is new
+        self.page_walker.map(process_id, page_num, frame)
+        if frame == -1 and self.tlb is not None:
+            self.tlb.invalidate(process_id, page_num)
+        if process_id not in self.page_table:
+            self.page_table[process_id] = entry_list("qq", self.process_ids)
+        key = (process_id, page_num)
+        index = self.page_entries.get(key)
+        if index is None:
+            index = self.page_entries[key] = len(self.page_table[process_id])
+            self.page_table[process_id].append((page_num, frame))
+        else:
+            self.page_table[process_id][index] = (page_num, frame)
+        self.changes.mark("page_table", (process_id, index))
+
+    def _load_page(self, page, frame):
+        self.memory[frame] = page
+        self.page_frames[page] = frame
+        self.changes.mark("frames", frame)
+        if self.allocator is not None:
+            self.allocator.load(frame, page)
+        elif self.page_replacement_algorithm == "FIFO":
+            self.page_queue.append(page)
+            self.policy_operations += 1
+        elif self.page_replacement_algorithm == "LRU":
+            self._touch_frame(frame)
+        elif self.page_replacement_algorithm == "OPT":
+            self.optimal.touch(frame, page)
+        elif self.policy is not None:
+            self.policy.load(frame, page)
 
     def allocate_paging(self, process_id, page_num):
         process_id = str(process_id)
         if process_id not in self.page_table:
-            self.page_table[process_id] = []
+            self.page_table[process_id] = entry_list("qq", self.process_ids)
         
         # Check if the page is already allocated
-        for p_num, frame in self.page_table[process_id]:
-            if p_num == page_num:
-                return  # Page already allocated, no action needed
+        if (process_id, page_num) in self.page_entries:
+            return  # Page already allocated, no action needed
+        if self.page_replacement_algorithm == "OPT":
+            self.optimal.next_use_for((process_id, page_num))
         
         # Add the page to the page table, initially on disk
-        self.page_table[process_id].append((page_num, -1))
+        self._set_page_entry(process_id, page_num, -1)
         
         # Try to place the page in memory if there's a free frame
-        if None in self.memory:
-            frame = self.memory.index(None)
-            self.memory[frame] = (process_id, page_num)
-            if self.page_replacement_algorithm == "FIFO":
-                self.page_queue.append((process_id, page_num))
-            elif self.page_replacement_algorithm == "LRU":
-                self.access_counter += 1
-                self.page_access[frame] = self.access_counter
+        frame = self._allocate_frame()
+        if frame is not None:
+            self._load_page((process_id, page_num), frame)
+            self.pending_load = (process_id, page_num)
             # Update the page table to reflect the frame
-            self.page_table[process_id][-1] = (page_num, frame)
+            self._set_page_entry(process_id, page_num, frame)
 
     def handle_page_fault(self, process_id, page_to_load):
         self.page_faults += 1
         frame = None
         old_page = None
 
-        if self.page_replacement_algorithm == "FIFO":
+        if self.allocator is not None:
+            # Local allocation: the faulting process's own page, or one from a process over its quota
+            frame = self.allocator.evict(process_id)
+            if frame is None:
+                raise ValueError("No pages in memory to evict")
+            old_page = self.memory[frame]
+        elif self.page_replacement_algorithm == "FIFO":
             if not self.page_queue:
                 for i, page in enumerate(self.memory):
                     if page is not None:
@@ -77,10 +294,8 @@ class MemoryManagementSimulator:
                     raise ValueError("No pages in memory to evict")
             else:
                 old_page = self.page_queue.popleft()
-                for i, page in enumerate(self.memory):
-                    if page == old_page:
-                        frame = i
-                        break
+                self.policy_operations += 1
+                frame = self.page_frames.get(old_page)
                 if frame is None:
                     raise ValueError(f"Page {old_page} not found in memory")
         elif self.page_replacement_algorithm == "LRU":
@@ -93,78 +308,202 @@ class MemoryManagementSimulator:
                 if frame is None:
                     raise ValueError("No pages in memory to evict")
             else:
-                # Find the frame with the oldest access time
-                frame = min(self.page_access, key=self.page_access.get)
+                # Evict the least recently used frame
+                frame, _ = self.page_access.popitem(last=False)
+                self.policy_operations += 1
                 old_page = self.memory[frame]
-                del self.page_access[frame]
+        else:
+            # OPT evicts the page whose next use is furthest away; the other
+            # policies pick their own victim
+            if self.page_replacement_algorithm == "OPT":
+                frame = self.optimal.evict()
+            else:
+                frame = self.policy.evict(page_to_load)
+            if frame is None:
+                for i, page in enumerate(self.memory):
+                    if page is not None:
+                        frame = i
+                        break
+                if frame is None:
+                    raise ValueError("No pages in memory to evict")
+            old_page = self.memory[frame]
 
         # Evict the page
         self.disk[old_page] = old_page
         self.memory[frame] = None
+        del self.page_frames[old_page]
+        self.changes.mark("disk", old_page)
+        self.changes.mark("frames", frame)
+        self._release_frame(frame)
         self.last_page_fault = frame
         old_pid, old_page_num = old_page
-        for i, (page_num, frame_num) in enumerate(self.page_table[old_pid]):
-            if frame_num == frame:
-                self.page_table[old_pid][i] = (page_num, -1)
-                break
+        self._set_page_entry(old_pid, old_page_num, -1)
 
-    def simulate_page_request(self, process_id, page_num):
+    def simulate_page_request(self, process_id, page_num, verbose=True):
         process_id = str(process_id)  # Ensure consistency
         page = (process_id, page_num)
-        in_memory = False
-        frame = None
-        for i, mem_page in enumerate(self.memory):
-            if mem_page == page:
-                in_memory = True
-                frame = i
-                break
+        # A TLB hit skips the page table walk
+        frame = self.tlb.lookup(process_id, page_num) if self.tlb is not None else None
+        if frame is None:
+            frame, depth = self.page_walker.translate(process_id, page_num)
+            self.translations += 1
+            self.walk_steps += depth
+            if frame is not None and self.tlb is not None:
+                self.tlb.insert(process_id, page_num, frame)
+        if self.allocator is not None:
+            self.allocator.reference(process_id, page_num, frame is None)
+        if self.page_replacement_algorithm == "OPT":
+            self.optimal.next_use_for(page)
+        # The request that follows allocate_paging is the reference that loaded the page
+        just_loaded = self.pending_load == page
+        self.pending_load = None
         
-        if not in_memory:
-            print(f"Page fault! Process {process_id} requested page {page_num}.")
+        if frame is None:
+            if verbose:
+                print(f"Page fault! Process {process_id} requested page {page_num}.")
             self.handle_page_fault(process_id, page)
-            if None in self.memory:
-                frame = self.memory.index(None)
-                self.memory[frame] = page
-                if self.page_replacement_algorithm == "FIFO":
-                    self.page_queue.append(page)
-                elif self.page_replacement_algorithm == "LRU":
-                    self.access_counter += 1
-                    self.page_access[frame] = self.access_counter
-                if process_id not in self.page_table:
-                    self.page_table[process_id] = []
-                found = False
-                for i, (p_num, f_num) in enumerate(self.page_table[process_id]):
-                    if p_num == page_num:
-                        self.page_table[process_id][i] = (page_num, frame)
-                        found = True
-                        break
-                if not found:
-                    self.page_table[process_id].append((page_num, frame))
+            frame = self._allocate_frame()
+            if frame is not None:
+                self._load_page(page, frame)
+                self._set_page_entry(process_id, page_num, frame)
+                if self.tlb is not None:
+                    self.tlb.insert(process_id, page_num, frame)
+            fault = True
         else:
-            if self.page_replacement_algorithm == "LRU":
-                # Update the access time for the frame
-                self.access_counter += 1
-                self.page_access[frame] = self.access_counter
+            if self.allocator is not None:
+                if self.page_replacement_algorithm == "LRU":
+                    self.allocator.touch(frame)
+            elif self.page_replacement_algorithm == "LRU":
+                # Move the frame to the most recently used end
+                self._touch_frame(frame)
+            elif self.page_replacement_algorithm == "OPT":
+                self.optimal.touch(frame, page)
+            elif self.policy is not None and not just_loaded:
+                self.policy.touch(frame)
+            fault = False
+        if self.page_replacement_algorithm == "OPT":
+            self.optimal.advance()
+        return fault
+
+    def replay_trace(self, references, bitmap=None):
+        # Run a whole (process_id, page_num) trace in one call. Each page is
+        # allocated on first use, the same way the visualizer does it.
+        # OPT replays against this trace as its known future.
+        if self.page_replacement_algorithm == "OPT":
+            references = list(references)
+            self.load_trace(references)
+        references_run = 0
+        page_faults = 0
+        operations = self.bookkeeping_operations()
+        translations, walk_steps = self.translations, self.walk_steps
+        tlb_before = tlb_counters(self.tlb)
+        started = time.perf_counter()
+        for process_id, page_num in references:
+            process_id = str(process_id)
+            self.allocate_paging(process_id, page_num)
+            fault = self.simulate_page_request(process_id, page_num, verbose=False)
+            if fault:
+                page_faults += 1
+            if bitmap is not None:
+                bitmap.append(fault)
+            references_run += 1
+        elapsed = time.perf_counter() - started
+        operations = self.bookkeeping_operations() - operations
+        stats = {
+            "References": references_run,
+            "Page Faults": page_faults,
+            "Hits": references_run - page_faults,
+            "Bookkeeping Operations": operations,
+            "Operations Per Reference": operations / references_run if references_run else 0.0,
+            "References Per Second": references_run / elapsed if elapsed > 0 else 0.0,
+            "Total Page Faults": self.page_faults,
+            "Frame Allocation": self.frame_allocation,
+            "Page Table Organization": self.page_table_organization,
+            "Page Table Bytes": self.page_walker.overhead_bytes(),
+            "Average Walk Depth": ((self.walk_steps - walk_steps) / (self.translations - translations)
+                                   if self.translations > translations else 0.0)
+        }
+        stats.update(tlb_replay_stats(self.tlb, tlb_before, self.page_size))
+        return stats
+
+    def state_entries(self):
+        # Number of stored entries, used to estimate the session's memory footprint
+        return (self.frames + len(self.disk) + 2 * len(self.page_entries)
+                + len(self.page_frames) + len(self.optimal.trace))
 
-    def display_memory(self):
+    def storage_footprint(self):
+        # Measured bytes of the frames, page tables and disk under the current backend
+        return storage_footprint(self, {
+            "Frame Bytes": self.memory,
+            "Page Table Bytes": (self.page_table, self.page_entries),
+            "Disk Bytes": self.disk
+        })
+
+    def display_memory(self, since=None):
+        # With since, return only what changed after that version when the change log still covers it
+        changed = self.changes.changes_since(since) if since is not None else None
+        if changed is not None:
+            return self.display_changes(since, changed)
         memory_frames = [list(frame) if frame is not None else None for frame in self.memory]
         disk_storage = {str(k): list(v) for k, v in self.disk.items()}
         page_table = {str(k): [(p_num, f_num) for p_num, f_num in v] for k, v in self.page_table.items()}
-        return {
+        state = {
             "Memory Frames": memory_frames,
             "Page Table": page_table,
             "Disk Storage": disk_storage,
             "Total Page Faults": self.page_faults,
-            "Last Page Fault": self.last_page_fault
+            "Last Page Fault": self.last_page_fault,
+            "Version": self.changes.version,
+            "Full": True
         }
+        state.update(tlb_counters(self.tlb))
+        return state
+
+    def display_changes(self, since, changed):
+        # Frames as [frame, page] pairs, page table entries as [index, entry] pairs per process
+        memory_frames = [[frame, list(self.memory[frame]) if self.memory[frame] is not None else None]
+                         for frame in sorted(changed.get("frames", ()))]
+        page_table = {}
+        for process_id, index in sorted(changed.get("page_table", ())):
+            page_table.setdefault(str(process_id), []).append([index, self.page_table[process_id][index]])
+        disk_storage = {str(page): list(self.disk[page]) for page in changed.get("disk", ())}
+        state = {
+            "Memory Frames": memory_frames,
+            "Page Table": page_table,
+            "Disk Storage": disk_storage,
+            "Total Page Faults": self.page_faults,
+            "Last Page Fault": self.last_page_fault,
+            "Version": self.changes.version,
+            "Since": since,
+            "Full": False
+        }
+        state.update(tlb_counters(self.tlb))
+        return state
 
     def reset(self):
-        self.memory = [None] * self.frames
+        self.set_backend(self.backend)
+        self.memory = page_list(self.frames, self.process_ids)
         self.page_table = {}
-        self.disk = {}
+        self.disk = page_dict(self.process_ids, pages_as_values=True)
+        self.page_frames = {}
+        self.page_entries = page_dict(self.process_ids)
+        self.page_walker = make_page_table(self.page_table_organization, self.frames, self.page_table, self.page_entries)
+        self.translations = 0
+        self.walk_steps = 0
+        if self.tlb is not None:
+            self.tlb.reset()
+        self.free_frames = []
+        self.next_free_frame = 0
         self.page_queue = collections.deque()
-        self.page_access = {}
-        self.access_counter = 0
+        self.page_access = collections.OrderedDict()
+        self.optimal.rewind()
+        if self.policy is not None:
+            self.policy = FRAME_POLICIES[self.page_replacement_algorithm](self.frames)
+        self.policy_operations = 0
+        if self.allocator is not None:
+            self.allocator.reset()
+        self.pending_load = None
+        self.changes.reset()
         self.page_faults = 0
         self.last_page_fault = None
 
@@ -173,322 +512,1167 @@ Segment = namedtuple('Segment', ['process_id', 'segment_id', 'size', 'base_addre
 
 # Define the SegmentationMemorySimulator class
 class SegmentationMemorySimulator:
-    def __init__(self, total_memory=32):
+    def __init__(self, total_memory=32, placement="FIRST_FIT"):
         self.total_memory = total_memory
-        self.memory = []
-        self.free_blocks = [(0, total_memory)]
-        self.segment_table = {}
+        self.changes = ChangeLog()  # State version and the processes, segment bases and hole bases that changed
+        self.segment_addresses = []  # (base_address, (process_id, segment_id)) in address order
+        # Holes indexed by address and size
+        self.free_space = FreeSpaceManager(total_memory, placement, on_change=self._hole_changed)
+        self.segment_table = {}  # process_id -> {segment_id: Segment} in allocation order
         self.allocation_failures = 0
         self.last_allocation = None
         self.page_replacement_algorithm = "FIFO"  # Default algorithm
-        self.segment_queue = collections.deque()  # For FIFO
-        self.segment_access = {}  # For LRU: tracks the last access time of each segment
-        self.access_counter = 0  # To track the order of accesses for LRU
+        self.segment_queue = collections.OrderedDict()  # For FIFO: segments from oldest to newest
+        self.segment_access = collections.OrderedDict()  # For LRU: segments from least to most recently used
+        self.compaction = "NEVER"
+        self.compaction_threshold = 0.5  # For THRESHOLD: fragmentation that triggers compaction
+        self.compactions = 0
+        self.memory_moved = 0  # Memory copied by compaction
+        self.evictions = 0
+        self.memory_evicted = 0  # Memory freed by evicting live segments
 
     def set_algorithm(self, algorithm):
         if algorithm not in ["FIFO", "LRU"]:
             raise ValueError("Algorithm must be 'FIFO' or 'LRU'")
         self.page_replacement_algorithm = algorithm
-        self.segment_queue = collections.deque()
-        self.segment_access = {}
-        self.access_counter = 0
+        self.segment_queue = collections.OrderedDict()
+        self.segment_access = collections.OrderedDict()
+
+    def set_placement(self, placement):
+        # Hole selection: FIRST_FIT, BEST_FIT, WORST_FIT or NEXT_FIT
+        self.free_space.set_strategy(placement)
+
+    def set_compaction(self, compaction, threshold=None):
+        if compaction not in COMPACTION_POLICIES:
+            raise ValueError(f"Compaction must be one of {', '.join(COMPACTION_POLICIES)}")
+        if threshold is not None:
+            if not 0 <= threshold < 1:
+                raise ValueError("Compaction threshold must be at least 0 and below 1")
+            self.compaction_threshold = threshold
+        self.compaction = compaction
+
+    def _should_compact(self, size):
+        if len(self.free_space) < 2:
+            return False
+        if self.compaction == "ALWAYS":
+            return True
+        if self.compaction == "ON_FAILURE":
+            # No single hole fits, but the holes together do
+            return self.free_space.largest() < size <= self.free_space.total_free
+        if self.compaction == "THRESHOLD":
+            return self.free_space.fragmentation() > self.compaction_threshold
+        return False
+
+    def compact(self):
+        # Slide every segment down to the lowest free address, keeping their order
+        address = 0
+        segment_addresses = []
+        for base, segment_key in self.segment_addresses:
+            process_id, segment_id = segment_key
+            segment = self.segment_table[process_id][segment_id]
+            if base != address:
+                self.segment_table[process_id][segment_id] = segment._replace(base_address=address)
+                self.memory_moved += segment.size
+                self.changes.mark("segments", process_id)
+                self.changes.mark("memory", base)
+                self.changes.mark("memory", address)
+            segment_addresses.append((address, segment_key))
+            address += segment.size
+        self.segment_addresses = segment_addresses
+        self.free_space.reset(used=address)
+        self.compactions += 1
+
+    @property
+    def free_blocks(self):
+        # (base, size) holes in address order
+        return list(self.free_space)
+
+    @property
+    def memory(self):
+        # (base, size, process_id, segment_id) segments in address order
+        memory_state = []
+        for base, (process_id, segment_id) in self.segment_addresses:
+            segment = self.segment_table[process_id][segment_id]
+            memory_state.append((base, segment.size, process_id, segment_id))
+        return memory_state
+
+    def _hole_changed(self, base):
+        self.changes.mark("holes", base)
+
+    def find_segment(self, process_id, segment_id):
+        return self.segment_table.get(str(process_id), {}).get(segment_id)
+
+    def _touch_segment(self, segment_key):
+        # Mark the segment as most recently used for LRU
+        self.segment_access[segment_key] = None
+        self.segment_access.move_to_end(segment_key)
 
     def allocate_segmentation(self, process_id, segment_id, size):
+        if size <= 0:
+            raise ValueError(f"Segment size must be positive, not {size}")
         process_id = str(process_id)  # Store as string
         if process_id not in self.segment_table:
-            self.segment_table[process_id] = []
+            self.segment_table[process_id] = {}
+            self.changes.mark("segments", process_id)
+        if segment_id in self.segment_table[process_id]:
+            return True  # Segment already allocated, no action needed
 
         # Check if we need to evict a segment to make space
-        total_free_space = sum(size for _, size in self.free_blocks)
+        total_free_space = self.free_space.total_free
         if total_free_space < size:
             # Need to evict segments until we have enough space
             while total_free_space < size and (self.segment_queue or self.segment_access):
                 if self.page_replacement_algorithm == "FIFO":
                     if not self.segment_queue:
                         return False
-                    process_id_to_evict, segment_id_to_evict = self.segment_queue.popleft()
+                    segment_key, _ = self.segment_queue.popitem(last=False)
+                    process_id_to_evict, segment_id_to_evict = segment_key
                 elif self.page_replacement_algorithm == "LRU":
                     if not self.segment_access:
                         return False
                     # Find the least recently used segment
-                    segment_key = min(self.segment_access, key=self.segment_access.get)
-                    del self.segment_access[segment_key]
+                    segment_key, _ = self.segment_access.popitem(last=False)
                     process_id_to_evict, segment_id_to_evict = segment_key
 
                 # Deallocate the segment to free up space
+                evicted = self.find_segment(process_id_to_evict, segment_id_to_evict)
+                if evicted is not None:
+                    self.evictions += 1
+                    self.memory_evicted += evicted.size
                 self.deallocate_segment(process_id_to_evict, segment_id_to_evict)
-                total_free_space = sum(size for _, size in self.free_blocks)
-
-        for i, (base, free_size) in enumerate(self.free_blocks):
-            if free_size >= size:
-                segment = Segment(process_id, segment_id, size, base)
-                self.memory.append((base, size, process_id, segment_id))
-                self.segment_table[process_id].append(segment)
-                self.last_allocation = (base, size, process_id, segment_id)
-                if self.page_replacement_algorithm == "FIFO":
-                    self.segment_queue.append((process_id, segment_id))
-                elif self.page_replacement_algorithm == "LRU":
-                    self.access_counter += 1
-                    self.segment_access[(process_id, segment_id)] = self.access_counter
-                new_base = base + size
-                new_size = free_size - size
-                self.free_blocks[i] = (new_base, new_size)
-                if new_size == 0:
-                    self.free_blocks.pop(i)
-                self.memory.sort(key=lambda x: x[0])
-                return True
-
-        self.allocation_failures += 1
-        return False
+                total_free_space = self.free_space.total_free
+
+        if self._should_compact(size):
+            self.compact()
+        base = self.free_space.allocate(size)
+        if base is None:
+            self.allocation_failures += 1
+            return False
+        segment_key = (process_id, segment_id)
+        # Eviction may have dropped this process's last segment and its table entry
+        self.segment_table.setdefault(process_id, {})[segment_id] = Segment(process_id, segment_id, size, base)
+        bisect.insort(self.segment_addresses, (base, segment_key))
+        self.last_allocation = (base, size, process_id, segment_id)
+        self.changes.mark("segments", process_id)
+        self.changes.mark("memory", base)
+        if self.page_replacement_algorithm == "FIFO":
+            self.segment_queue[segment_key] = None
+        elif self.page_replacement_algorithm == "LRU":
+            self._touch_segment(segment_key)
+        return True
 
     def access_segment(self, process_id, segment_id):
         process_id = str(process_id)
         if self.page_replacement_algorithm == "LRU":
             segment_key = (process_id, segment_id)
             if segment_key in self.segment_access:
-                self.access_counter += 1
-                self.segment_access[segment_key] = self.access_counter
+                self._touch_segment(segment_key)
+
+    def replay_trace(self, segment_requests, bitmap=None):
+        # Run a whole (process_id, segment_id, size) trace in one call. A size
+        # of 0 or less is an access, as in the /allocate_segmentation route.
+        # The bitmap records failed allocations.
+        requests_run = 0
+        accesses = 0
+        failures = 0
+        costs = (self.compactions, self.memory_moved, self.evictions, self.memory_evicted)
+        for process_id, segment_id, size in segment_requests:
+            failed = False
+            if size <= 0:
+                self.access_segment(process_id, segment_id)
+                accesses += 1
+            elif not self.allocate_segmentation(process_id, segment_id, size):
+                failed = True
+                failures += 1
+            if bitmap is not None:
+                bitmap.append(failed)
+            requests_run += 1
+        return {
+            "Requests": requests_run,
+            "Accesses": accesses,
+            "Allocations": requests_run - accesses - failures,
+            "Failed Allocations": failures,
+            "Allocation Failures": self.allocation_failures,
+            "Compactions": self.compactions - costs[0],
+            "Memory Moved": self.memory_moved - costs[1],
+            "Evictions": self.evictions - costs[2],
+            "Memory Evicted": self.memory_evicted - costs[3]
+        }
 
     def deallocate_segment(self, process_id, segment_id):
         process_id = str(process_id)  # Ensure consistency
         if process_id not in self.segment_table:
             return
 
-        for i, segment in enumerate(self.segment_table[process_id]):
-            if segment.segment_id == segment_id:
-                base, size = segment.base_address, segment.size
-                self.memory = [entry for entry in self.memory if not (entry[2] == process_id and entry[3] == segment_id)]
-                self.segment_table[process_id].pop(i)
-                self.free_blocks.append((base, size))
-                # Remove from FIFO queue or LRU access tracking
-                if self.page_replacement_algorithm == "FIFO":
-                    if (process_id, segment_id) in self.segment_queue:
-                        self.segment_queue.remove((process_id, segment_id))
-                elif self.page_replacement_algorithm == "LRU":
-                    if (process_id, segment_id) in self.segment_access:
-                        del self.segment_access[(process_id, segment_id)]
-                break
+        segment = self.segment_table[process_id].pop(segment_id, None)
+        if segment is not None:
+            segment_key = (process_id, segment_id)
+            base, size = segment.base_address, segment.size
+            del self.segment_addresses[bisect.bisect_left(self.segment_addresses, (base, segment_key))]
+            self.free_space.free(base, size)
+            self.changes.mark("segments", process_id)
+            self.changes.mark("memory", base)
+            # Remove from FIFO queue or LRU access tracking
+            self.segment_queue.pop(segment_key, None)
+            self.segment_access.pop(segment_key, None)
 
         if not self.segment_table[process_id]:
             del self.segment_table[process_id]
 
-        self.free_blocks.sort(key=lambda x: x[0])
-        i = 0
-        while i < len(self.free_blocks) - 1:
-            base1, size1 = self.free_blocks[i]
-            base2, size2 = self.free_blocks[i + 1]
-            if base1 + size1 == base2:
-                self.free_blocks[i] = (base1, size1 + size2)
-                self.free_blocks.pop(i + 1)
-            else:
-                i += 1
+    def state_entries(self):
+        # Number of stored entries, used to estimate the session's memory footprint
+        return (2 * len(self.segment_addresses) + 2 * len(self.free_space)
+                + len(self.segment_queue) + len(self.segment_access))
 
-    def display_memory(self):
+    def display_memory(self, since=None):
+        # With since, return only what changed after that version when the change log still covers it
+        changed = self.changes.changes_since(since) if since is not None else None
+        if changed is not None:
+            return self.display_changes(since, changed)
         memory_state = [(base, size, pid, sid) for base, size, pid, sid in self.memory]
         segment_table = {
-            str(pid): [(seg.process_id, seg.segment_id, seg.size, seg.base_address) for seg in segments]
+            str(pid): [(seg.process_id, seg.segment_id, seg.size, seg.base_address) for seg in segments.values()]
             for pid, segments in self.segment_table.items()
         }
-        free_blocks = [(base, size) for base, size in self.free_blocks]
+        free_blocks = self.free_blocks
         last_allocation = list(self.last_allocation) if self.last_allocation else None
         return {
             "Memory State": memory_state,
             "Segment Table": segment_table,
             "Free Blocks": free_blocks,
             "Allocation Failures": self.allocation_failures,
-            "Last Allocation": last_allocation
+            "Last Allocation": last_allocation,
+            "Compactions": self.compactions,
+            "Memory Moved": self.memory_moved,
+            "Evictions": self.evictions,
+            "Memory Evicted": self.memory_evicted,
+            "Version": self.changes.version,
+            "Full": True
+        }
+
+    def display_changes(self, since, changed):
+        # Segment tables of the processes that changed (None once a process has none left), and
+        # segments and holes as [base, entry] pairs for the bases that changed (None once freed)
+        memory_state = []
+        for base in sorted(changed.get("memory", ())):
+            i = bisect.bisect_left(self.segment_addresses, (base,))
+            if i < len(self.segment_addresses) and self.segment_addresses[i][0] == base:
+                process_id, segment_id = self.segment_addresses[i][1]
+                size = self.segment_table[process_id][segment_id].size
+                memory_state.append([base, (base, size, process_id, segment_id)])
+            else:
+                memory_state.append([base, None])
+        holes = self.free_space.sizes
+        state = {
+            "Memory State": memory_state,
+            "Segment Table": {
+                str(pid): [(seg.process_id, seg.segment_id, seg.size, seg.base_address)
+                           for seg in self.segment_table[pid].values()] if pid in self.segment_table else None
+                for pid in changed.get("segments", ())
+            },
+            "Free Blocks": [[base, (base, holes[base]) if base in holes else None]
+                            for base in sorted(changed.get("holes", ()))]
         }
+        state.update({
+            "Allocation Failures": self.allocation_failures,
+            "Last Allocation": list(self.last_allocation) if self.last_allocation else None,
+            "Compactions": self.compactions,
+            "Memory Moved": self.memory_moved,
+            "Evictions": self.evictions,
+            "Memory Evicted": self.memory_evicted,
+            "Version": self.changes.version,
+            "Since": since,
+            "Full": False
+        })
+        return state
 
     def reset(self):
-        self.memory = []
-        self.free_blocks = [(0, self.total_memory)]
+        self.segment_addresses = []
+        self.free_space.reset()
         self.segment_table = {}
         self.allocation_failures = 0
         self.last_allocation = None
-        self.segment_queue = collections.deque()
-        self.segment_access = {}
-        self.access_counter = 0
+        self.segment_queue = collections.OrderedDict()
+        self.segment_access = collections.OrderedDict()
+        self.compactions = 0
+        self.memory_moved = 0
+        self.evictions = 0
+        self.memory_evicted = 0
+        self.changes.reset()
 
 # Define the VirtualMemorySimulator class
 class VirtualMemorySimulator:
-    def __init__(self, total_memory=32, page_size=4, swap_size=64):
+    def __init__(self, total_memory=32, page_size=4, swap_size=64, backend="objects"):
         self.total_memory = total_memory
         self.page_size = page_size
         self.frames = total_memory // page_size
-        self.memory = [None] * self.frames
+        self.set_backend(backend)
+        self.memory = page_list(self.frames, self.process_ids)
         self.swap_size = swap_size
         self.swap_frames = swap_size // page_size
-        self.swap = [None] * self.swap_frames
-        self.page_table = {}
+        self.swap = page_list(self.swap_frames, self.process_ids)
+        self.free_swap_slots = []  # Min-heap of released swap slots below next_free_swap_slot
+        self.next_free_swap_slot = 0  # Swap slots from here up have never been used
+        self.page_table = {}  # process_id -> [(page_num, frame or swap slot, in_mem)], indexed by page_num
+        self.page_frames = {}  # Reverse index: resident (process_id, page_num) -> frame
+        self.next_free_frame = 0  # Frames fill up in order and are only reused by replacement
+        self.tlb = None  # Optional TLB in front of the page table
         self.page_replacement_algorithm = "FIFO"  # Default algorithm
         self.page_queue = collections.deque()  # For FIFO
-        self.page_access = {}  # For LRU: tracks the last access time of each frame
+        self.page_access = collections.OrderedDict()  # For LRU: frames from least to most recently used
+        self.optimal = BeladyOptimal(self.frames)  # For OPT: next-use index over the loaded trace
+        self.policy = None  # For CLOCK, SECOND_CHANCE and ARC: replacement state from policies.py
+        self.policy_operations = 0  # Bookkeeping steps taken by FIFO and LRU
+        self.frame_allocation = "GLOBAL"
+        self.allocator = None  # For WORKING_SET and PFF: per-process quotas and resident frames
+        self.changes = ChangeLog()  # State version and changed frames, swap slots and page entries
         self.page_faults = 0
         self.swap_operations = 0
         self.last_page_fault = None
-        self.access_counter = 0  # To track the order of accesses for LRU
-        logger.info(f"Initialized VirtualMemorySimulator with page_table: {self.page_table}")
+        logger.info(f"Initialized VirtualMemorySimulator with {self.frames} frames and {self.swap_frames} swap slots")
+
+    def set_backend(self, backend):
+        # Storage for frames, swap slots and page tables; takes effect from the next reset
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Backend must be one of {', '.join(STORAGE_BACKENDS)}")
+        self.backend = backend
+        self.process_ids = ProcessIds() if backend == "compact" else None
+
+    def set_tlb(self, entries, associativity=None, replacement="LRU", flush_on_switch=False):
+        # A fresh TLB in front of the page table; 0 entries takes it out again
+        self.tlb = TLB(entries, associativity, replacement, flush_on_switch) if entries else None
+
+    def set_frame_allocation(self, allocation, window=64, low=0.02, high=0.1):
+        # GLOBAL, or per-process quotas from a working-set window or the page-fault frequency
+        if allocation not in FRAME_ALLOCATIONS:
+            raise ValueError(f"Frame allocation must be one of {', '.join(FRAME_ALLOCATIONS)}")
+        allocator = None
+        if allocation != "GLOBAL":
+            if self.page_replacement_algorithm not in LOCAL_REPLACEMENT_ALGORITHMS:
+                raise ValueError(f"Local frame allocation needs {' or '.join(LOCAL_REPLACEMENT_ALGORITHMS)}")
+            allocator = LocalFrameAllocator(allocation, self.frames, window, low, high)
+            for frame, page in enumerate(self.memory):
+                if page is not None:
+                    allocator.load(frame, page)
+        self.frame_allocation = allocation
+        self.allocator = allocator
+        # Replacement order starts over, as it does when the algorithm changes
+        self.set_algorithm(self.page_replacement_algorithm)
+
+    def frame_allocation_stats(self):
+        if self.allocator is None:
+            return {"Frame Allocation": self.frame_allocation}
+        return self.allocator.stats()
 
     def set_algorithm(self, algorithm):
-        if algorithm not in ["FIFO", "LRU"]:
-            raise ValueError("Algorithm must be 'FIFO' or 'LRU'")
+        if algorithm not in PAGE_REPLACEMENT_ALGORITHMS:
+            raise ValueError(f"Algorithm must be one of {', '.join(PAGE_REPLACEMENT_ALGORITHMS)}")
+        if self.allocator is not None and algorithm not in LOCAL_REPLACEMENT_ALGORITHMS:
+            raise ValueError(f"Local frame allocation needs {' or '.join(LOCAL_REPLACEMENT_ALGORITHMS)}")
         self.page_replacement_algorithm = algorithm
         self.page_queue = collections.deque()
-        self.page_access = {}
-        self.access_counter = 0
+        self.page_access = collections.OrderedDict()
+        self.optimal.clear()
+        self.policy = FRAME_POLICIES[algorithm](self.frames) if algorithm in FRAME_POLICIES else None
+
+    def load_trace(self, references):
+        # OPT is offline: it needs the whole (process_id, page_num) trace before the first request
+        self.optimal.load_trace(references)
+
+    def _touch_frame(self, frame):
+        # Mark the frame as most recently used for LRU
+        self.page_access[frame] = None
+        self.page_access.move_to_end(frame)
+        self.policy_operations += 1
+
+    def bookkeeping_operations(self):
+        # Work done by the replacement algorithm, to compare policies by cost as well as hit ratio
+        operations = self.policy_operations + self.optimal.operations
+        if self.policy is not None:
+            operations += self.policy.operations
+        return operations
 
     def allocate_virtual(self, process_id, num_pages):
+        # Give the process pages 0 to num_pages - 1 in swap; pages it already has are kept
         process_id = str(process_id)  # Store as string
         if process_id not in self.page_table:
-            self.page_table[process_id] = []
-
-        for page_num in range(num_pages):
+            self.page_table[process_id] = entry_list("qqb", self.process_ids)
+        pages = self.page_table[process_id]
+        for page_num in range(len(pages), num_pages):
             swap_frame = self.find_free_swap_frame()
             if swap_frame is None:
                 raise ValueError("No free swap space available for page allocation")
-            self.page_table[process_id].append((page_num, swap_frame, False))
+            pages.append((page_num, swap_frame, False))
             self.swap[swap_frame] = (process_id, page_num)
-        logger.info(f"After allocate_virtual for process {process_id}, page_table: {self.page_table}")
+            self.changes.mark("page_table", (process_id, page_num))
+            self.changes.mark("swap", swap_frame)
+        logger.info(f"After allocate_virtual for process {process_id}: {len(pages)} pages")
 
     def find_free_swap_frame(self):
-        for i in range(len(self.swap)):
-            if self.swap[i] is None:
-                return i
+        # Take the lowest free swap slot, same as the first None in self.swap
+        if self.free_swap_slots:
+            return heapq.heappop(self.free_swap_slots)
+        if self.next_free_swap_slot < self.swap_frames:
+            slot = self.next_free_swap_slot
+            self.next_free_swap_slot += 1
+            return slot
         return None
 
+    def _release_swap_slot(self, slot):
+        self.swap[slot] = None
+        heapq.heappush(self.free_swap_slots, slot)
+        self.changes.mark("swap", slot)
+
+    def _page_entry(self, process_id, page_num):
+        # (page_num, frame or swap slot, in_mem) for a page, or None if the process does not have it
+        pages = self.page_table.get(process_id)
+        if pages is None or not 0 <= page_num < len(pages):
+            return None
+        return pages[page_num]
+
+    def _set_page_entry(self, process_id, page_num, frame, in_mem):
+        self.page_table[process_id][page_num] = (page_num, frame, in_mem)
+        if not in_mem and self.tlb is not None:
+            self.tlb.invalidate(process_id, page_num)
+        self.changes.mark("page_table", (process_id, page_num))
+
     def load_page_into_memory(self, page, frame, swap_frame):
         self.memory[frame] = page
-        self.swap[swap_frame] = None
+        self.page_frames[page] = frame
+        self.changes.mark("frames", frame)
+        self._release_swap_slot(swap_frame)
         process_id, page_num = page
-        for i, (p_num, f_num, in_mem) in enumerate(self.page_table[process_id]):
-            if p_num == page_num:
-                self.page_table[process_id][i] = (page_num, frame, True)
-                break
-        if self.page_replacement_algorithm == "FIFO":
+        self._set_page_entry(process_id, page_num, frame, True)
+        if self.allocator is not None:
+            self.allocator.load(frame, page)
+        elif self.page_replacement_algorithm == "FIFO":
             self.page_queue.append(frame)
+            self.policy_operations += 1
         elif self.page_replacement_algorithm == "LRU":
-            self.access_counter += 1
-            self.page_access[frame] = self.access_counter
+            self._touch_frame(frame)
+        elif self.page_replacement_algorithm == "OPT":
+            self.optimal.touch(frame, page)
+        elif self.policy is not None:
+            self.policy.load(frame, page)
 
     def handle_page_fault_with_swap(self, process_id, page_num):
         process_id = str(process_id)  # Ensure consistency
         self.page_faults += 1
         page = (process_id, page_num)
 
-        swap_frame = None
-        for i, (p_num, f_num, in_mem) in enumerate(self.page_table.get(process_id, [])):
-            if p_num == page_num and not in_mem:
-                swap_frame = f_num
-                break
-
-        if swap_frame is None:
+        entry = self._page_entry(process_id, page_num)
+        if entry is None or entry[2]:
             raise ValueError(f"Page {page_num} for process {process_id} not found in swap space")
+        swap_frame = entry[1]
 
-        free_frame = None
-        for i in range(len(self.memory)):
-            if self.memory[i] is None:
-                free_frame = i
-                break
-
-        if free_frame is not None:
+        if self.next_free_frame < self.frames:
+            free_frame = self.next_free_frame
+            self.next_free_frame += 1
             self.load_page_into_memory(page, free_frame, swap_frame)
             self.last_page_fault = free_frame
         else:
-            if self.page_replacement_algorithm == "FIFO":
+            free_frame = None
+            # The resident scans below name their loop variable resident, not page,
+            # so the faulting page is still the one loaded afterwards
+            if self.allocator is not None:
+                # Local allocation: the faulting process's own page, or one from a process over its quota
+                free_frame = self.allocator.evict(process_id)
+                if free_frame is None:
+                    raise ValueError("No pages in memory to evict")
+                old_page = self.memory[free_frame]
+            elif self.page_replacement_algorithm == "FIFO":
                 if not self.page_queue:
-                    for i, page in enumerate(self.memory):
-                        if page is not None:
+                    for i, resident in enumerate(self.memory):
+                        if resident is not None:
                             free_frame = i
-                            old_page = page
+                            old_page = resident
                             break
                     if free_frame is None:
                         raise ValueError("No pages in memory to evict")
                 else:
                     free_frame = self.page_queue.popleft()
+                    self.policy_operations += 1
                     old_page = self.memory[free_frame]
             elif self.page_replacement_algorithm == "LRU":
                 if not self.page_access:
-                    for i, page in enumerate(self.memory):
-                        if page is not None:
+                    for i, resident in enumerate(self.memory):
+                        if resident is not None:
                             free_frame = i
-                            old_page = page
+                            old_page = resident
                             break
                     if free_frame is None:
                         raise ValueError("No pages in memory to evict")
                 else:
-                    free_frame = min(self.page_access, key=self.page_access.get)
+                    free_frame, _ = self.page_access.popitem(last=False)
+                    self.policy_operations += 1
                     old_page = self.memory[free_frame]
-                    del self.page_access[free_frame]
+            else:
+                # OPT swaps out the page whose next use is furthest away; the
+                # other policies pick their own victim
+                if self.page_replacement_algorithm == "OPT":
+                    free_frame = self.optimal.evict()
+                else:
+                    free_frame = self.policy.evict(page)
+                if free_frame is None:
+                    for i, resident in enumerate(self.memory):
+                        if resident is not None:
+                            free_frame = i
+                            break
+                    if free_frame is None:
+                        raise ValueError("No pages in memory to evict")
+                old_page = self.memory[free_frame]
 
             # Swap out the old page
             old_swap_frame = self.find_free_swap_frame()
             if old_swap_frame is None:
                 raise ValueError("No free swap space available for swapping out")
             self.swap[old_swap_frame] = old_page
+            self.changes.mark("swap", old_swap_frame)
             old_pid, old_page_num = old_page
-            for i, (p_num, f_num, in_mem) in enumerate(self.page_table[old_pid]):
-                if p_num == old_page_num and in_mem:
-                    self.page_table[old_pid][i] = (p_num, old_swap_frame, False)
-                    break
+            self._set_page_entry(old_pid, old_page_num, old_swap_frame, False)
             self.swap_operations += 1
             self.memory[free_frame] = None
+            del self.page_frames[old_page]
             self.load_page_into_memory(page, free_frame, swap_frame)
             self.last_page_fault = free_frame
 
-    def simulate_virtual_page_request(self, process_id, page_num):
+    def simulate_virtual_page_request(self, process_id, page_num, verbose=True):
         process_id = str(process_id)  # Ensure consistency
         page = (process_id, page_num)
-        in_memory = False
-        frame = None
-        for i, mem_page in enumerate(self.memory):
-            if mem_page == page:
-                in_memory = True
-                frame = i
-                break
+        # A TLB hit skips the page table lookup
+        frame = self.tlb.lookup(process_id, page_num) if self.tlb is not None else None
+        if frame is None:
+            frame = self.page_frames.get(page)
+            if frame is not None and self.tlb is not None:
+                self.tlb.insert(process_id, page_num, frame)
+        in_memory = frame is not None
+        if self.allocator is not None:
+            self.allocator.reference(process_id, page_num, not in_memory)
+        if self.page_replacement_algorithm == "OPT":
+            self.optimal.next_use_for(page)
 
         if not in_memory:
-            print(f"Page fault! Process {process_id} requested page {page_num}.")
+            if verbose:
+                print(f"Page fault! Process {process_id} requested page {page_num}.")
             self.handle_page_fault_with_swap(process_id, page_num)
+            if self.tlb is not None:
+                self.tlb.insert(process_id, page_num, self.page_frames[page])
+            fault = True
         else:
-            if self.page_replacement_algorithm == "LRU":
-                self.access_counter += 1
-                self.page_access[frame] = self.access_counter
+            if self.allocator is not None:
+                if self.page_replacement_algorithm == "LRU":
+                    self.allocator.touch(frame)
+            elif self.page_replacement_algorithm == "LRU":
+                self._touch_frame(frame)
+            elif self.page_replacement_algorithm == "OPT":
+                self.optimal.touch(frame, page)
+            elif self.policy is not None:
+                self.policy.touch(frame)
+            fault = False
+        if self.page_replacement_algorithm == "OPT":
+            self.optimal.advance()
+        return fault
 
-    def display_memory(self):
+    def replay_trace(self, references, bitmap=None):
+        # Run a whole (process_id, page_num) trace in one call. Processes
+        # must already have their pages allocated in swap. OPT replays
+        # against this trace as its known future.
+        if self.page_replacement_algorithm == "OPT":
+            references = list(references)
+            self.load_trace(references)
+        references_run = 0
+        page_faults = 0
+        swap_operations = self.swap_operations
+        operations = self.bookkeeping_operations()
+        tlb_before = tlb_counters(self.tlb)
+        started = time.perf_counter()
+        for process_id, page_num in references:
+            fault = self.simulate_virtual_page_request(process_id, page_num, verbose=False)
+            if fault:
+                page_faults += 1
+            if bitmap is not None:
+                bitmap.append(fault)
+            references_run += 1
+        elapsed = time.perf_counter() - started
+        operations = self.bookkeeping_operations() - operations
+        stats = {
+            "References": references_run,
+            "Page Faults": page_faults,
+            "Hits": references_run - page_faults,
+            "Swap Operations": self.swap_operations - swap_operations,
+            "Bookkeeping Operations": operations,
+            "Operations Per Reference": operations / references_run if references_run else 0.0,
+            "References Per Second": references_run / elapsed if elapsed > 0 else 0.0,
+            "Total Page Faults": self.page_faults,
+            "Frame Allocation": self.frame_allocation
+        }
+        stats.update(tlb_replay_stats(self.tlb, tlb_before, self.page_size))
+        return stats
+
+    def state_entries(self):
+        # Number of stored entries, used to estimate the session's memory footprint
+        return (self.frames + self.swap_frames + len(self.optimal.trace)
+                + sum(len(pages) for pages in self.page_table.values()))
+
+    def storage_footprint(self):
+        # Measured bytes of the frames, swap slots and page tables under the current backend
+        return storage_footprint(self, {
+            "Frame Bytes": self.memory,
+            "Page Table Bytes": self.page_table,
+            "Swap Bytes": self.swap
+        })
+
+    def display_memory(self, since=None):
+        # With since, return only what changed after that version when the change log still covers it
+        changed = self.changes.changes_since(since) if since is not None else None
+        if changed is not None:
+            return self.display_changes(since, changed)
         memory_frames = [list(frame) if frame is not None else None for frame in self.memory]
         swap_space = [list(frame) if frame is not None else None for frame in self.swap]
         page_table = {
             str(pid): [(p_num, f_num, in_mem) for p_num, f_num, in_mem in pages]
             for pid, pages in self.page_table.items()
         }
-        return {
+        state = {
+            "Memory Frames": memory_frames,
+            "Swap Space": swap_space,
+            "Page Table": page_table,
+            "Total Page Faults": self.page_faults,
+            "Swap Operations": self.swap_operations,
+            "Last Page Fault": self.last_page_fault,
+            "Version": self.changes.version,
+            "Full": True
+        }
+        state.update(tlb_counters(self.tlb))
+        return state
+
+    def display_changes(self, since, changed):
+        # Frames and swap slots as [index, page] pairs, page table entries as [index, entry] pairs per process
+        memory_frames = [[frame, list(self.memory[frame]) if self.memory[frame] is not None else None]
+                         for frame in sorted(changed.get("frames", ()))]
+        swap_space = [[slot, list(self.swap[slot]) if self.swap[slot] is not None else None]
+                      for slot in sorted(changed.get("swap", ()))]
+        page_table = {}
+        for process_id, index in sorted(changed.get("page_table", ())):
+            page_table.setdefault(str(process_id), []).append([index, self.page_table[process_id][index]])
+        state = {
             "Memory Frames": memory_frames,
             "Swap Space": swap_space,
             "Page Table": page_table,
             "Total Page Faults": self.page_faults,
             "Swap Operations": self.swap_operations,
-            "Last Page Fault": self.last_page_fault
+            "Last Page Fault": self.last_page_fault,
+            "Version": self.changes.version,
+            "Since": since,
+            "Full": False
         }
+        state.update(tlb_counters(self.tlb))
+        return state
 
     def reset(self):
-        self.memory = [None] * self.frames
-        self.swap = [None] * self.swap_frames
+        self.set_backend(self.backend)
+        self.memory = page_list(self.frames, self.process_ids)
+        self.swap = page_list(self.swap_frames, self.process_ids)
+        self.free_swap_slots = []
+        self.next_free_swap_slot = 0
         self.page_table = {}
+        self.page_frames = {}
+        self.next_free_frame = 0
+        if self.tlb is not None:
+            self.tlb.reset()
         self.page_queue = collections.deque()
-        self.page_access = {}
-        self.access_counter = 0
+        self.page_access = collections.OrderedDict()
+        self.optimal.rewind()
+        if self.policy is not None:
+            self.policy = FRAME_POLICIES[self.page_replacement_algorithm](self.frames)
+        self.policy_operations = 0
+        if self.allocator is not None:
+            self.allocator.reset()
+        self.changes.reset()
         self.page_faults = 0
         self.swap_operations = 0
         self.last_page_fault = None
 
-# Initialize the simulators
-simulator = MemoryManagementSimulator()
-segmentation_simulator = SegmentationMemorySimulator()
-virtual_simulator = VirtualMemorySimulator()
+# A buddy-system block holding one segment: block_size is the power-of-two size it was rounded up to
+BuddyBlock = namedtuple('BuddyBlock', ['process_id', 'segment_id', 'size', 'block_size', 'base_address'])
+
+# Define the BuddyMemorySimulator class
+class BuddyMemorySimulator:
+    def __init__(self, total_memory=32, min_block=1):
+        self.total_memory = total_memory
+        self.changes = ChangeLog()  # State version and the processes, block bases and free block bases that changed
+        self.allocator = BuddyAllocator(total_memory, min_block, on_change=self._free_block_changed)
+        self.block_table = {}  # process_id -> {segment_id: BuddyBlock} in allocation order
+        self.block_addresses = {}  # base_address -> (process_id, segment_id) of the block there
+        self.allocation_failures = 0
+        self.last_allocation = None
+        self.requested_memory = 0  # Sum of requested sizes of live blocks
+        self.allocated_memory = 0  # Sum of block sizes of live blocks
+        self.evictions = 0
+        self.page_replacement_algorithm = "FIFO"  # Default algorithm
+        self.block_queue = collections.OrderedDict()  # For FIFO: blocks from oldest to newest
+        self.block_access = collections.OrderedDict()  # For LRU: blocks from least to most recently used
+
+    def set_algorithm(self, algorithm):
+        if algorithm not in ["FIFO", "LRU"]:
+            raise ValueError("Algorithm must be 'FIFO' or 'LRU'")
+        self.page_replacement_algorithm = algorithm
+        self.block_queue = collections.OrderedDict()
+        self.block_access = collections.OrderedDict()
+
+    def _free_block_changed(self, base):
+        self.changes.mark("free", base)
+
+    def _touch_block(self, block_key):
+        # Mark the block as most recently used for LRU
+        self.block_access[block_key] = None
+        self.block_access.move_to_end(block_key)
+
+    def allocate_block(self, process_id, segment_id, size):
+        process_id = str(process_id)  # Store as string
+        if segment_id in self.block_table.get(process_id, {}):
+            return True  # Segment already allocated, no action needed
+        if self.allocator.order_for(size) is None:
+            self.allocation_failures += 1
+            return False
+
+        # Evict blocks until a free block of the right order can be split off
+        allocation = self.allocator.allocate(size)
+        while allocation is None:
+            queue = self.block_queue if self.page_replacement_algorithm == "FIFO" else self.block_access
+            if not queue:
+                self.allocation_failures += 1
+                return False
+            (process_id_to_evict, segment_id_to_evict), _ = queue.popitem(last=False)
+            self.deallocate_block(process_id_to_evict, segment_id_to_evict)
+            self.evictions += 1
+            allocation = self.allocator.allocate(size)
+
+        base, block_size = allocation
+        block_key = (process_id, segment_id)
+        self.block_table.setdefault(process_id, {})[segment_id] = BuddyBlock(process_id, segment_id, size, block_size, base)
+        self.block_addresses[base] = block_key
+        self.requested_memory += size
+        self.allocated_memory += block_size
+        self.last_allocation = (base, block_size, process_id, segment_id)
+        self.changes.mark("blocks", process_id)
+        self.changes.mark("memory", base)
+        if self.page_replacement_algorithm == "FIFO":
+            self.block_queue[block_key] = None
+        elif self.page_replacement_algorithm == "LRU":
+            self._touch_block(block_key)
+        return True
+
+    def access_block(self, process_id, segment_id):
+        process_id = str(process_id)
+        if self.page_replacement_algorithm == "LRU":
+            block_key = (process_id, segment_id)
+            if block_key in self.block_access:
+                self._touch_block(block_key)
+
+    def deallocate_block(self, process_id, segment_id):
+        process_id = str(process_id)  # Ensure consistency
+        block = self.block_table.get(process_id, {}).pop(segment_id, None)
+        if block is None:
+            return
+        self.allocator.free(block.base_address)
+        del self.block_addresses[block.base_address]
+        self.requested_memory -= block.size
+        self.allocated_memory -= block.block_size
+        self.block_queue.pop((process_id, segment_id), None)
+        self.block_access.pop((process_id, segment_id), None)
+        if not self.block_table[process_id]:
+            del self.block_table[process_id]
+        self.changes.mark("blocks", process_id)
+        self.changes.mark("memory", block.base_address)
+
+    def internal_fragmentation(self):
+        # Memory inside allocated blocks that their segments do not use
+        return self.allocated_memory - self.requested_memory
+
+    def replay_trace(self, segment_requests, bitmap=None):
+        # Run a whole (process_id, segment_id, size) trace in one call, as
+        # SegmentationMemorySimulator.replay_trace does. The bitmap records
+        # failed allocations.
+        requests_run = 0
+        accesses = 0
+        failures = 0
+        evictions = self.evictions
+        operations = self.allocator.operations
+        for process_id, segment_id, size in segment_requests:
+            failed = False
+            if size <= 0:
+                self.access_block(process_id, segment_id)
+                accesses += 1
+            elif not self.allocate_block(process_id, segment_id, size):
+                failed = True
+                failures += 1
+            if bitmap is not None:
+                bitmap.append(failed)
+            requests_run += 1
+        return {
+            "Requests": requests_run,
+            "Accesses": accesses,
+            "Allocations": requests_run - accesses - failures,
+            "Failed Allocations": failures,
+            "Allocation Failures": self.allocation_failures,
+            "Evictions": self.evictions - evictions,
+            "Split Merge Operations": self.allocator.operations - operations,
+            "Internal Fragmentation": self.internal_fragmentation(),
+            "Allocated Memory": self.allocated_memory
+        }
+
+    def state_entries(self):
+        # Number of stored entries, used to estimate the session's memory footprint
+        return (3 * len(self.allocator.allocated) + sum(len(heap) for heap in self.allocator.free_lists)
+                + len(self.block_queue) + len(self.block_access))
+
+    def _block_entries(self, process_id):
+        return [(block.process_id, block.segment_id, block.size, block.block_size, block.base_address)
+                for block in self.block_table[process_id].values()]
+
+    def _layout(self):
+        # Allocated blocks and free blocks in address order, plus the free lists by block size
+        memory_state = sorted((block.base_address, block.block_size, block.process_id, block.segment_id, block.size)
+                              for blocks in self.block_table.values() for block in blocks.values())
+        free_lists = {}
+        free_blocks = []
+        for order in range(self.allocator.max_order + 1):
+            bases = self.allocator.free_bases(order)
+            if bases:
+                block_size = self.allocator.block_size(order)
+                free_lists[str(block_size)] = bases
+                free_blocks.extend((base, block_size) for base in bases)
+        return memory_state, free_lists, sorted(free_blocks)
+
+    def _counters(self):
+        return {
+            "Allocation Failures": self.allocation_failures,
+            "Last Allocation": list(self.last_allocation) if self.last_allocation else None,
+            "Requested Memory": self.requested_memory,
+            "Allocated Memory": self.allocated_memory,
+            "Internal Fragmentation": self.internal_fragmentation(),
+            "Evictions": self.evictions,
+            "Split Merge Operations": self.allocator.operations,
+            "Version": self.changes.version
+        }
+
+    def display_memory(self, since=None):
+        # With since, return only what changed after that version when the change log still covers it
+        changed = self.changes.changes_since(since) if since is not None else None
+        if changed is not None:
+            return self.display_changes(since, changed)
+        memory_state, free_lists, free_blocks = self._layout()
+        state = {
+            "Memory State": memory_state,
+            "Block Table": {str(pid): self._block_entries(pid) for pid in self.block_table},
+            "Free Lists": free_lists,
+            "Free Blocks": free_blocks
+        }
+        state.update(self._counters())
+        state["Full"] = True
+        return state
+
+    def display_changes(self, since, changed):
+        # Block tables of the processes that changed (None once a process has none left), and
+        # blocks and free blocks as [base, entry] pairs for the bases that changed (None once gone).
+        # Free Lists pairs give the block size of the free list a base is on now.
+        memory_state = []
+        for base in sorted(changed.get("memory", ())):
+            block_key = self.block_addresses.get(base)
+            if block_key is None:
+                memory_state.append([base, None])
+            else:
+                block = self.block_table[block_key[0]][block_key[1]]
+                memory_state.append([base, (base, block.block_size, block.process_id, block.segment_id, block.size)])
+        free_lists = []
+        free_blocks = []
+        for base in sorted(changed.get("free", ())):
+            order = self.allocator.free_order(base)
+            block_size = self.allocator.block_size(order) if order is not None else None
+            free_lists.append([base, block_size])
+            free_blocks.append([base, (base, block_size) if order is not None else None])
+        state = {
+            "Memory State": memory_state,
+            "Block Table": {
+                str(pid): self._block_entries(pid) if pid in self.block_table else None
+                for pid in changed.get("blocks", ())
+            },
+            "Free Lists": free_lists,
+            "Free Blocks": free_blocks
+        }
+        state.update(self._counters())
+        state["Since"] = since
+        state["Full"] = False
+        return state
+
+    def reset(self):
+        self.allocator.reset()
+        self.block_table = {}
+        self.block_addresses = {}
+        self.allocation_failures = 0
+        self.last_allocation = None
+        self.requested_memory = 0
+        self.allocated_memory = 0
+        self.evictions = 0
+        self.block_queue = collections.OrderedDict()
+        self.block_access = collections.OrderedDict()
+        self.changes.reset()
+
+# A small object in a slab cache; address is frame * page_size + slot * object size
+SlabObject = namedtuple('SlabObject', ['process_id', 'object_id', 'size', 'address'])
+
+# Define the SlabMemorySimulator class (Slab Mode)
+class SlabMemorySimulator:
+    def __init__(self, frames=8, page_size=4096, size_classes=SLAB_SIZE_CLASSES):
+        self.frames = frames
+        self.page_size = page_size  # Bytes, unlike the KB used by the other modes
+        self.allocator = SlabAllocator(frames, page_size, size_classes)
+        self.object_table = {}  # process_id -> {object_id: SlabObject}
+        self.allocation_failures = 0
+        self.last_allocation = None
+        self.requested_memory = 0  # Sum of requested sizes of live objects
+        self.changes = ChangeLog()  # State version and changed frames, caches and processes
+
+    def _mark_frame(self, frame):
+        self.changes.mark("frames", frame)
+        self.changes.mark("caches", self.allocator.frame_caches[frame].object_size)
+
+    def allocate_object(self, process_id, object_id, size):
+        process_id = str(process_id)  # Store as string
+        if object_id in self.object_table.get(process_id, {}):
+            return True  # Object already allocated, no action needed
+        released = []
+        address = self.allocator.allocate(size, released)
+        for frame in released:
+            self.changes.mark("frames", frame)
+        if released:
+            self.changes.mark("caches", None)
+        if address is None:
+            self.allocation_failures += 1
+            return False
+        self.object_table.setdefault(process_id, {})[object_id] = SlabObject(process_id, object_id, size, address)
+        self.requested_memory += size
+        self.last_allocation = (address, size, process_id, object_id)
+        self._mark_frame(address // self.page_size)
+        self.changes.mark("objects", process_id)
+        return True
+
+    def free_object(self, process_id, object_id):
+        process_id = str(process_id)
+        slab_object = self.object_table.get(process_id, {}).pop(object_id, None)
+        if slab_object is None:
+            return False
+        self._mark_frame(self.allocator.free(slab_object.address))
+        self.requested_memory -= slab_object.size
+        if not self.object_table[process_id]:
+            del self.object_table[process_id]
+        self.changes.mark("objects", process_id)
+        return True
+
+    def pages_used(self):
+        return self.allocator.pool.used
+
+    def replay_trace(self, object_requests, bitmap=None):
+        # Run a whole (process_id, object_id, size) trace in one call. A size of
+        # 0 or less frees the object. The bitmap records failed allocations.
+        requests_run = 0
+        frees = 0
+        failures = 0
+        for process_id, object_id, size in object_requests:
+            failed = False
+            if size <= 0:
+                self.free_object(process_id, object_id)
+                frees += 1
+            elif not self.allocate_object(process_id, object_id, size):
+                failed = True
+                failures += 1
+            if bitmap is not None:
+                bitmap.append(failed)
+            requests_run += 1
+        return {
+            "Requests": requests_run,
+            "Frees": frees,
+            "Allocations": requests_run - frees - failures,
+            "Failed Allocations": failures,
+            "Allocation Failures": self.allocation_failures,
+            "Pages Used": self.pages_used(),
+            "Caches": self._cache_stats()
+        }
+
+    def state_entries(self):
+        # Number of stored entries, used to estimate the session's memory footprint
+        return (sum(len(objects) for objects in self.object_table.values())
+                + sum(len(cache.slabs) for cache in self.allocator.caches.values()))
+
+    def _frame_entry(self, frame):
+        # [object size, objects, capacity] of the slab on a frame, or None if the frame is free
+        cache = self.allocator.frame_caches.get(frame)
+        if cache is None:
+            return None
+        return [cache.object_size, cache.slabs[frame].in_use, cache.capacity]
+
+    def _object_entries(self, process_id):
+        return [(slab_object.object_id, slab_object.size, slab_object.address)
+                for slab_object in self.object_table[process_id].values()]
+
+    def _cache_stats(self):
+        return {str(size): cache.stats() for size, cache in self.allocator.caches.items()}
+
+    def _counters(self):
+        pages_used = self.pages_used()
+        return {
+            "Pages Used": pages_used,
+            "Requested Memory": self.requested_memory,
+            "Memory Utilization": self.requested_memory / (pages_used * self.page_size) if pages_used else 0.0,
+            "Allocation Failures": self.allocation_failures,
+            "Last Allocation": list(self.last_allocation) if self.last_allocation else None,
+            "Version": self.changes.version
+        }
+
+    def display_memory(self, since=None):
+        # With since, return only what changed after that version when the change log still covers it
+        changed = self.changes.changes_since(since) if since is not None else None
+        if changed is not None:
+            return self.display_changes(since, changed)
+        state = {
+            "Memory Frames": [self._frame_entry(frame) for frame in range(self.frames)],
+            "Caches": self._cache_stats(),
+            "Object Table": {str(pid): self._object_entries(pid) for pid in self.object_table}
+        }
+        state.update(self._counters())
+        state["Full"] = True
+        return state
+
+    def display_changes(self, since, changed):
+        # Changed frames as [frame, entry] pairs, caches whose slabs changed and
+        # the object tables of changed processes (None once a process has none left)
+        caches = changed.get("caches", set())
+        if None in caches:
+            caches = set(self.allocator.caches)  # Empty slabs were reaped from any cache
+        state = {
+            "Memory Frames": [(frame, self._frame_entry(frame)) for frame in sorted(changed.get("frames", ()))],
+            "Caches": {str(size): self.allocator.caches[size].stats() for size in caches},
+            "Object Table": {
+                str(pid): self._object_entries(pid) if pid in self.object_table else None
+                for pid in changed.get("objects", ())
+            }
+        }
+        state.update(self._counters())
+        state["Since"] = since
+        state["Full"] = False
+        return state
+
+    def reset(self):
+        self.allocator.reset()
+        self.object_table = {}
+        self.allocation_failures = 0
+        self.last_allocation = None
+        self.requested_memory = 0
+        self.changes.reset()
+
+# Simulators live in per-client sessions, created on a session's first request
+def create_simulators():
+    return {
+        "paging": MemoryManagementSimulator(backend=SESSION_CONFIG["storage_backend"]),
+        "segmentation": SegmentationMemorySimulator(),
+        "virtual": VirtualMemorySimulator(backend=SESSION_CONFIG["storage_backend"]),
+        "buddy": BuddyMemorySimulator(),
+        "slab": SlabMemorySimulator()
+    }
+
+sessions = SessionRegistry(
+    create_simulators,
+    max_bytes=SESSION_CONFIG["max_bytes"],
+    max_sessions=SESSION_CONFIG["max_sessions"],
+    idle_timeout=SESSION_CONFIG["idle_timeout"]
+)
+
+def current_session_id():
+    # Clients without a session ID share the default session
+    return (request.headers.get(SESSION_CONFIG["header"])
+            or request.args.get('session_id')
+            or SESSION_CONFIG["default_session"])
+
+def current_session():
+    return sessions.get(current_session_id())
+
+def with_simulator(kind, write=True):
+    """Decorator that passes the session's simulator to the route under its lock.
+
+    Routes that change state take the write lock; read-only routes share
+    the read lock, so they run alongside each other and never see a
+    half-applied change.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            session = current_session()
+            lock = session.locks[kind]
+            with lock.write_lock() if write else lock.read_lock():
+                response = f(getattr(session, kind), *args, **kwargs)
+                if write:
+                    session.record_size(kind)
+            if write:
+                session.events.publish()
+            return response
+        return decorated_function
+    return decorator
+
+@app.after_request
+def update_session(response):
+    sessions.update(current_session_id())
+    return response
+
+@app.route('/new_session', methods=['POST'])
+def new_session():
+    session_id = uuid.uuid4().hex
+    sessions.get(session_id)
+    return jsonify({"session_id": session_id, "header": SESSION_CONFIG["header"]}), 200
+
+@app.route('/end_session', methods=['POST'])
+def end_session():
+    session_id = current_session_id()
+    if not sessions.remove(session_id):
+        return jsonify({"error": f"Session {session_id} not found."}), 404
+    return jsonify({"message": f"Session {session_id} ended."}), 200
+
+@app.route('/sessions', methods=['GET'])
+def session_stats():
+    return jsonify(sessions.stats()), 200
+
+SIMULATOR_KINDS = ("paging", "segmentation", "virtual", "buddy", "slab")
+
+def state_events(session, kinds):
+    # Server-Sent Events: a full snapshot per simulator first, then a diff whenever its version moves
+    sent = dict.fromkeys(kinds)
+    seen = None
+    while not session.events.closed:
+        sequence = session.events.wait(seen, EVENT_KEEPALIVE)
+        if sequence == seen:
+            if not session.events.closed:
+                yield ": keepalive\n\n"
+            continue
+        seen = sequence
+        for kind in kinds:
+            with session.locks[kind].read_lock():
+                state = getattr(session, kind).display_memory(sent[kind])
+            if state["Version"] != sent[kind]:
+                sent[kind] = state["Version"]
+                yield f"event: {kind}\ndata: {json.dumps(state)}\n\n"
+
+@app.route('/events', methods=['GET'])
+def events():
+    kinds = request.args.get('modes', ','.join(SIMULATOR_KINDS)).split(',')
+    if any(kind not in SIMULATOR_KINDS for kind in kinds):
+        return jsonify({"error": f"modes must be drawn from {', '.join(SIMULATOR_KINDS)}"}), 400
+    stream = state_events(current_session(), kinds)
+    return Response(stream, mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 # Flask routes for Paging Mode
 @app.route('/set_algorithm', methods=['POST'])
-def set_algorithm():
+@with_simulator('paging')
+def set_algorithm(simulator):
     data = request.get_json()
     algorithm = data.get('algorithm')
     try:
@@ -497,8 +1681,64 @@ def set_algorithm():
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
+@app.route('/set_page_table', methods=['POST'])
+@with_simulator('paging')
+def set_page_table(simulator):
+    data = request.get_json()
+    organization = data.get('organization')
+    try:
+        simulator.set_page_table(organization)
+        return jsonify({"message": f"Page table set to {organization}."}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/page_table_stats', methods=['GET'])
+@with_simulator('paging', write=False)
+def page_table_stats(simulator):
+    return jsonify(simulator.page_table_stats()), 200
+
+def configure_tlb(simulator, data):
+    # Shared by the Paging and Virtual Memory TLB routes; 0 entries turns the TLB off
+    try:
+        associativity = data.get('associativity')
+        simulator.set_tlb(int(data.get('entries', 0)),
+                          int(associativity) if associativity is not None else None,
+                          data.get('replacement', 'LRU'),
+                          bool(data.get('flush_on_switch', False)))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    if simulator.tlb is None:
+        return jsonify({"message": "TLB disabled."}), 200
+    return jsonify(simulator.tlb.stats(simulator.page_size)), 200
+
+@app.route('/set_tlb', methods=['POST'])
+@with_simulator('paging')
+def set_tlb(simulator):
+    return configure_tlb(simulator, request.get_json())
+
+def configure_frame_allocation(simulator, data):
+    # Shared by the Paging and Virtual Memory frame allocation routes
+    allocation = data.get('allocation')
+    try:
+        simulator.set_frame_allocation(allocation, int(data.get('window', 64)),
+                                       float(data.get('pff_low', 0.02)), float(data.get('pff_high', 0.1)))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"message": f"Frame allocation set to {allocation}."}), 200
+
+@app.route('/set_frame_allocation', methods=['POST'])
+@with_simulator('paging')
+def set_frame_allocation(simulator):
+    return configure_frame_allocation(simulator, request.get_json())
+
+@app.route('/frame_allocation_stats', methods=['GET'])
+@with_simulator('paging', write=False)
+def frame_allocation_stats(simulator):
+    return jsonify(simulator.frame_allocation_stats()), 200
+
 @app.route('/allocate_paging', methods=['POST'])
-def allocate_paging():
+@with_simulator('paging')
+def allocate_paging(simulator):
     data = request.get_json()
     process_id = data.get('process_id')
     page_num = int(data.get('page_num'))
@@ -509,7 +1749,8 @@ def allocate_paging():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/simulate_page_request', methods=['POST'])
-def simulate_page_request():
+@with_simulator('paging')
+def simulate_page_request(simulator):
     data = request.get_json()
     process_id = data.get('process_id')
     page_num = int(data.get('page_num'))
@@ -520,17 +1761,21 @@ def simulate_page_request():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/display_memory', methods=['GET'])
-def display_memory():
-    return jsonify(simulator.display_memory()), 200
+@with_simulator('paging', write=False)
+def display_memory(simulator):
+    since = request.args.get('since', type=int)
+    return jsonify(simulator.display_memory(since)), 200
 
 @app.route('/reset', methods=['POST'])
-def reset():
+@with_simulator('paging')
+def reset(simulator):
     simulator.reset()
     return jsonify({"message": "Memory state reset."}), 200
 
 # Flask routes for Segmentation Mode
 @app.route('/set_segmentation_algorithm', methods=['POST'])
-def set_segmentation_algorithm():
+@with_simulator('segmentation')
+def set_segmentation_algorithm(segmentation_simulator):
     data = request.get_json()
     algorithm = data.get('algorithm')
     try:
@@ -539,8 +1784,33 @@ def set_segmentation_algorithm():
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
+@app.route('/set_segmentation_placement', methods=['POST'])
+@with_simulator('segmentation')
+def set_segmentation_placement(segmentation_simulator):
+    data = request.get_json()
+    placement = data.get('placement')
+    try:
+        segmentation_simulator.set_placement(placement)
+        return jsonify({"message": f"Segmentation placement set to {placement}."}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/set_segmentation_compaction', methods=['POST'])
+@with_simulator('segmentation')
+def set_segmentation_compaction(segmentation_simulator):
+    data = request.get_json()
+    compaction = data.get('compaction')
+    try:
+        threshold = data.get('threshold')
+        threshold = float(threshold) if threshold is not None else None
+        segmentation_simulator.set_compaction(compaction, threshold)
+        return jsonify({"message": f"Segmentation compaction set to {compaction}."}), 200
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
 @app.route('/allocate_segmentation', methods=['POST'])
-def allocate_segmentation():
+@with_simulator('segmentation')
+def allocate_segmentation(segmentation_simulator):
     data = request.get_json()
     process_id = data.get('process_id')
     segment_id = int(data.get('segment_id'))
@@ -558,17 +1828,21 @@ def allocate_segmentation():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/display_segmentation_memory', methods=['GET'])
-def display_segmentation_memory():
-    return jsonify(segmentation_simulator.display_memory()), 200
+@with_simulator('segmentation', write=False)
+def display_segmentation_memory(segmentation_simulator):
+    since = request.args.get('since', type=int)
+    return jsonify(segmentation_simulator.display_memory(since)), 200
 
 @app.route('/reset_segmentation', methods=['POST'])
-def reset_segmentation():
+@with_simulator('segmentation')
+def reset_segmentation(segmentation_simulator):
     segmentation_simulator.reset()
     return jsonify({"message": "Segmentation memory state reset."}), 200
 
 # Flask routes for Virtual Memory Mode
 @app.route('/set_virtual_algorithm', methods=['POST'])
-def set_virtual_algorithm():
+@with_simulator('virtual')
+def set_virtual_algorithm(virtual_simulator):
     data = request.get_json()
     algorithm = data.get('algorithm')
     try:
@@ -577,8 +1851,24 @@ def set_virtual_algorithm():
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
+@app.route('/set_virtual_tlb', methods=['POST'])
+@with_simulator('virtual')
+def set_virtual_tlb(virtual_simulator):
+    return configure_tlb(virtual_simulator, request.get_json())
+
+@app.route('/set_virtual_frame_allocation', methods=['POST'])
+@with_simulator('virtual')
+def set_virtual_frame_allocation(virtual_simulator):
+    return configure_frame_allocation(virtual_simulator, request.get_json())
+
+@app.route('/virtual_frame_allocation_stats', methods=['GET'])
+@with_simulator('virtual', write=False)
+def virtual_frame_allocation_stats(virtual_simulator):
+    return jsonify(virtual_simulator.frame_allocation_stats()), 200
+
 @app.route('/allocate_virtual', methods=['POST'])
-def allocate_virtual():
+@with_simulator('virtual')
+def allocate_virtual(virtual_simulator):
     data = request.get_json()
     process_id = data.get('process_id')
     num_pages = int(data.get('num_pages'))
@@ -589,7 +1879,8 @@ def allocate_virtual():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/simulate_virtual_page_request', methods=['POST'])
-def simulate_virtual_page_request():
+@with_simulator('virtual')
+def simulate_virtual_page_request(virtual_simulator):
     data = request.get_json()
     process_id = data.get('process_id')
     page_num = int(data.get('page_num'))
@@ -600,14 +1891,547 @@ def simulate_virtual_page_request():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/display_virtual_memory', methods=['GET'])
-def display_virtual_memory():
-    return jsonify(virtual_simulator.display_memory()), 200
+@with_simulator('virtual', write=False)
+def display_virtual_memory(virtual_simulator):
+    since = request.args.get('since', type=int)
+    return jsonify(virtual_simulator.display_memory(since)), 200
 
 @app.route('/reset_virtual', methods=['POST'])
-def reset_virtual():
+@with_simulator('virtual')
+def reset_virtual(virtual_simulator):
     virtual_simulator.reset()
     return jsonify({"message": "Virtual memory state reset."}), 200
 
+# Flask routes for Buddy Allocator Mode
+@app.route('/set_buddy_algorithm', methods=['POST'])
+@with_simulator('buddy')
+def set_buddy_algorithm(buddy_simulator):
+    data = request.get_json()
+    algorithm = data.get('algorithm')
+    try:
+        buddy_simulator.set_algorithm(algorithm)
+        return jsonify({"message": f"Buddy algorithm set to {algorithm}."}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/allocate_buddy', methods=['POST'])
+@with_simulator('buddy')
+def allocate_buddy(buddy_simulator):
+    data = request.get_json()
+    process_id = data.get('process_id')
+    segment_id = int(data.get('segment_id'))
+    size = int(data.get('size'))
+    try:
+        if size <= 0:
+            buddy_simulator.access_block(process_id, segment_id)
+            return jsonify({"message": "Block accessed (size 0, treated as access)."}), 200
+        success = buddy_simulator.allocate_block(process_id, segment_id, size)
+        if success:
+            return jsonify({"message": "Block allocated successfully."}), 200
+        else:
+            return jsonify({"error": "Failed to allocate block: insufficient memory."}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/display_buddy_memory', methods=['GET'])
+@with_simulator('buddy', write=False)
+def display_buddy_memory(buddy_simulator):
+    since = request.args.get('since', type=int)
+    return jsonify(buddy_simulator.display_memory(since)), 200
+
+@app.route('/reset_buddy', methods=['POST'])
+@with_simulator('buddy')
+def reset_buddy(buddy_simulator):
+    buddy_simulator.reset()
+    return jsonify({"message": "Buddy memory state reset."}), 200
+
+# Flask routes for Slab Mode
+@app.route('/allocate_slab', methods=['POST'])
+@with_simulator('slab')
+def allocate_slab(slab_simulator):
+    data = request.get_json()
+    process_id = data.get('process_id')
+    object_id = int(data.get('object_id'))
+    size = int(data.get('size'))
+    try:
+        if size <= 0:
+            slab_simulator.free_object(process_id, object_id)
+            return jsonify({"message": "Object freed (size 0, treated as free)."}), 200
+        success = slab_simulator.allocate_object(process_id, object_id, size)
+        if success:
+            return jsonify({"message": "Object allocated successfully."}), 200
+        else:
+            return jsonify({"error": "Failed to allocate object: no size class fits or no free page."}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/free_slab', methods=['POST'])
+@with_simulator('slab')
+def free_slab(slab_simulator):
+    data = request.get_json()
+    process_id = data.get('process_id')
+    object_id = int(data.get('object_id'))
+    if slab_simulator.free_object(process_id, object_id):
+        return jsonify({"message": "Object freed."}), 200
+    return jsonify({"error": "Object not found."}), 404
+
+@app.route('/display_slab_memory', methods=['GET'])
+@with_simulator('slab', write=False)
+def display_slab_memory(slab_simulator):
+    since = request.args.get('since', type=int)
+    return jsonify(slab_simulator.display_memory(since)), 200
+
+@app.route('/reset_slab', methods=['POST'])
+@with_simulator('slab')
+def reset_slab(slab_simulator):
+    slab_simulator.reset()
+    return jsonify({"message": "Slab memory state reset."}), 200
+
+# Flask routes for batch trace replay
+def open_trace_file(name):
+    # An uploaded binary trace, by the name /upload_trace returned
+    if not isinstance(name, str) or os.path.basename(name) != name or name.startswith('.'):
+        raise ValueError("'trace_file' must be the name of an uploaded trace")
+    try:
+        return TraceFile(os.path.join(TRACE_CONFIG["directory"], name), TRACE_CONFIG["chunk_references"])
+    except FileNotFoundError:
+        raise ValueError(f"Trace file {name} not found") from None
+
+def workload_trace(data, segment_sizes=None):
+    # 'references' references of a generated 'workload', produced as they are replayed
+    spec = data['workload']
+    if not isinstance(spec, dict):
+        raise ValueError("'workload' must be a workload spec")
+    count = int(data.get('references', 0))
+    if not 0 < count <= WORKLOAD_CONFIG["max_references"]:
+        raise ValueError(f"'references' must be between 1 and {WORKLOAD_CONFIG['max_references']}")
+    return WorkloadTrace(workload_from_spec(spec), count, segment_sizes)
+
+def parse_page_trace(data):
+    # Entries are page numbers for the default process or [process_id, page_num] pairs.
+    # A 'trace_file' is read from disk and a 'workload' generated as they are replayed instead.
+    if data.get('trace_file') is not None:
+        return open_trace_file(data['trace_file'])
+    if data.get('workload') is not None:
+        return workload_trace(data)
+    default_process_id = data.get('process_id', 1)
+    sequence = data.get('sequence')
+    if not isinstance(sequence, list):
+        raise ValueError("'sequence' must be a list of page references")
+    references = []
+    for item in sequence:
+        if isinstance(item, list):
+            process_id, page_num = item
+        else:
+            process_id, page_num = default_process_id, item
+        references.append((str(process_id), int(page_num)))
+    return references
+
+def parse_segment_trace(data):
+    # Entries are [segment_id, size], [process_id, segment_id, size] or "seg_id:size" strings.
+    # A 'workload' asks for segments of 'min_size' to 'max_size' instead.
+    if data.get('workload') is not None:
+        return workload_trace(data, (int(data.get('min_size', 1)), int(data.get('max_size', 8))))
+    default_process_id = data.get('process_id', 1)
+    sequence = data.get('sequence')
+    if not isinstance(sequence, list):
+        raise ValueError("'sequence' must be a list of segment requests")
+    segment_requests = []
+    for item in sequence:
+        if isinstance(item, str):
+            item = item.split(":")
+        if len(item) == 3:
+            process_id, segment_id, size = item
+        else:
+            process_id = default_process_id
+            segment_id, size = item
+        segment_requests.append((str(process_id), int(segment_id), int(size)))
+    return segment_requests
+
+def allocate_trace_pages(virtual_simulator, references):
+    # Give unknown processes enough swapped-out pages, as the visualizer does on Start
+    max_pages = {}
+    for process_id, page_num in references:
+        max_pages[process_id] = max(max_pages.get(process_id, -1), page_num)
+    for process_id, max_page_num in max_pages.items():
+        if process_id not in virtual_simulator.page_table:
+            virtual_simulator.allocate_virtual(process_id, max_page_num + 1)
+
+def trace_response(stats, bitmap, bitmap_key):
+    references = stats.get("References", stats.get("Requests"))
+    if "Hits" in stats:
+        stats["Hit Ratio"] = stats["Hits"] / references if references else 0.0
+    if bitmap is not None:
+        stats[bitmap_key] = bitmap.to_base64()
+    return jsonify(stats), 200
+
+@app.route('/upload_trace', methods=['POST'])
+def upload_trace():
+    # Stream a binary trace (see traces.py) from the request body to the trace directory
+    os.makedirs(TRACE_CONFIG["directory"], exist_ok=True)
+    name = f"{uuid.uuid4().hex}.trace"
+    path = os.path.join(TRACE_CONFIG["directory"], name)
+    size = 0
+    with open(path + ".part", "wb") as f:
+        while True:
+            block = request.stream.read(1 << 20)
+            if not block:
+                break
+            f.write(block)
+            size += len(block)
+    try:
+        with open(path + ".part", "rb") as f:
+            read_header(f.read(TRACE_HEADER.size))
+        os.replace(path + ".part", path)
+        trace = TraceFile(path)
+    except ValueError as e:
+        for leftover in (path + ".part", path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    return jsonify({"trace_file": name, "References": len(trace), "Compressed": trace.compressed, "Bytes": size}), 200
+
+@app.route('/import_address_trace', methods=['POST'])
+def import_address_trace_route():
+    # Stream an address trace (see address_traces.py) from the request body and convert it to
+    # a binary trace of pages. Options come from the query string, as the body is the trace.
+    args = request.args
+    try:
+        address_format = args.get('format', 'LACKEY').upper()
+        if address_format not in ADDRESS_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(ADDRESS_FORMATS)}")
+        page_size = int(args.get('page_size', current_session().paging.page_size))
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        options = {
+            "format": address_format,
+            "page_bytes": page_size * KB,
+            "operations": args.get('operations', 'ALL').upper(),
+            "process_id": args.get('process_id', 1),
+            "instructions": args.get('instructions', 'true').lower() != 'false',
+            "base": int(args.get('base', 0))
+        }
+        if options["operations"] not in ADDRESS_OPERATIONS:
+            raise ValueError(f"operations must be one of {', '.join(ADDRESS_OPERATIONS)}")
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    os.makedirs(TRACE_CONFIG["directory"], exist_ok=True)
+    name = f"{uuid.uuid4().hex}.trace"
+    path = os.path.join(TRACE_CONFIG["directory"], name)
+    with open(path + ".txt", "wb") as f:
+        while True:
+            block = request.stream.read(1 << 20)
+            if not block:
+                break
+            f.write(block)
+    try:
+        workers = TRACE_CONFIG["import_workers"] or os.cpu_count() or 1
+        references = import_address_trace(path + ".txt", path + ".part", args.get('compress') == 'true',
+                                          workers, **options)
+        os.replace(path + ".part", path)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid address trace: {e}"}), 400
+    finally:
+        # Whatever went wrong, only a finished trace stays behind
+        for leftover in (path + ".txt", path + ".part"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return jsonify({"trace_file": name, "References": references, "Page Size": page_size,
+                    "Operations": options["operations"]}), 200
+
+@app.route('/simulate_trace', methods=['POST'])
+@with_simulator('paging')
+def simulate_trace(simulator):
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        if data.get('reset'):
+            simulator.reset()
+        bitmap = TraceBitmap() if data.get('bitmap') else None
+        stats = simulator.replay_trace(references, bitmap)
+        return trace_response(stats, bitmap, "Fault Bitmap")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/simulate_virtual_trace', methods=['POST'])
+@with_simulator('virtual')
+def simulate_virtual_trace(virtual_simulator):
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        if data.get('reset'):
+            virtual_simulator.reset()
+        allocate_trace_pages(virtual_simulator, references)
+        bitmap = TraceBitmap() if data.get('bitmap') else None
+        stats = virtual_simulator.replay_trace(references, bitmap)
+        return trace_response(stats, bitmap, "Fault Bitmap")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/simulate_segmentation_trace', methods=['POST'])
+@with_simulator('segmentation')
+def simulate_segmentation_trace(segmentation_simulator):
+    data = request.get_json()
+    try:
+        segment_requests = parse_segment_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        if data.get('reset'):
+            segmentation_simulator.reset()
+        bitmap = TraceBitmap() if data.get('bitmap') else None
+        stats = segmentation_simulator.replay_trace(segment_requests, bitmap)
+        return trace_response(stats, bitmap, "Failure Bitmap")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/simulate_buddy_trace', methods=['POST'])
+@with_simulator('buddy')
+def simulate_buddy_trace(buddy_simulator):
+    data = request.get_json()
+    try:
+        segment_requests = parse_segment_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        if data.get('reset'):
+            buddy_simulator.reset()
+        bitmap = TraceBitmap() if data.get('bitmap') else None
+        stats = buddy_simulator.replay_trace(segment_requests, bitmap)
+        return trace_response(stats, bitmap, "Failure Bitmap")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/simulate_slab_trace', methods=['POST'])
+@with_simulator('slab')
+def simulate_slab_trace(slab_simulator):
+    data = request.get_json()
+    try:
+        # Same entries as a segment trace, with object IDs in place of segment IDs
+        object_requests = parse_segment_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        if data.get('reset'):
+            slab_simulator.reset()
+        bitmap = TraceBitmap() if data.get('bitmap') else None
+        stats = slab_simulator.replay_trace(object_requests, bitmap)
+        return trace_response(stats, bitmap, "Failure Bitmap")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/load_trace', methods=['POST'])
+@with_simulator('paging')
+def load_trace(simulator):
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    simulator.load_trace(references)
+    return jsonify({"message": f"Loaded trace of {len(references)} references for OPT."}), 200
+
+@app.route('/load_virtual_trace', methods=['POST'])
+@with_simulator('virtual')
+def load_virtual_trace(virtual_simulator):
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    virtual_simulator.load_trace(references)
+    return jsonify({"message": f"Loaded virtual memory trace of {len(references)} references for OPT."}), 200
+
+@app.route('/storage_footprint', methods=['POST'])
+def storage_footprint_route():
+    # Replay one trace on fresh simulators with each storage backend and compare their measured size
+    data = request.get_json()
+    mode = data.get('mode', 'paging')
+    if mode not in ('paging', 'virtual'):
+        return jsonify({"error": "mode must be 'paging' or 'virtual'"}), 400
+    try:
+        references = parse_page_trace(data)
+        sizes = {key: int(data[key]) for key in ('total_memory', 'page_size', 'swap_size') if key in data}
+        if mode == 'paging':
+            sizes.pop('swap_size', None)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    try:
+        result = {}
+        for backend in STORAGE_BACKENDS:
+            if mode == 'paging':
+                simulator = MemoryManagementSimulator(backend=backend, **sizes)
+            else:
+                simulator = VirtualMemorySimulator(backend=backend, **sizes)
+                allocate_trace_pages(simulator, references)
+            simulator.replay_trace(references)
+            result[backend] = simulator.storage_footprint()
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/miss_ratio_curve', methods=['POST'])
+def miss_ratio_curve():
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+        max_frames = data.get('max_frames')
+        max_frames = int(max_frames) if max_frames is not None else None
+        page_size = int(data.get('page_size', current_session().paging.page_size))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid trace: {e}"}), 400
+    result = lru_miss_ratio_curve(references, max_frames)
+    for point in result["Curve"]:
+        point["Total Memory"] = point["Frames"] * page_size
+    return jsonify(result), 200
+
+def sweep_point(point, references):
+    # One sweep combination on a fresh simulator. References are (process_id, address)
+    # pairs; the point's page size turns them into pages.
+    mode, algorithm, page_size, frames = point
+
+    def pages():
+        # Streamed, so a trace file is never held in memory
+        return ((process_id, address // page_size) for process_id, address in references)
+
+    if mode == "virtual":
+        # Swap holds every page allocate_trace_pages gives out: 0 to the highest page of each process
+        highest = {}
+        for process_id, page_num in pages():
+            highest[process_id] = max(highest.get(process_id, -1), page_num)
+        swap_pages = sum(page_num + 1 for page_num in highest.values())
+        simulator = VirtualMemorySimulator(total_memory=frames * page_size, page_size=page_size,
+                                           swap_size=swap_pages * page_size)
+        allocate_trace_pages(simulator, pages())
+    else:
+        simulator = MemoryManagementSimulator(total_memory=frames * page_size, page_size=page_size)
+    simulator.set_algorithm(algorithm)
+    stats = simulator.replay_trace(pages())
+    result = {
+        "Frames": frames,
+        "Total Memory": frames * page_size,
+        "Page Faults": stats["Page Faults"],
+        # Paging fills free frames without counting a fault; count every page that was not resident
+        "Misses": stats["Page Faults"] + (simulator.next_free_frame if mode == "paging" else 0),
+        "Hit Ratio": stats["Hits"] / stats["References"] if stats["References"] else 0.0
+    }
+    if mode == "virtual":
+        result["Swap Operations"] = stats["Swap Operations"]
+    return result
+
+# The trace of the sweep a pool worker belongs to, sent once when the worker starts
+sweep_references = None
+
+def init_sweep_worker(references):
+    global sweep_references
+    sweep_references = references
+
+def sweep_worker_point(point):
+    return sweep_point(point, sweep_references)
+
+def belady_anomalies(points):
+    # Neighbouring frame counts where more frames missed more often
+    return [
+        {"Frames": smaller["Frames"], "Misses": smaller["Misses"],
+         "More Frames": larger["Frames"], "More Misses": larger["Misses"]}
+        for smaller, larger in zip(points, points[1:])
+        if larger["Misses"] > smaller["Misses"]
+    ]
+
+def run_sweep(references, mode, algorithms, frame_counts, page_sizes=(1,), workers=None):
+    """Replay one trace for every algorithm x page size x frame count.
+
+    Each combination runs on its own simulator, spread over a process pool
+    that receives the trace once per worker. Curves come back per
+    algorithm and page size, ordered by frame count, together with every
+    Belady anomaly found in them.
+    """
+    if mode not in ("paging", "virtual"):
+        raise ValueError("mode must be 'paging' or 'virtual'")
+    for algorithm in algorithms:
+        if algorithm not in PAGE_REPLACEMENT_ALGORITHMS:
+            raise ValueError(f"Algorithm must be one of {', '.join(PAGE_REPLACEMENT_ALGORITHMS)}")
+    frame_counts = sorted(set(frame_counts))
+    page_sizes = sorted(set(page_sizes))
+    if not algorithms or not frame_counts or not page_sizes:
+        raise ValueError("algorithms, frames and page_sizes must not be empty")
+    if frame_counts[0] <= 0 or page_sizes[0] <= 0:
+        raise ValueError("Frame counts and page sizes must be positive")
+    points = [(mode, algorithm, page_size, frames)
+              for algorithm in algorithms for page_size in page_sizes for frames in frame_counts]
+    if len(points) > SWEEP_CONFIG["max_points"]:
+        raise ValueError(f"A sweep runs at most {SWEEP_CONFIG['max_points']} combinations")
+    workers = min(workers or SWEEP_CONFIG["workers"] or os.cpu_count() or 1, len(points))
+    started = time.perf_counter()
+    if workers == 1:
+        results = [sweep_point(point, references) for point in points]
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_sweep_worker, initargs=(references,)) as pool:
+            results = list(pool.map(sweep_worker_point, points))
+    elapsed = time.perf_counter() - started
+    curves = []
+    anomalies = []
+    for start in range(0, len(points), len(frame_counts)):
+        _, algorithm, page_size, _ = points[start]
+        curve = results[start:start + len(frame_counts)]
+        curves.append({"Algorithm": algorithm, "Page Size": page_size, "Points": curve})
+        for anomaly in belady_anomalies(curve):
+            anomaly.update({"Algorithm": algorithm, "Page Size": page_size})
+            anomalies.append(anomaly)
+    return {
+        "Mode": mode,
+        "References": len(references),
+        "Combinations": len(points),
+        "Workers": workers,
+        "Elapsed Seconds": elapsed,
+        "Curves": curves,
+        "Belady Anomalies": anomalies
+    }
+
+@app.route('/sweep', methods=['POST'])
+def sweep():
+    data = request.get_json()
+    try:
+        references = parse_page_trace(data)
+        algorithms = data.get('algorithms', ["FIFO", "LRU"])
+        frame_counts = [int(frames) for frames in data.get('frames', [])]
+        page_sizes = [int(page_size) for page_size in data.get('page_sizes', [1])]
+        workers = data.get('workers')
+        workers = int(workers) if workers is not None else None
+        result = run_sweep(references, data.get('mode', 'paging'), algorithms, frame_counts, page_sizes, workers)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result), 200
+
+def run_production(host, port, threads):
+    # Sessions live in this process, so scale with threads rather than worker processes
+    logging.getLogger().setLevel(logging.INFO)
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("waitress is not installed; using the threaded Werkzeug server")
+        app.run(host=host, port=port, threaded=True, debug=False)
+        return
+    logger.info(f"Serving on http://{host}:{port} with {threads} threads")
+    serve(app, host=host, port=port, threads=threads)
+
 # Run the Flask app
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Memory management simulator server")
+    parser.add_argument("--production", action="store_true",
+                        help="serve with a multi-threaded WSGI server instead of the debug server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8, help="worker threads in production mode")
+    args = parser.parse_args()
+    if args.production:
+        run_production(args.host, args.port, args.threads)
+    else:
+        app.run(debug=True)
\ No newline at end of file
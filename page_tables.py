@@ -0,0 +1,164 @@
+import zlib
+
+# Page table organizations the Paging simulator can translate through
+PAGE_TABLE_ORGANIZATIONS = ("FLAT", "TWO_LEVEL", "FOUR_LEVEL", "INVERTED")
+
+# Page number bits translated at each level of the radix trees: 36-bit page
+# numbers, as with 4 KB pages in a 48-bit address space
+RADIX_LEVEL_BITS = {"TWO_LEVEL": (18, 18), "FOUR_LEVEL": (9, 9, 9, 9)}
+
+# Modeled sizes in bytes: a page table entry, an inverted table entry
+# (process, page number and chain link) and a hash anchor
+PTE_BYTES = 8
+INVERTED_ENTRY_BYTES = 16
+ANCHOR_BYTES = 4
+
+class FlatPageTable:
+    """The simulator's own per-process page tables, read in place.
+
+    A lookup is one read of the process's table, so the walk depth is 1.
+    The overhead is what a linear table indexed by page number would take,
+    which is entries up to the process's highest mapped page.
+    """
+    def __init__(self, page_table, page_entries):
+        self.page_table = page_table
+        self.page_entries = page_entries
+        self.highest = {}  # process_id -> highest page number mapped
+
+    def map(self, process_id, page_num, frame):
+        if page_num > self.highest.get(process_id, -1):
+            self.highest[process_id] = page_num
+
+    def translate(self, process_id, page_num):
+        # (frame or None, table reads)
+        index = self.page_entries.get((process_id, page_num))
+        if index is None:
+            return None, 1
+        frame = self.page_table[process_id][index][1]
+        return (frame if frame != -1 else None), 1
+
+    def overhead_bytes(self):
+        return sum((highest + 1) * PTE_BYTES for highest in self.highest.values())
+
+class RadixPageTable:
+    """Per-process radix tree, translating level_bits of the page number per level.
+
+    Tables are dicts here, holding only the entries in use, but each one
+    counts as a full 2**bits-entry table in the overhead, as it would in
+    memory. A walk reads one table per level.
+    """
+    def __init__(self, level_bits):
+        self.level_bits = level_bits
+        self.page_bits = sum(level_bits)
+        self.roots = {}  # process_id -> top-level table
+        self.table_bytes = 0
+
+    def _indexes(self, page_num):
+        shift = self.page_bits
+        for bits in self.level_bits:
+            shift -= bits
+            yield (page_num >> shift) & ((1 << bits) - 1)
+
+    def _new_table(self, level):
+        self.table_bytes += (1 << self.level_bits[level]) * PTE_BYTES
+        return {}
+
+    def map(self, process_id, page_num, frame):
+        if not 0 <= page_num < 1 << self.page_bits:
+            raise ValueError(f"Page {page_num} is outside the {self.page_bits}-bit page number space")
+        table = self.roots.get(process_id)
+        if table is None:
+            table = self.roots[process_id] = self._new_table(0)
+        *upper, last = self._indexes(page_num)
+        for level, index in enumerate(upper):
+            child = table.get(index)
+            if child is None:
+                child = table[index] = self._new_table(level + 1)
+            table = child
+        table[last] = frame
+
+    def translate(self, process_id, page_num):
+        table = self.roots.get(process_id)
+        if table is None or not 0 <= page_num < 1 << self.page_bits:
+            return None, 0
+        depth = 0
+        for index in self._indexes(page_num):
+            depth += 1
+            table = table.get(index)
+            if table is None:
+                return None, depth
+        return (table if table != -1 else None), depth
+
+    def overhead_bytes(self):
+        return self.table_bytes
+
+class InvertedPageTable:
+    """One entry per physical frame, found by hashing the page into an anchor table.
+
+    Entries that hash to the same anchor are chained through the frames,
+    so only resident pages are in the table and a page on disk misses
+    after its chain. A walk reads the anchor and then each chained entry.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.anchor_count = 1 << max(frames - 1, 0).bit_length()
+        self.anchors = [-1] * self.anchor_count  # bucket -> first frame in its chain
+        self.owners = [None] * frames  # frame -> (process_id, page_num)
+        self.links = [-1] * frames  # frame -> next frame in the chain
+
+    def _bucket(self, process_id, page_num):
+        # Stable across runs, unlike hash() of a str
+        mixed = zlib.crc32(process_id.encode()) * 0x9E3779B1 + page_num * 0x85EBCA77
+        return (mixed ^ (mixed >> 16)) & (self.anchor_count - 1)
+
+    def _unlink(self, frame):
+        process_id, page_num = self.owners[frame]
+        bucket = self._bucket(process_id, page_num)
+        if self.anchors[bucket] == frame:
+            self.anchors[bucket] = self.links[frame]
+        else:
+            previous = self.anchors[bucket]
+            while self.links[previous] != frame:
+                previous = self.links[previous]
+            self.links[previous] = self.links[frame]
+        self.owners[frame] = None
+        self.links[frame] = -1
+
+    def _find(self, process_id, page_num):
+        # (frame or None, entries read including the anchor)
+        frame = self.anchors[self._bucket(process_id, page_num)]
+        depth = 1
+        while frame != -1:
+            depth += 1
+            if self.owners[frame] == (process_id, page_num):
+                return frame, depth
+            frame = self.links[frame]
+        return None, depth
+
+    def map(self, process_id, page_num, frame):
+        resident, _ = self._find(process_id, page_num)
+        if resident is not None and resident != frame:
+            self._unlink(resident)
+        if frame == -1 or resident == frame:
+            return
+        if self.owners[frame] is not None:
+            self._unlink(frame)
+        bucket = self._bucket(process_id, page_num)
+        self.owners[frame] = (process_id, page_num)
+        self.links[frame] = self.anchors[bucket]
+        self.anchors[bucket] = frame
+
+    def translate(self, process_id, page_num):
+        return self._find(process_id, page_num)
+
+    def overhead_bytes(self):
+        return self.frames * INVERTED_ENTRY_BYTES + self.anchor_count * ANCHOR_BYTES
+
+def make_page_table(organization, frames, page_table, page_entries):
+    if organization not in PAGE_TABLE_ORGANIZATIONS:
+        raise ValueError(f"Page table must be one of {', '.join(PAGE_TABLE_ORGANIZATIONS)}")
+    if organization == "FLAT":
+        return FlatPageTable(page_table, page_entries)
+    if organization == "INVERTED":
+        return InvertedPageTable(frames)
+    return RadixPageTable(RADIX_LEVEL_BITS[organization])
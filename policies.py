@@ -0,0 +1,241 @@
+import collections
+import heapq
+
+class BeladyOptimal:
+    """Offline OPT/MIN replacement over a known reference trace.
+
+    load_trace() computes the next use of every reference in one backward
+    pass. Resident frames sit in a max-heap keyed by the next use of their
+    page, so picking the victim costs O(log frames). Stale heap entries are
+    skipped on pop and the heap is rebuilt once it grows past a few times
+    the frame count.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.trace = []
+        self.next_use = []
+        self.position = 0
+        self.frame_next_use = {}  # frame -> next use of the page it holds
+        self.heap = []  # (-next_use, frame), possibly stale
+        self.operations = 0  # Heap pushes, pops and rebuild steps
+
+    def load_trace(self, references):
+        self.trace = [(str(process_id), page_num) for process_id, page_num in references]
+        self.next_use = [0] * len(self.trace)
+        upcoming = {}
+        never = len(self.trace)
+        for i in range(len(self.trace) - 1, -1, -1):
+            page = self.trace[i]
+            self.next_use[i] = upcoming.get(page, never)
+            upcoming[page] = i
+        self.rewind()
+
+    def rewind(self):
+        self.position = 0
+        self.clear()
+
+    def clear(self):
+        self.frame_next_use = {}
+        self.heap = []
+
+    def next_use_for(self, page):
+        if self.position >= len(self.trace):
+            raise ValueError("OPT needs the full reference trace; load it before simulating")
+        if self.trace[self.position] != page:
+            raise ValueError(f"Request {page} does not match reference {self.trace[self.position]} "
+                             f"at position {self.position} of the loaded OPT trace")
+        return self.next_use[self.position]
+
+    def touch(self, frame, page):
+        next_use = self.next_use_for(page)
+        self.frame_next_use[frame] = next_use
+        heapq.heappush(self.heap, (-next_use, frame))
+        self.operations += 1
+        if len(self.heap) > 2 * self.frames + 16:
+            self.heap = [(-use, f) for f, use in self.frame_next_use.items()]
+            heapq.heapify(self.heap)
+            self.operations += len(self.heap)
+
+    def advance(self):
+        self.position += 1
+
+    def evict(self):
+        # Frame whose page is needed furthest in the future, or None if nothing is tracked
+        while self.heap:
+            negative_use, frame = heapq.heappop(self.heap)
+            self.operations += 1
+            if self.frame_next_use.get(frame) == -negative_use:
+                del self.frame_next_use[frame]
+                return frame
+        return None
+
+class ClockReplacement:
+    """CLOCK: reference bits in a bytearray and a hand sweeping over the frames.
+
+    A hit only sets the frame's bit. On eviction the hand clears set bits
+    until it finds a tracked frame whose bit is already clear.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.reference_bits = bytearray(frames)
+        self.tracked = bytearray(frames)  # 1 for frames loaded under this policy
+        self.tracked_count = 0
+        self.hand = 0
+        self.operations = 0  # Bit updates and hand movements
+
+    def load(self, frame, page):
+        if not self.tracked[frame]:
+            self.tracked[frame] = 1
+            self.tracked_count += 1
+        self.reference_bits[frame] = 1
+        self.operations += 1
+
+    def touch(self, frame):
+        self.reference_bits[frame] = 1
+        self.operations += 1
+
+    def evict(self, incoming_page):
+        if not self.tracked_count:
+            return None
+        # Two sweeps are enough: the first clears every bit it passes
+        for _ in range(2 * self.frames):
+            frame = self.hand
+            self.hand = (self.hand + 1) % self.frames
+            self.operations += 1
+            if not self.tracked[frame]:
+                continue
+            if self.reference_bits[frame]:
+                self.reference_bits[frame] = 0
+            else:
+                self.tracked[frame] = 0
+                self.tracked_count -= 1
+                return frame
+        return None
+
+class SecondChanceReplacement:
+    """Second chance: a FIFO queue of frames plus a bytearray of reference bits.
+
+    The oldest frame is evicted unless its bit is set, in which case the bit
+    is cleared and the frame goes back to the tail of the queue.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.reference_bits = bytearray(frames)
+        self.queue = collections.deque()
+        self.operations = 0  # Queue moves and bit updates
+
+    def load(self, frame, page):
+        self.queue.append(frame)
+        self.reference_bits[frame] = 0
+        self.operations += 1
+
+    def touch(self, frame):
+        self.reference_bits[frame] = 1
+        self.operations += 1
+
+    def evict(self, incoming_page):
+        while self.queue:
+            frame = self.queue.popleft()
+            self.operations += 1
+            if self.reference_bits[frame]:
+                self.reference_bits[frame] = 0
+                self.queue.append(frame)
+                self.operations += 1
+            else:
+                return frame
+        return None
+
+class AdaptiveReplacementCache:
+    """ARC (Megiddo and Modha) over frames.
+
+    T1 holds pages seen once recently and T2 pages seen at least twice. B1
+    and B2 are ghost lists of pages recently evicted from T1 and T2. A miss
+    that hits a ghost list moves the T1 target size p towards the list that
+    would have kept the page. All four lists are ordered maps, LRU first.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.t1 = collections.OrderedDict()  # page -> frame
+        self.t2 = collections.OrderedDict()  # page -> frame
+        self.b1 = collections.OrderedDict()  # ghost pages
+        self.b2 = collections.OrderedDict()  # ghost pages
+        self.frame_pages = {}  # frame -> page
+        self.target_t1 = 0  # ARC's p
+        self.adapted_for = None  # Incoming page whose ghost hit already adjusted p
+        self.operations = 0  # List moves and ghost updates
+
+    def _adapt(self, page):
+        if page in self.b1:
+            self.target_t1 = min(self.frames, self.target_t1 + max(len(self.b2) // len(self.b1), 1))
+        elif page in self.b2:
+            self.target_t1 = max(0, self.target_t1 - max(len(self.b1) // len(self.b2), 1))
+        self.adapted_for = page
+
+    def _replace(self, page):
+        # Evict from T1 when it is over target (ties go to T1 on a B2 hit), else from T2
+        if self.t1 and (len(self.t1) > self.target_t1 or (page in self.b2 and len(self.t1) == self.target_t1)):
+            old_page, frame = self.t1.popitem(last=False)
+            self.b1[old_page] = None
+        elif self.t2:
+            old_page, frame = self.t2.popitem(last=False)
+            self.b2[old_page] = None
+        else:
+            old_page, frame = self.t1.popitem(last=False)
+            self.b1[old_page] = None
+        self.operations += 2
+        del self.frame_pages[frame]
+        return frame
+
+    def evict(self, incoming_page):
+        if not self.t1 and not self.t2:
+            return None
+        page = incoming_page
+        if page in self.b1 or page in self.b2:
+            self._adapt(page)
+            return self._replace(page)
+        self.adapted_for = None
+        if len(self.t1) + len(self.b1) >= self.frames:
+            if len(self.t1) < self.frames and self.b1:
+                self.b1.popitem(last=False)
+                self.operations += 1
+                return self._replace(page)
+            # T1 fills the cache: drop its LRU page without keeping a ghost
+            old_page, frame = self.t1.popitem(last=False)
+            self.operations += 1
+            del self.frame_pages[frame]
+            return frame
+        if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * self.frames and self.b2:
+            self.b2.popitem(last=False)
+            self.operations += 1
+        return self._replace(page)
+
+    def load(self, frame, page):
+        if page in self.b1 or page in self.b2:
+            if self.adapted_for != page:
+                self._adapt(page)
+            self.b1.pop(page, None)
+            self.b2.pop(page, None)
+            self.t2[page] = frame
+        else:
+            self.t1[page] = frame
+        self.adapted_for = None
+        self.frame_pages[frame] = page
+        self.operations += 1
+
+    def touch(self, frame):
+        page = self.frame_pages.get(frame)
+        if page is None:
+            return
+        if page in self.t1:
+            del self.t1[page]
+            self.t2[page] = frame
+        else:
+            self.t2.move_to_end(page)
+        self.operations += 1
+
+# Online policies that plug into the simulators through set_algorithm
+FRAME_POLICIES = {
+    "CLOCK": ClockReplacement,
+    "SECOND_CHANCE": SecondChanceReplacement,
+    "ARC": AdaptiveReplacementCache,
+}
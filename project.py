@@ -1,7 +1,12 @@
 import pygame
 import sys
+import json
+import threading
+import time
+import uuid
 import requests
 from requests.auth import HTTPBasicAuth
+from changes import apply_state_changes
 
 # Initialize Pygame
 pygame.init()
@@ -25,6 +30,7 @@ INPUT_ACTIVE = (80, 80, 80)
 GRAY = (150, 150, 150)
 WHITE = (255, 255, 255)
 SCROLLBAR_BG_COLOR = (40, 40, 40)
+ORANGE = (220, 130, 40)  # Unused tail of a buddy block (internal fragmentation)
 
 # Fonts
 TITLE_FONT = pygame.font.SysFont("Arial", 32, bold=True)
@@ -34,6 +40,8 @@ TEXT_FONT = pygame.font.SysFont("Arial", 18)
 # API Configuration
 API_BASE_URL = "http://localhost:5000"
 AUTH = HTTPBasicAuth("admin", "password123")
+# Each visualizer window gets its own simulators on the server
+SESSION_HEADERS = {"X-Session-ID": uuid.uuid4().hex}
 
 # Button class
 class Button:
@@ -148,6 +156,59 @@ def draw_segmentation_memory(screen, memory_state, free_blocks, frame_counter, l
         pygame.draw.rect(screen, GREEN, (x, 110, width - 5, frame_height), border_radius=5)
         pygame.draw.rect(screen, BORDER_COLOR, (x, 110, width - 5, frame_height), 1, border_radius=5)
 
+def draw_buddy_memory(screen, memory_state, free_blocks, frame_counter, last_allocation, flash_timer, total_memory=32):
+    if frame_counter % 60 == 0:
+        print(f"Drawing buddy memory: {memory_state}, Free blocks: {free_blocks}")
+    title = LABEL_FONT.render("Buddy Blocks", True, TEXT_COLOR)
+    screen.blit(title, (20, 80))
+    total_width = WIDTH - 40
+    pixel_per_kb = total_width / total_memory
+    frame_height = 60
+    for base, block_size, pid, sid, size in memory_state:
+        x = 20 + base * pixel_per_kb
+        width = block_size * pixel_per_kb
+        # The whole block is drawn as wasted space, then the requested part over it
+        pygame.draw.rect(screen, ORANGE, (x, 110, width - 5, frame_height), border_radius=5)
+        if last_allocation and last_allocation[0] == base and flash_timer > 0:
+            color = YELLOW
+        else:
+            color = RED
+        pygame.draw.rect(screen, color, (x, 110, max(size * pixel_per_kb - 5, 1), frame_height), border_radius=5)
+        pygame.draw.rect(screen, BORDER_COLOR, (x, 110, width - 5, frame_height), 1, border_radius=5)
+        label = TEXT_FONT.render(f"P{pid} S{sid}", True, TEXT_COLOR)
+        screen.blit(label, (x + 5, 110 + frame_height // 2 - 10))
+    for base, block_size in free_blocks:
+        x = 20 + base * pixel_per_kb
+        width = block_size * pixel_per_kb
+        pygame.draw.rect(screen, GREEN, (x, 110, width - 5, frame_height), border_radius=5)
+        pygame.draw.rect(screen, BORDER_COLOR, (x, 110, width - 5, frame_height), 1, border_radius=5)
+
+def draw_slab_memory(screen, frames, frame_counter, last_allocation, flash_timer, page_size=4096):
+    if frame_counter % 60 == 0:
+        print(f"Drawing slab frames: {frames}")
+    title = LABEL_FONT.render("Slab Pages", True, TEXT_COLOR)
+    screen.blit(title, (20, 80))
+    frame_count = len(frames)
+    total_width = WIDTH - 40
+    frame_width = total_width // frame_count
+    frame_height = 60
+    last_frame = last_allocation[0] // page_size if last_allocation else None
+    for i, frame in enumerate(frames):
+        x = 20 + i * frame_width
+        if frame is None:
+            pygame.draw.rect(screen, GREEN, (x, 110, frame_width - 5, frame_height), border_radius=5)
+        else:
+            # Free slots in orange, with the used share of the slab filled from the left
+            object_size, objects, capacity = frame
+            pygame.draw.rect(screen, ORANGE, (x, 110, frame_width - 5, frame_height), border_radius=5)
+            color = YELLOW if last_frame == i and flash_timer > 0 else RED
+            used_width = (frame_width - 5) * objects // capacity
+            if used_width > 0:
+                pygame.draw.rect(screen, color, (x, 110, used_width, frame_height), border_radius=5)
+            label = TEXT_FONT.render(f"{object_size}B {objects}/{capacity}", True, TEXT_COLOR)
+            screen.blit(label, (x + 5, 110 + frame_height // 2 - 10))
+        pygame.draw.rect(screen, BORDER_COLOR, (x, 110, frame_width - 5, frame_height), 1, border_radius=5)
+
 def draw_virtual_memory(screen, memory_frames, swap_space, frame_counter, last_page_fault, flash_timer):
     if frame_counter % 60 == 0:
         print(f"Drawing virtual memory - Frames: {memory_frames}, Swap: {swap_space}")
@@ -182,7 +243,8 @@ def draw_virtual_memory(screen, memory_frames, swap_space, frame_counter, last_p
             screen.blit(label, (x + 5, 190 + frame_height // 2 - 10))
 
 def draw_table(screen, page_table, mode, scroll_offset=0, max_visible_entries=5, up_button_rect=None, down_button_rect=None):
-    title = LABEL_FONT.render("Page Table" if mode in ["Paging", "Virtual Memory"] else "Segment Table", True, TEXT_COLOR)
+    table_titles = {"Paging": "Page Table", "Virtual Memory": "Page Table", "Buddy": "Block Table", "Slab": "Slab Caches"}
+    title = LABEL_FONT.render(table_titles.get(mode, "Segment Table"), True, TEXT_COLOR)
     screen.blit(title, (20, 220))
     y = 250
     entry_height = 30
@@ -241,6 +303,30 @@ def draw_table(screen, page_table, mode, scroll_offset=0, max_visible_entries=5,
                     break
             if y > 400:
                 break
+    elif mode == "Buddy":
+        for process_id, blocks in page_table.items():
+            for proc_id, seg_id, size, block_size, base in blocks:
+                text = f"P{proc_id} Seg {seg_id} -> Base {base}, {size}KB in {block_size}KB"
+                text_surface = TEXT_FONT.render(text, True, TEXT_COLOR)
+                screen.blit(text_surface, (20, y))
+                y += 30
+                if y > 400:
+                    break
+            if y > 400:
+                break
+    elif mode == "Slab":
+        # page_table holds the cache statistics, by object size
+        for cache in page_table.values():
+            if not cache["Pages"]:
+                continue
+            text = (f"{cache['Object Size']}B: {cache['Objects']}/{cache['Capacity']} objects, "
+                    f"{cache['Pages']} pages ({cache['Full Slabs']} full, {cache['Partial Slabs']} partial, "
+                    f"{cache['Empty Slabs']} empty)")
+            text_surface = TEXT_FONT.render(text, True, TEXT_COLOR)
+            screen.blit(text_surface, (20, y))
+            y += 30
+            if y > 400:
+                break
     else:  # Paging mode
         for process_id, pages in page_table.items():
             for page_num, frame in pages:
@@ -255,13 +341,18 @@ def draw_table(screen, page_table, mode, scroll_offset=0, max_visible_entries=5,
                 break
     return scroll_offset
 
-def draw_stats(screen, faults, memory_used, mode, algorithm, status, swap_operations=None):
+def draw_stats(screen, faults, memory_used, mode, algorithm, status, swap_operations=None, internal_fragmentation=None,
+               tlb=None):
     title = TITLE_FONT.render("Memory Management Visualizer", True, TEXT_COLOR)
     screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 20))
     fault_label = "Page Faults" if mode in ["Paging", "Virtual Memory"] else "Allocation Failures"
     stats_text = f"{fault_label}: {faults} | Usage: {memory_used}%"
     if mode == "Virtual Memory" and swap_operations is not None:
         stats_text += f" | Swaps: {swap_operations}"
+    if mode == "Buddy" and internal_fragmentation is not None:
+        stats_text += f" | Internal Fragmentation: {internal_fragmentation}KB"
+    if tlb is not None and sum(tlb):
+        stats_text += f" | TLB Hits: {tlb[0]} Misses: {tlb[1]}"
     stats = TEXT_FONT.render(stats_text, True, TEXT_COLOR)
     screen.blit(stats, (20, 50))
     mode_font = pygame.font.SysFont("Arial", 20)
@@ -275,7 +366,7 @@ def draw_stats(screen, faults, memory_used, mode, algorithm, status, swap_operat
 # API Interaction Functions
 def check_api_availability():
     try:
-        response = requests.get(f"{API_BASE_URL}/display_memory", auth=AUTH, timeout=2)
+        response = requests.get(f"{API_BASE_URL}/display_memory", auth=AUTH, headers=SESSION_HEADERS, timeout=2)
         response.raise_for_status()
         return True
     except requests.RequestException as e:
@@ -283,15 +374,20 @@ def check_api_availability():
         return False
 
 def set_algorithm(algorithm, mode):
+    if mode == "Slab":
+        print("Slab mode has no replacement algorithm")
+        return
     try:
         if mode == "Paging":
             endpoint = f"{API_BASE_URL}/set_algorithm"
         elif mode == "Segmentation":
             endpoint = f"{API_BASE_URL}/set_segmentation_algorithm"
+        elif mode == "Buddy":
+            endpoint = f"{API_BASE_URL}/set_buddy_algorithm"
         else:  # Virtual Memory
             endpoint = f"{API_BASE_URL}/set_virtual_algorithm"
         
-        response = requests.post(endpoint, json={"algorithm": algorithm}, auth=AUTH)
+        response = requests.post(endpoint, json={"algorithm": algorithm}, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Set algorithm to {algorithm} for {mode} mode: {response.json()}")
     except requests.RequestException as e:
@@ -301,15 +397,109 @@ def set_algorithm(algorithm, mode):
         print(f"Failed to set algorithm on server: {error_msg}")
         raise Exception(f"Failed to set algorithm: {error_msg}")
 
+# Last full state per display route, kept current by merging ?since= diffs into it
+display_cache = {}
+display_cache_lock = threading.Lock()
+
+def fetch_display_state(route):
+    # While the event stream is up it keeps the cache current, so no request is needed
+    with display_cache_lock:
+        if state_stream.connected and route in display_cache:
+            return display_cache[route]
+        cached = display_cache.get(route)
+    params = {"since": cached["Version"]} if cached else None
+    response = requests.get(f"{API_BASE_URL}/{route}", params=params, auth=AUTH, headers=SESSION_HEADERS)
+    response.raise_for_status()
+    state = response.json()
+    if not state.get("Full", True):
+        try:
+            state = apply_state_changes(cached, state)
+        except (KeyError, IndexError, TypeError):
+            # The cached copy no longer lines up with the server; start over from a full snapshot
+            with display_cache_lock:
+                display_cache.pop(route, None)
+            return fetch_display_state(route)
+    with display_cache_lock:
+        display_cache[route] = state
+    return state
+
+# Display route for each event type sent by /events
+EVENT_ROUTES = {
+    "paging": "display_memory",
+    "segmentation": "display_segmentation_memory",
+    "virtual": "display_virtual_memory",
+    "buddy": "display_buddy_memory",
+    "slab": "display_slab_memory"
+}
+
+class StateStream:
+    # Subscribes once to the server's /events stream in a background thread and
+    # merges each state change into display_cache as it arrives
+    def __init__(self):
+        self.connected = False
+        self.received = set()  # Event types received on the current connection
+        self.updated = set()  # Event types received since the last take_updates()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                with requests.get(f"{API_BASE_URL}/events", auth=AUTH, headers=SESSION_HEADERS,
+                                  stream=True, timeout=(2, 60)) as response:
+                    response.raise_for_status()
+                    self.received = set()
+                    self.read_events(response.iter_lines(decode_unicode=True))
+            except requests.RequestException as e:
+                print(f"State stream unavailable: {e}")
+            self.connected = False
+            time.sleep(1)
+
+    def read_events(self, lines):
+        event, data = None, []
+        for line in lines:
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+            elif not line and event is not None:
+                self.apply(event, json.loads("\n".join(data)))
+                event, data = None, []
+
+    def apply(self, event, state):
+        route = EVENT_ROUTES[event]
+        with display_cache_lock:
+            if not state.get("Full", True):
+                state = apply_state_changes(display_cache[route], state)
+            display_cache[route] = state
+            self.updated.add(event)
+            # Each connection starts with a full snapshot of every simulator
+            self.received.add(event)
+            self.connected = len(self.received) == len(EVENT_ROUTES)
+
+    def take_updates(self):
+        with display_cache_lock:
+            updated, self.updated = self.updated, set()
+        return updated
+
+state_stream = StateStream()
+
+# Visualizer mode for each event type
+EVENT_MODES = {"paging": "Paging", "segmentation": "Segmentation", "virtual": "Virtual Memory", "buddy": "Buddy",
+               "slab": "Slab"}
+
 def get_memory_state(algorithm):
     try:
-        response = requests.get(f"{API_BASE_URL}/display_memory", auth=AUTH)
-        response.raise_for_status()
-        state = response.json()
+        state = fetch_display_state("display_memory")
         return {
             "frames": state["Memory Frames"],
             "page_table": state["Page Table"],
             "page_faults": state["Total Page Faults"],
+            "tlb": (state.get("TLB Hits", 0), state.get("TLB Misses", 0)),
             "memory_used": (sum(1 for f in state["Memory Frames"] if f is not None) * 100) // len(state["Memory Frames"]),
             "mode": "Paging",
             "algorithm": algorithm,
@@ -331,7 +521,7 @@ def allocate_page(process_id, page_num):
     try:
         payload = {"process_id": str(process_id), "page_num": page_num}  # Send as string
         print(f"Sending allocate_paging request with payload: {payload}")
-        response = requests.post(f"{API_BASE_URL}/allocate_paging", json=payload, auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/allocate_paging", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Page allocated: {response.json()}")
     except requests.RequestException as e:
@@ -345,7 +535,7 @@ def simulate_page_request(process_id, page_num):
     try:
         payload = {"process_id": str(process_id), "page_num": str(page_num)}  # Send as string
         print(f"Sending simulate_page_request with payload: {payload}")
-        response = requests.post(f"{API_BASE_URL}/simulate_page_request", json=payload, auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/simulate_page_request", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Page request simulated: {response.json()}")
     except requests.RequestException as e:
@@ -355,9 +545,24 @@ def simulate_page_request(process_id, page_num):
         print(f"Error simulating page request: {error_msg}")
         raise Exception(f"Failed to simulate page request: {error_msg}")
 
+def load_trace(sequence, mode):
+    # OPT needs the whole sequence up front to know each page's next use
+    try:
+        endpoint = f"{API_BASE_URL}/load_trace" if mode == "Paging" else f"{API_BASE_URL}/load_virtual_trace"
+        payload = {"sequence": [[str(process_id), page_num] for process_id, page_num in sequence]}
+        response = requests.post(endpoint, json=payload, auth=AUTH, headers=SESSION_HEADERS)
+        response.raise_for_status()
+        print(f"Trace loaded: {response.json()}")
+    except requests.RequestException as e:
+        error_msg = str(e)
+        if hasattr(e, 'response') and e.response is not None:
+            error_msg += f" (Response: {e.response.text})"
+        print(f"Error loading trace: {error_msg}")
+        raise Exception(f"Failed to load trace: {error_msg}")
+
 def reset_memory():
     try:
-        response = requests.post(f"{API_BASE_URL}/reset", auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/reset", auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Reset response: {response.json()}")
     except requests.RequestException as e:
@@ -365,9 +570,7 @@ def reset_memory():
 
 def get_segmentation_memory_state(algorithm):
     try:
-        response = requests.get(f"{API_BASE_URL}/display_segmentation_memory", auth=AUTH)
-        response.raise_for_status()
-        state = response.json()
+        state = fetch_display_state("display_segmentation_memory")
         total_memory = 32
         memory_used = sum(size for base, size, pid, sid in state["Memory State"])
         memory_used_percent = (memory_used * 100) // total_memory
@@ -398,7 +601,7 @@ def allocate_segment(process_id, segment_id, size):
     try:
         payload = {"process_id": str(process_id), "segment_id": str(segment_id), "size": size}  # Send as string
         print(f"Sending allocate_segmentation request with payload: {payload}")
-        response = requests.post(f"{API_BASE_URL}/allocate_segmentation", json=payload, auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/allocate_segmentation", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Segment allocated: {response.json()}")
     except requests.RequestException as e:
@@ -410,23 +613,119 @@ def allocate_segment(process_id, segment_id, size):
 
 def reset_segmentation_memory():
     try:
-        response = requests.post(f"{API_BASE_URL}/reset_segmentation", auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/reset_segmentation", auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Segmentation reset response: {response.json()}")
     except requests.RequestException as e:
         print(f"Error resetting segmentation memory state: {e}")
 
-def get_virtual_memory_state(algorithm):
+def get_buddy_memory_state(algorithm):
+    try:
+        state = fetch_display_state("display_buddy_memory")
+        total_memory = 32
+        return {
+            "memory_state": state["Memory State"],
+            "block_table": state["Block Table"],
+            "free_blocks": state["Free Blocks"],
+            "allocation_failures": state["Allocation Failures"],
+            "internal_fragmentation": state["Internal Fragmentation"],
+            "memory_used": (state["Allocated Memory"] * 100) // total_memory,
+            "mode": "Buddy",
+            "algorithm": algorithm,
+            "last_allocation": state.get("Last Allocation")
+        }
+    except requests.RequestException as e:
+        print(f"Error fetching buddy memory state: {e}")
+        return {
+            "memory_state": [],
+            "block_table": {},
+            "free_blocks": [(0, 32)],
+            "allocation_failures": 0,
+            "internal_fragmentation": 0,
+            "memory_used": 0,
+            "mode": "Buddy",
+            "algorithm": algorithm,
+            "last_allocation": None
+        }
+
+def allocate_buddy_block(process_id, segment_id, size):
+    try:
+        payload = {"process_id": str(process_id), "segment_id": str(segment_id), "size": size}
+        print(f"Sending allocate_buddy request with payload: {payload}")
+        response = requests.post(f"{API_BASE_URL}/allocate_buddy", json=payload, auth=AUTH, headers=SESSION_HEADERS)
+        response.raise_for_status()
+        print(f"Block allocated: {response.json()}")
+    except requests.RequestException as e:
+        error_msg = str(e)
+        if hasattr(e, 'response') and e.response is not None:
+            error_msg += f" (Response: {e.response.text})"
+        print(f"Error allocating block: {error_msg}")
+        raise Exception(f"Failed to allocate block: {error_msg}")
+
+def reset_buddy_memory():
+    try:
+        response = requests.post(f"{API_BASE_URL}/reset_buddy", auth=AUTH, headers=SESSION_HEADERS)
+        response.raise_for_status()
+        print(f"Buddy reset response: {response.json()}")
+    except requests.RequestException as e:
+        print(f"Error resetting buddy memory state: {e}")
+
+def get_slab_memory_state(algorithm):
+    try:
+        state = fetch_display_state("display_slab_memory")
+        return {
+            "frames": state["Memory Frames"],
+            "caches": state["Caches"],
+            "allocation_failures": state["Allocation Failures"],
+            "memory_used": (state["Pages Used"] * 100) // len(state["Memory Frames"]),
+            "mode": "Slab",
+            "algorithm": algorithm,
+            "last_allocation": state.get("Last Allocation")
+        }
+    except requests.RequestException as e:
+        print(f"Error fetching slab memory state: {e}")
+        return {
+            "frames": [None] * 8,
+            "caches": {},
+            "allocation_failures": 0,
+            "memory_used": 0,
+            "mode": "Slab",
+            "algorithm": algorithm,
+            "last_allocation": None
+        }
+
+def allocate_slab_object(process_id, object_id, size):
     try:
-        response = requests.get(f"{API_BASE_URL}/display_virtual_memory", auth=AUTH)
+        payload = {"process_id": str(process_id), "object_id": str(object_id), "size": size}
+        print(f"Sending allocate_slab request with payload: {payload}")
+        response = requests.post(f"{API_BASE_URL}/allocate_slab", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
-        state = response.json()
+        print(f"Object allocated: {response.json()}")
+    except requests.RequestException as e:
+        error_msg = str(e)
+        if hasattr(e, 'response') and e.response is not None:
+            error_msg += f" (Response: {e.response.text})"
+        print(f"Error allocating object: {error_msg}")
+        raise Exception(f"Failed to allocate object: {error_msg}")
+
+def reset_slab_memory():
+    try:
+        response = requests.post(f"{API_BASE_URL}/reset_slab", auth=AUTH, headers=SESSION_HEADERS)
+        response.raise_for_status()
+        print(f"Slab reset response: {response.json()}")
+    except requests.RequestException as e:
+        print(f"Error resetting slab memory state: {e}")
+
+def get_virtual_memory_state(algorithm):
+    try:
+        state = fetch_display_state("display_virtual_memory")
         return {
             "memory_frames": state["Memory Frames"],
             "page_table": state["Page Table"],
             "swap_space": state["Swap Space"],
             "page_faults": state["Total Page Faults"],
             "swap_operations": state["Swap Operations"],
+            "tlb": (state.get("TLB Hits", 0), state.get("TLB Misses", 0)),
             "memory_used": (sum(1 for f in state["Memory Frames"] if f is not None) * 100) // len(state["Memory Frames"]),
             "mode": "Virtual Memory",
             "algorithm": algorithm,
@@ -450,7 +749,7 @@ def allocate_virtual_pages(process_id, num_pages):
     try:
         payload = {"process_id": str(process_id), "num_pages": num_pages}  # Send as string
         print(f"Sending allocate_virtual request with payload: {payload}")
-        response = requests.post(f"{API_BASE_URL}/allocate_virtual", json=payload, auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/allocate_virtual", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Virtual pages allocated: {response.json()}")
     except requests.RequestException as e:
@@ -464,7 +763,7 @@ def simulate_virtual_page_request(process_id, page_num, max_page_num=None):
     try:
         payload = {"process_id": str(process_id), "page_num": str(page_num)}
         print(f"Sending simulate_virtual_page_request with payload: {payload}")
-        response = requests.post(f"{API_BASE_URL}/simulate_virtual_page_request", json=payload, auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/simulate_virtual_page_request", json=payload, auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Virtual page request simulated: {response.json()}")
     except requests.RequestException as e:
@@ -474,7 +773,7 @@ def simulate_virtual_page_request(process_id, page_num, max_page_num=None):
             if e.response.status_code == 404 and "not found in page table" in e.response.text.lower() and max_page_num is not None:
                 print(f"Process {process_id} not found in page table. Reallocating pages...")
                 allocate_virtual_pages(process_id, max_page_num + 1)
-                response = requests.post(f"{API_BASE_URL}/simulate_virtual_page_request", json=payload, auth=AUTH)
+                response = requests.post(f"{API_BASE_URL}/simulate_virtual_page_request", json=payload, auth=AUTH, headers=SESSION_HEADERS)
                 response.raise_for_status()
                 print(f"Virtual page request simulated after reallocation: {response.json()}")
             else:
@@ -484,7 +783,7 @@ def simulate_virtual_page_request(process_id, page_num, max_page_num=None):
 
 def reset_virtual_memory():
     try:
-        response = requests.post(f"{API_BASE_URL}/reset_virtual", auth=AUTH)
+        response = requests.post(f"{API_BASE_URL}/reset_virtual", auth=AUTH, headers=SESSION_HEADERS)
         response.raise_for_status()
         print(f"Virtual memory reset response: {response.json()}")
     except requests.RequestException as e:
@@ -504,6 +803,8 @@ def run_project():
     memory_state = get_memory_state(algorithm)
     segmentation_memory_state = get_segmentation_memory_state(algorithm)
     virtual_memory_state = get_virtual_memory_state(algorithm)
+    buddy_memory_state = get_buddy_memory_state(algorithm)
+    slab_memory_state = get_slab_memory_state(algorithm)
     flash_timer = 0
     scroll_offset = 0
     max_visible_entries = 5
@@ -519,15 +820,21 @@ def run_project():
     paging_button = Button(20, 500, 120, 40, "Paging")
     seg_button = Button(150, 500, 120, 40, "Segmentation")
     vm_button = Button(280, 500, 120, 40, "Virtual Memory")
+    buddy_button = Button(20, 550, 120, 40, "Buddy")
+    slab_button = Button(150, 550, 120, 40, "Slab")
     fifo_button = Button(450, 500, 100, 40, "FIFO")
     lru_button = Button(560, 500, 100, 40, "LRU")
+    opt_button = Button(670, 500, 100, 40, "OPT")
+    clock_button = Button(450, 550, 100, 40, "CLOCK")
+    second_chance_button = Button(560, 550, 100, 40, "2nd Chance")
+    arc_button = Button(670, 550, 100, 40, "ARC")
     up_button_rect = pygame.Rect(280, 250, 20, 20)
     down_button_rect = pygame.Rect(280, 370, 20, 20)
 
     def start_simulation():
         nonlocal sequence, input_active, step, status, max_page_num, allocated_pages
         try:
-            if not check_api_availability():
+            if not state_stream.connected and not check_api_availability():
                 raise Exception(f"API at {API_BASE_URL} is not responding. Start the server.")
             raw_input = sequence_input.get_text().strip().replace(" ", ",")
             if "," not in raw_input:
@@ -541,8 +848,10 @@ def run_project():
                 if mode == "Virtual Memory":
                     max_page_num = max(sequence_numbers)
                     allocate_virtual_pages(1, max_page_num + 1)
+                if algorithm == "OPT":
+                    load_trace(sequence, mode)
                 # For Paging mode, we no longer pre-allocate pages here
-            else:  # Segmentation
+            else:  # Segmentation, Buddy and Slab (a size of 0 frees a slab object)
                 sequence = []
                 for item in split_input:
                     seg_id, size = map(int, item.split(":"))
@@ -559,10 +868,32 @@ def run_project():
             sequence_input.text = f"Error: {e}"
             input_active = True
 
+    def refresh_state(view_mode):
+        # Re-read one mode's state (from the event stream's cache while it is connected)
+        nonlocal memory_state, segmentation_memory_state, virtual_memory_state, buddy_memory_state, slab_memory_state, flash_timer
+        if view_mode == "Paging":
+            memory_state = get_memory_state(algorithm)
+            changed = memory_state["last_page_fault"] is not None
+        elif view_mode == "Segmentation":
+            segmentation_memory_state = get_segmentation_memory_state(algorithm)
+            changed = segmentation_memory_state["last_allocation"] is not None
+        elif view_mode == "Buddy":
+            buddy_memory_state = get_buddy_memory_state(algorithm)
+            changed = buddy_memory_state["last_allocation"] is not None
+        elif view_mode == "Slab":
+            slab_memory_state = get_slab_memory_state(algorithm)
+            changed = slab_memory_state["last_allocation"] is not None
+        else:
+            virtual_memory_state = get_virtual_memory_state(algorithm)
+            changed = virtual_memory_state["last_page_fault"] is not None
+        if changed and view_mode == mode:
+            flash_timer = 30
+
     def step_simulation():
-        nonlocal step, status, input_active, memory_state, segmentation_memory_state, virtual_memory_state, flash_timer, allocated_pages
+        nonlocal step, status, input_active, allocated_pages
         try:
-            if not check_api_availability():
+            # The event stream doubles as the liveness check, so it only costs a request when it is down
+            if not state_stream.connected and not check_api_availability():
                 sequence_input.text = f"API at {API_BASE_URL} is not responding. Start the server."
                 status = "Error - API Down"
                 return
@@ -581,21 +912,21 @@ def run_project():
                     allocated_pages.add(page_key)
                 # Simulate the page request
                 simulate_page_request(process_id, page_num)
-                memory_state = get_memory_state(algorithm)
-                if memory_state["last_page_fault"] is not None:
-                    flash_timer = 30
             elif mode == "Segmentation":
                 process_id, segment_id, size = sequence[step]
                 allocate_segment(process_id, segment_id, size)
-                segmentation_memory_state = get_segmentation_memory_state(algorithm)
-                if segmentation_memory_state["last_allocation"] is not None:
-                    flash_timer = 30
+            elif mode == "Buddy":
+                process_id, segment_id, size = sequence[step]
+                allocate_buddy_block(process_id, segment_id, size)
+            elif mode == "Slab":
+                process_id, object_id, size = sequence[step]
+                allocate_slab_object(process_id, object_id, size)
             else:  # Virtual Memory
                 process_id, page_num = sequence[step]
                 simulate_virtual_page_request(process_id, page_num, max_page_num)
-                virtual_memory_state = get_virtual_memory_state(algorithm)
-                if virtual_memory_state["last_page_fault"] is not None:
-                    flash_timer = 30
+            # With the event stream up, the new state arrives as an event instead
+            if not state_stream.connected:
+                refresh_state(mode)
             step += 1
             if step >= len(sequence):
                 status = "Finished"
@@ -605,11 +936,15 @@ def run_project():
             print(f"Step simulation failed: {e}")
 
     def reset_simulation():
-        nonlocal step, sequence, input_active, status, memory_state, segmentation_memory_state, virtual_memory_state, flash_timer, scroll_offset, max_page_num, allocated_pages
+        nonlocal step, sequence, input_active, status, memory_state, segmentation_memory_state, virtual_memory_state, buddy_memory_state, slab_memory_state, flash_timer, scroll_offset, max_page_num, allocated_pages
         if mode == "Paging":
             reset_memory()
         elif mode == "Segmentation":
             reset_segmentation_memory()
+        elif mode == "Buddy":
+            reset_buddy_memory()
+        elif mode == "Slab":
+            reset_slab_memory()
         else:
             reset_virtual_memory()
         step = 0
@@ -620,6 +955,8 @@ def run_project():
         memory_state = get_memory_state(algorithm)
         segmentation_memory_state = get_segmentation_memory_state(algorithm)
         virtual_memory_state = get_virtual_memory_state(algorithm)
+        buddy_memory_state = get_buddy_memory_state(algorithm)
+        slab_memory_state = get_slab_memory_state(algorithm)
         flash_timer = 0
         scroll_offset = 0
         max_page_num = None
@@ -650,18 +987,57 @@ def run_project():
         set_algorithm(algorithm, mode)
         reset_simulation()
 
+    def switch_to_buddy():
+        nonlocal mode, algorithm
+        mode = "Buddy"
+        algorithm = "FIFO"
+        sequence_input.label = LABEL_FONT.render("Enter Sequence (e.g., 0:4,1:8):", True, TEXT_COLOR)
+        set_algorithm(algorithm, mode)
+        reset_simulation()
+
+    def switch_to_slab():
+        nonlocal mode, algorithm
+        mode = "Slab"
+        algorithm = "None"  # Slab caches never evict
+        sequence_input.label = LABEL_FONT.render("Enter Sequence (e.g., 0:24,1:100,0:0):", True, TEXT_COLOR)
+        reset_simulation()
+
     def set_fifo():
         nonlocal algorithm
+        if mode == "Slab":
+            print("Slab mode has no replacement algorithm")
+            return
         algorithm = "FIFO"
         set_algorithm(algorithm, mode)
         print(f"Algorithm set to {algorithm}")
 
     def set_lru():
         nonlocal algorithm
+        if mode == "Slab":
+            print("Slab mode has no replacement algorithm")
+            return
         algorithm = "LRU"
         set_algorithm(algorithm, mode)
         print(f"Algorithm set to {algorithm}")
 
+    def set_opt():
+        nonlocal algorithm
+        if mode in ("Segmentation", "Buddy", "Slab"):
+            print("OPT is only available in Paging and Virtual Memory modes")
+            return
+        algorithm = "OPT"
+        set_algorithm(algorithm, mode)
+        print(f"Algorithm set to {algorithm} (trace is loaded on Start)")
+
+    def set_page_policy(policy):
+        nonlocal algorithm
+        if mode in ("Segmentation", "Buddy", "Slab"):
+            print(f"{policy} is only available in Paging and Virtual Memory modes")
+            return
+        algorithm = policy
+        set_algorithm(algorithm, mode)
+        print(f"Algorithm set to {algorithm}")
+
     # Assign actions
     start_button.action = start_simulation
     step_button.action = step_simulation
@@ -669,11 +1045,20 @@ def run_project():
     paging_button.action = switch_to_paging
     seg_button.action = switch_to_segmentation
     vm_button.action = switch_to_virtual_memory
+    buddy_button.action = switch_to_buddy
+    slab_button.action = switch_to_slab
     fifo_button.action = set_fifo
     lru_button.action = set_lru
+    opt_button.action = set_opt
+    clock_button.action = lambda: set_page_policy("CLOCK")
+    second_chance_button.action = lambda: set_page_policy("SECOND_CHANCE")
+    arc_button.action = lambda: set_page_policy("ARC")
 
     # Main loop
+    state_stream.start()
     while running:
+        for event_type in state_stream.take_updates():
+            refresh_state(EVENT_MODES[event_type])
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -685,8 +1070,14 @@ def run_project():
             paging_button.check_click(event)
             seg_button.check_click(event)
             vm_button.check_click(event)
+            buddy_button.check_click(event)
+            slab_button.check_click(event)
             fifo_button.check_click(event)
             lru_button.check_click(event)
+            opt_button.check_click(event)
+            clock_button.check_click(event)
+            second_chance_button.check_click(event)
+            arc_button.check_click(event)
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and mode == "Virtual Memory":
                 mouse_pos = event.pos
                 if up_button_rect.collidepoint(mouse_pos) and scroll_offset > 0:
@@ -703,15 +1094,26 @@ def run_project():
         if mode == "Paging":
             draw_memory(screen, memory_state["frames"], frame_counter, memory_state["last_page_fault"], flash_timer)
             draw_table(screen, memory_state["page_table"], mode)
-            draw_stats(screen, memory_state["page_faults"], memory_state["memory_used"], mode, algorithm, status)
+            draw_stats(screen, memory_state["page_faults"], memory_state["memory_used"], mode, algorithm, status,
+                       tlb=memory_state.get("tlb"))
         elif mode == "Segmentation":
             draw_segmentation_memory(screen, segmentation_memory_state["memory_state"], segmentation_memory_state["free_blocks"], frame_counter, segmentation_memory_state["last_allocation"], flash_timer)
             draw_table(screen, segmentation_memory_state["segment_table"], mode)
             draw_stats(screen, segmentation_memory_state["allocation_failures"], segmentation_memory_state["memory_used"], mode, algorithm, status)
+        elif mode == "Buddy":
+            draw_buddy_memory(screen, buddy_memory_state["memory_state"], buddy_memory_state["free_blocks"], frame_counter, buddy_memory_state["last_allocation"], flash_timer)
+            draw_table(screen, buddy_memory_state["block_table"], mode)
+            draw_stats(screen, buddy_memory_state["allocation_failures"], buddy_memory_state["memory_used"], mode, algorithm, status,
+                       internal_fragmentation=buddy_memory_state["internal_fragmentation"])
+        elif mode == "Slab":
+            draw_slab_memory(screen, slab_memory_state["frames"], frame_counter, slab_memory_state["last_allocation"], flash_timer)
+            draw_table(screen, slab_memory_state["caches"], mode)
+            draw_stats(screen, slab_memory_state["allocation_failures"], slab_memory_state["memory_used"], mode, algorithm, status)
         else:
             draw_virtual_memory(screen, virtual_memory_state["memory_frames"], virtual_memory_state["swap_space"], frame_counter, virtual_memory_state["last_page_fault"], flash_timer)
             scroll_offset = draw_table(screen, virtual_memory_state["page_table"], mode, scroll_offset, max_visible_entries, up_button_rect, down_button_rect)
-            draw_stats(screen, virtual_memory_state["page_faults"], virtual_memory_state["memory_used"], mode, algorithm, status, virtual_memory_state["swap_operations"])
+            draw_stats(screen, virtual_memory_state["page_faults"], virtual_memory_state["memory_used"], mode, algorithm, status, virtual_memory_state["swap_operations"],
+                       tlb=virtual_memory_state.get("tlb"))
 
         sequence_input.draw(screen)
         start_button.draw(screen)
@@ -721,8 +1123,14 @@ def run_project():
         paging_button.draw(screen)
         seg_button.draw(screen)
         vm_button.draw(screen)
+        buddy_button.draw(screen)
+        slab_button.draw(screen)
         fifo_button.draw(screen)
         lru_button.draw(screen)
+        opt_button.draw(screen)
+        clock_button.draw(screen)
+        second_chance_button.draw(screen)
+        arc_button.draw(screen)
         pygame.display.flip()
         frame_counter += 1
         clock.tick(60)
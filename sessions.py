@@ -0,0 +1,128 @@
+import collections
+import logging
+import threading
+import time
+from events import EventChannel
+from locks import ReadWriteLock
+
+logger = logging.getLogger(__name__)
+
+# Rough host memory for one stored entry (a tuple plus its list or dict slot)
+ENTRY_BYTES = 128
+
+class SimulatorSession:
+    """One client's simulators, each with its own lock.
+
+    factory returns the simulators keyed by kind ("paging", "segmentation",
+    ...), and each one is also reachable as an attribute of that name.
+
+    events wakes the session's /events subscribers after every change.
+    """
+    def __init__(self, session_id, factory):
+        self.session_id = session_id
+        self.simulators = factory()
+        for kind, simulator in self.simulators.items():
+            setattr(self, kind, simulator)
+        self.locks = {kind: ReadWriteLock() for kind in self.simulators}
+        self.events = EventChannel()
+        self.entry_counts = {}
+        for kind in self.locks:
+            self.record_size(kind)
+        self.last_used = time.monotonic()
+        self.estimated_bytes = 0
+
+    def record_size(self, kind):
+        # Call while holding the simulator's lock; estimate_bytes() then reads only these counts
+        self.entry_counts[kind] = getattr(self, kind).state_entries()
+
+    def estimate_bytes(self):
+        return sum(self.entry_counts.values()) * ENTRY_BYTES
+
+class SessionRegistry:
+    """Simulator sessions keyed by session ID, created on first use.
+
+    Sessions are kept in least recently used order. When the estimated
+    memory of all sessions goes over max_bytes, or there are more than
+    max_sessions, the least recently used sessions are dropped first.
+    Sessions idle for longer than idle_timeout seconds are dropped too.
+    The session serving the current request is never dropped. All methods
+    are safe to call from several threads.
+    """
+    def __init__(self, factory, max_bytes=None, max_sessions=None, idle_timeout=None):
+        self.factory = factory
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = collections.OrderedDict()  # session_id -> SimulatorSession, LRU first
+        self.total_bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, session_id):
+        with self.lock:
+            return self._get(session_id)
+
+    def _get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = SimulatorSession(session_id, self.factory)
+            self.sessions[session_id] = session
+            session.estimated_bytes = session.estimate_bytes()
+            self.total_bytes += session.estimated_bytes
+            logger.info(f"Created simulator session {session_id}")
+        else:
+            self.sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    def update(self, session_id):
+        # Re-estimate a session after a request changed it, then enforce the limits
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                estimated_bytes = session.estimate_bytes()
+                self.total_bytes += estimated_bytes - session.estimated_bytes
+                session.estimated_bytes = estimated_bytes
+            self._enforce_limits(keep=session_id)
+
+    def remove(self, session_id):
+        with self.lock:
+            return self._remove(session_id)
+
+    def _remove(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.total_bytes -= session.estimated_bytes
+            session.events.close()
+        return session is not None
+
+    def enforce_limits(self, keep=None):
+        with self.lock:
+            self._enforce_limits(keep)
+
+    def _enforce_limits(self, keep=None):
+        now = time.monotonic()
+        while True:
+            # Oldest session other than the one being served (normally the newest)
+            session_id = next((sid for sid in self.sessions if sid != keep), None)
+            if session_id is None:
+                break
+            session = self.sessions[session_id]
+            idle = self.idle_timeout is not None and now - session.last_used > self.idle_timeout
+            over_bytes = self.max_bytes is not None and self.total_bytes > self.max_bytes
+            over_count = self.max_sessions is not None and len(self.sessions) > self.max_sessions
+            if not (idle or over_bytes or over_count):
+                break
+            self._remove(session_id)
+            self.evictions += 1
+            logger.info(f"Evicted simulator session {session_id}")
+
+    def stats(self):
+        with self.lock:
+            return {
+                "Sessions": len(self.sessions),
+                "Estimated Bytes": self.total_bytes,
+                "Max Bytes": self.max_bytes,
+                "Max Sessions": self.max_sessions,
+                "Evicted Sessions": self.evictions
+            }
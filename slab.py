@@ -0,0 +1,207 @@
+import bisect
+import heapq
+
+# Object sizes in bytes of the default caches; a request goes to the smallest class that holds it
+SLAB_SIZE_CLASSES = (16, 32, 64, 128, 256, 512, 1024, 2048)
+
+class FramePool:
+    """Fixed set of page frames, handed out lowest first.
+
+    Same scheme as MemoryManagementSimulator's free frames: a min-heap of
+    released frames plus a mark above which no frame has been used yet.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.reset()
+
+    def reset(self):
+        self.free_frames = []  # Min-heap of released frames below next_free_frame
+        self.next_free_frame = 0
+        self.used = 0
+
+    def allocate(self):
+        if self.free_frames:
+            frame = heapq.heappop(self.free_frames)
+        elif self.next_free_frame < self.frames:
+            frame = self.next_free_frame
+            self.next_free_frame += 1
+        else:
+            return None
+        self.used += 1
+        return frame
+
+    def release(self, frame):
+        heapq.heappush(self.free_frames, frame)
+        self.used -= 1
+
+class Slab:
+    """One page frame cut into equal slots.
+
+    Slots below fresh have been handed out at least once; freed ones wait
+    on the free stack, so taking a slot never scans the slab.
+    """
+    __slots__ = ("frame", "free", "fresh", "in_use", "state", "position")
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.free = []
+        self.fresh = 0
+        self.in_use = 0
+        self.state = None  # "full", "partial" or "empty"
+        self.position = None  # Index in the cache's list for state
+
+class SlabCache:
+    """Objects of one size, in slabs kept on full, partial and empty lists.
+
+    Allocation takes a slot from a partial slab, else from an empty one,
+    else from a new slab on a frame from the pool. Each slab knows its
+    position in its list, so moving it between lists is an O(1)
+    swap-remove and append.
+    """
+    def __init__(self, object_size, page_size, pool):
+        if object_size <= 0 or object_size > page_size:
+            raise ValueError("Object size must be between 1 and the page size")
+        self.object_size = object_size
+        self.capacity = page_size // object_size
+        self.pool = pool
+        self.reset()
+
+    def reset(self):
+        self.lists = {"full": [], "partial": [], "empty": []}
+        self.slabs = {}  # frame -> Slab
+        self.in_use = 0
+
+    def _move(self, slab):
+        state = "empty" if slab.in_use == 0 else "full" if slab.in_use == self.capacity else "partial"
+        if state == slab.state:
+            return
+        if slab.state is not None:
+            self._unlink(slab)
+        items = self.lists[state]
+        slab.state, slab.position = state, len(items)
+        items.append(slab)
+
+    def _unlink(self, slab):
+        items = self.lists[slab.state]
+        last = items.pop()
+        if last is not slab:
+            items[slab.position] = last
+            last.position = slab.position
+        slab.state = slab.position = None
+
+    def allocate(self):
+        """Take a free slot; returns (frame, slot) or None when no frame is left."""
+        if self.lists["partial"]:
+            slab = self.lists["partial"][-1]
+        elif self.lists["empty"]:
+            slab = self.lists["empty"][-1]
+        else:
+            frame = self.pool.allocate()
+            if frame is None:
+                return None
+            slab = self.slabs[frame] = Slab(frame)
+        if slab.free:
+            slot = slab.free.pop()
+        else:
+            slot = slab.fresh
+            slab.fresh += 1
+        slab.in_use += 1
+        self.in_use += 1
+        self._move(slab)
+        return slab.frame, slot
+
+    def free(self, frame, slot):
+        slab = self.slabs[frame]
+        slab.free.append(slot)
+        slab.in_use -= 1
+        self.in_use -= 1
+        self._move(slab)
+
+    def shrink(self):
+        # Give the frames of all empty slabs back to the pool; returns them
+        released = []
+        while self.lists["empty"]:
+            slab = self.lists["empty"][-1]
+            self._unlink(slab)
+            del self.slabs[slab.frame]
+            self.pool.release(slab.frame)
+            released.append(slab.frame)
+        return released
+
+    def utilization(self):
+        # Share of this cache's slots that hold objects
+        slots = len(self.slabs) * self.capacity
+        return self.in_use / slots if slots else 0.0
+
+    def stats(self):
+        return {
+            "Object Size": self.object_size,
+            "Objects": self.in_use,
+            "Capacity": len(self.slabs) * self.capacity,
+            "Utilization": self.utilization(),
+            "Full Slabs": len(self.lists["full"]),
+            "Partial Slabs": len(self.lists["partial"]),
+            "Empty Slabs": len(self.lists["empty"]),
+            "Pages": len(self.slabs)
+        }
+
+class SlabAllocator:
+    """One SlabCache per size class, all taking frames from one FramePool.
+
+    Objects are addressed by frame * page_size + slot * object_size, so
+    freeing finds the slab from the address alone. When the pool runs out,
+    the empty slabs of every cache are returned to it before giving up.
+    """
+    def __init__(self, frames, page_size, size_classes=SLAB_SIZE_CLASSES):
+        self.page_size = page_size
+        self.pool = FramePool(frames)
+        self.size_classes = sorted(size_classes)
+        self.caches = {size: SlabCache(size, page_size, self.pool) for size in self.size_classes}
+        self.frame_caches = {}  # frame -> SlabCache that owns it
+
+    def reset(self):
+        self.pool.reset()
+        for cache in self.caches.values():
+            cache.reset()
+        self.frame_caches = {}
+
+    def cache_for(self, size):
+        # Smallest cache whose objects hold size bytes, or None
+        i = bisect.bisect_left(self.size_classes, max(size, 1))
+        return self.caches[self.size_classes[i]] if i < len(self.size_classes) else None
+
+    def reap(self):
+        # Frames released from empty slabs of every cache
+        released = []
+        for cache in self.caches.values():
+            for frame in cache.shrink():
+                del self.frame_caches[frame]
+                released.append(frame)
+        return released
+
+    def allocate(self, size, released=None):
+        """Allocate an object of size bytes; returns its address or None.
+
+        Frames taken back from empty slabs on the way are appended to released.
+        """
+        cache = self.cache_for(size)
+        if cache is None:
+            return None
+        placed = cache.allocate()
+        if placed is None:
+            reaped = self.reap()
+            if released is not None:
+                released.extend(reaped)
+            placed = cache.allocate() if reaped else None
+            if placed is None:
+                return None
+        frame, slot = placed
+        self.frame_caches[frame] = cache
+        return frame * self.page_size + slot * cache.object_size
+
+    def free(self, address):
+        """Free the object at address; returns its frame."""
+        frame, offset = divmod(address, self.page_size)
+        cache = self.frame_caches[frame]
+        cache.free(frame, offset // cache.object_size)
+        return frame
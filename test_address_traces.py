@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import main
+from address_traces import (KB, AddressTrace, address_pages, import_address_trace, lackey_accesses, line_ranges,
+                            raw_accesses, read_lines, split_address)
+from main import MemoryManagementSimulator
+from traces import OP_READ, OP_WRITE, TraceFile
+
+LACKEY = """==1234== Lackey, an example Valgrind tool
+I  04016b32,3
+ L 7ff000a78,8
+ S 04222cac,4
+ M 0421ebc0,4
+hello from the traced program
+ L 04000ffe,4
+==1234== Exit
+"""
+
+class TestAddressTraces(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_lackey(self):
+        accesses = list(lackey_accesses(LACKEY.splitlines(), process_id=3))
+        self.assertEqual([op for *_, op in accesses], [OP_READ, OP_READ, OP_WRITE, OP_READ, OP_WRITE, OP_READ])
+        self.assertEqual(accesses[1], ("3", 0x7ff000a78, 8, OP_READ))
+        pages = list(address_pages(accesses, 4 * KB))
+        # The last load straddles a page boundary, so it touches two pages
+        self.assertEqual(pages[-2:], [("3", 0x04000), ("3", 0x04001)])
+        self.assertEqual(len(list(lackey_accesses(LACKEY.splitlines(), instructions=False))), 5)
+        writes = list(address_pages(accesses, 4 * KB, operations="WRITES", with_ops=True))
+        self.assertEqual(writes, [("3", 0x04222, OP_WRITE), ("3", 0x0421e, OP_WRITE)])
+        self.assertEqual(split_address(0x1234, 4 * KB), (1, 0x234))
+
+    def test_raw(self):
+        lines = ["# captured", "0x1000", "W 2:8192", "r, 4095", ""]
+        self.assertEqual(list(raw_accesses(lines)), [("1", 0x1000, 1, OP_READ), ("2", 8192, 1, OP_WRITE),
+                                                     ("1", 4095, 1, OP_READ)])
+        self.assertEqual(list(raw_accesses(["ff"], base=16)), [("1", 255, 1, OP_READ)])
+        with self.assertRaises(ValueError):
+            list(raw_accesses(["R W 10"]))
+
+    def test_ranges_split_on_lines(self):
+        path = self.write("raw.txt", "".join(f"{address}\n" for address in range(1000)))
+        for parts in (1, 3, 7, 2000):
+            ranges = line_ranges(path, parts)
+            lines = [line for start, end in ranges for line in read_lines(path, start, end, chunk_bytes=5)]
+            self.assertEqual(lines, [f"{address}\n" for address in range(1000)])
+
+    def test_parallel_import_matches_serial(self):
+        text = "".join(f"{'W' if i % 3 == 0 else 'R'} {i % 4}:{i * 37 % 100000}\n" for i in range(5000))
+        path = self.write("raw.txt", text)
+        serial, parallel = os.path.join(self.directory, "serial.trace"), os.path.join(self.directory, "parallel.trace")
+        for compress in (False, True):
+            options = {"format": "RAW", "page_bytes": KB}
+            self.assertEqual(import_address_trace(path, serial, compress, **options), 5000)
+            self.assertEqual(import_address_trace(path, parallel, compress, workers=3, min_part_bytes=1, **options), 5000)
+            self.assertEqual(list(TraceFile(parallel).chunks(with_ops=True)), list(TraceFile(serial).chunks(with_ops=True)))
+        stats = MemoryManagementSimulator(total_memory=8, page_size=1).replay_trace(
+            AddressTrace(path, format="RAW", page_bytes=KB))
+        self.assertEqual(stats["References"], 5000)
+
+    def test_import_route(self):
+        original = main.TRACE_CONFIG["directory"]
+        main.TRACE_CONFIG["directory"] = self.directory
+        self.addCleanup(main.TRACE_CONFIG.__setitem__, "directory", original)
+        client = main.app.test_client()
+        imported = client.post("/import_address_trace?format=LACKEY&page_size=4&instructions=false",
+                               data=LACKEY.encode()).json
+        self.assertEqual((imported["References"], imported["Page Size"]), (6, 4))
+        stats = client.post("/simulate_trace", json={"trace_file": imported["trace_file"], "reset": True}).json
+        self.assertEqual(stats["References"], 6)
+        self.assertEqual(client.post("/import_address_trace?format=RAW", data=b"not an address\n").status_code, 400)
+        self.assertEqual(client.post("/import_address_trace?format=RAW", data=b"W -7:0x1000\n").status_code, 400)
+        self.assertEqual(client.post("/import_address_trace?operations=SOME", data=b"").status_code, 400)
+        self.assertEqual(os.listdir(self.directory), [imported["trace_file"]])
+
+if __name__ == "__main__":
+    unittest.main()
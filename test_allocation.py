@@ -0,0 +1,88 @@
+import unittest
+import main
+from allocation import LocalFrameAllocator
+from main import MemoryManagementSimulator, VirtualMemorySimulator
+
+class TestLocalFrameAllocator(unittest.TestCase):
+    def test_working_set_slides_with_the_window(self):
+        allocator = LocalFrameAllocator("WORKING_SET", frames=8, window=4)
+        for page_num in [0, 1, 0, 2]:
+            allocator.reference("1", page_num, False)
+        self.assertEqual(allocator.processes["1"].quota, 3)
+        allocator.reference("2", 0, True)  # Page 0's first reference leaves the window
+        allocator.reference("2", 1, True)  # And so does page 1's only one
+        self.assertEqual(allocator.processes["1"].quota, 2)
+        self.assertEqual(allocator.processes["2"].fault_rate(), 1.0)
+
+    def test_pff_follows_the_fault_rate(self):
+        allocator = LocalFrameAllocator("PFF", frames=8, window=10, low=0.2, high=0.5)
+        for page_num in range(3):
+            allocator.reference("1", page_num, True)
+        self.assertEqual(allocator.processes["1"].quota, 4)
+        for _ in range(9):
+            allocator.reference("1", 0, False)
+        allocator.reference("1", 5, True)  # One fault in the last ten references
+        self.assertEqual(allocator.processes["1"].quota, 3)
+
+    def test_victims(self):
+        allocator = LocalFrameAllocator("WORKING_SET", frames=4, window=8)
+        for frame, page in enumerate([("1", 0), ("1", 1), ("1", 2), ("2", 0)]):
+            allocator.load(frame, page)
+        allocator.reference("1", 0, False)
+        allocator.reference("2", 1, True)
+        allocator.reference("2", 2, True)
+        # Process 2 is under its quota of 3 and process 1 is over its quota of 1
+        self.assertEqual(allocator.evict("2"), 0)
+        allocator.load(0, ("2", 1))
+        allocator.touch(3)
+        # Process 2 is at its quota now, so it replaces its own oldest frame
+        self.assertEqual(allocator.evict("2"), 0)
+        self.assertEqual(allocator.steals, 1)
+
+class TestSimulatorFrameAllocation(unittest.TestCase):
+    def test_local_replacement_protects_a_small_working_set(self):
+        references = []
+        for i in range(400):
+            references.append(("loop", i % 3))
+            references.append(("scan", i))
+        faults = {}
+        for allocation in ("GLOBAL", "WORKING_SET"):
+            simulator = MemoryManagementSimulator(total_memory=5, page_size=1)
+            simulator.set_algorithm("LRU")
+            simulator.set_frame_allocation(allocation, window=8)
+            faults[allocation] = simulator.replay_trace(references)["Page Faults"]
+        stats = simulator.frame_allocation_stats()
+        self.assertEqual(stats["Processes"]["loop"]["Page Faults"], 0)
+        self.assertEqual(faults, {"GLOBAL": 795, "WORKING_SET": 398})
+        self.assertEqual(stats["History"][-1]["Reference"], 800)
+
+    def test_resident_frames_match_memory(self):
+        simulator = VirtualMemorySimulator(total_memory=4, page_size=1, swap_size=40)
+        for process_id in "123":
+            simulator.allocate_virtual(process_id, 6)
+        simulator.replay_trace([(str(i % 3 + 1), i % 5) for i in range(20)])
+        simulator.set_frame_allocation("PFF", window=6)
+        simulator.replay_trace([(str(i % 3 + 1), i * 7 % 6) for i in range(200)])
+        owners = {frame: page[0] for frame, page in enumerate(simulator.memory) if page is not None}
+        self.assertEqual(simulator.allocator.frame_owners, owners)
+        with self.assertRaises(ValueError):
+            simulator.set_algorithm("CLOCK")
+
+    def test_routes(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "allocation-tests"
+        main.sessions.remove("allocation-tests")
+        client.post("/set_algorithm", json={"algorithm": "OPT"})
+        self.assertEqual(client.post("/set_frame_allocation", json={"allocation": "WORKING_SET"}).status_code, 400)
+        client.post("/set_algorithm", json={"algorithm": "LRU"})
+        self.assertEqual(client.post("/set_frame_allocation", json={"allocation": "WORKING_SET", "window": 4}).status_code, 200)
+        stats = client.post("/simulate_trace", json={"sequence": [0, 1, 0]}).json
+        self.assertEqual(stats["Frame Allocation"], "WORKING_SET")
+        processes = client.get("/frame_allocation_stats").json["Processes"]
+        self.assertEqual(processes["1"]["Quota"], 2)
+        response = client.post("/set_virtual_frame_allocation", json={"allocation": "PFF", "pff_low": 0.5, "pff_high": 0.2})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(client.get("/virtual_frame_allocation_stats").json, {"Frame Allocation": "GLOBAL"})
+
+if __name__ == "__main__":
+    unittest.main()
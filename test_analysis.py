@@ -0,0 +1,29 @@
+import unittest
+from analysis import StackDistanceAnalyzer, lru_miss_ratio_curve
+from main import MemoryManagementSimulator
+
+class TestStackDistance(unittest.TestCase):
+    def test_stack_distances(self):
+        analyzer = StackDistanceAnalyzer().feed([(1, 0), (1, 1), (1, 2), (1, 0), (1, 0), (1, 2)])
+        self.assertEqual(analyzer.cold_misses, 3)
+        self.assertEqual(analyzer.histogram, {3: 1, 1: 1, 2: 1})
+
+    def test_compaction_keeps_distances(self):
+        references = [(1, page_num % 5) for page_num in range(200)]
+        analyzer = StackDistanceAnalyzer().feed(references)
+        self.assertEqual(analyzer.histogram, {5: 195})
+        self.assertLessEqual(analyzer.tree.size, 16)
+
+    def test_curve_matches_lru_simulator(self):
+        references = [("1", page_num) for page_num in [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]]
+        result = lru_miss_ratio_curve(references, max_frames=8)
+        self.assertEqual(result["Distinct Pages"], 6)
+        for point in result["Curve"]:
+            simulator = MemoryManagementSimulator(total_memory=point["Frames"], page_size=1)
+            simulator.set_algorithm("LRU")
+            stats = simulator.replay_trace(references)
+            self.assertEqual(point["Page Faults"], stats["Page Faults"])
+        self.assertEqual(result["Curve"][2]["Misses"], 12)
+
+if __name__ == "__main__":
+    unittest.main()
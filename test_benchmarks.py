@@ -0,0 +1,35 @@
+import json
+import unittest
+from benchmarks import BENCHMARKS, compare_results, run_benchmarks
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_benchmark_runs(self):
+        seen = []
+        results = run_benchmarks(shapes=["LOOP", "ZIPF"], frame_counts=[4], trace_sizes=[200], repeats=1,
+                                 progress=seen.append)
+        self.assertEqual(len(results["Results"]), len(BENCHMARKS) * 2)
+        self.assertEqual(seen, results["Results"])
+        for result in results["Results"]:
+            self.assertGreater(result["Operations"], 0)
+            self.assertGreater(result["Operations Per Second"], 0)
+        # Each burst of 16 loops over one process's 4 pages, which fit in the 4 frames:
+        # 4 faults per burst, 13 bursts
+        loop = next(result for result in results["Results"]
+                    if result["Benchmark"] == "page_fault_with_swap" and result["Shape"] == "LOOP")
+        self.assertEqual(loop["Operations"], 52)
+        json.dumps(results)
+        with self.assertRaises(ValueError):
+            run_benchmarks(benchmarks=["nothing"])
+
+    def test_compare_flags_slowdowns(self):
+        def results(rates):
+            return {"Results": [{"Benchmark": name, "Shape": "LOOP", "Frames": 16, "References": 100,
+                                 "Operations Per Second": rate} for name, rate in rates.items()]}
+        baseline = results({"page_request": 1000.0, "segmentation": 1000.0, "http_trace": 1000.0})
+        current = results({"page_request": 700.0, "segmentation": 900.0, "virtual_page_request": 10.0})
+        regressions = compare_results(baseline, current, tolerance=0.2)
+        self.assertEqual([regression["Benchmark"] for regression in regressions], ["page_request"])
+        self.assertAlmostEqual(regressions[0]["Change"], -0.3)
+
+if __name__ == "__main__":
+    unittest.main()
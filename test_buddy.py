@@ -0,0 +1,88 @@
+import random
+import unittest
+import main
+from buddy import BuddyAllocator
+from main import BuddyMemorySimulator
+
+class TestBuddyAllocator(unittest.TestCase):
+    def test_allocation_splits_down_to_the_smallest_block(self):
+        allocator = BuddyAllocator(32)
+        self.assertEqual(allocator.allocate(3), (0, 4))
+        self.assertEqual([allocator.free_bases(order) for order in range(6)], [[], [], [4], [8], [16], []])
+        self.assertEqual(allocator.operations, 3)
+
+    def test_free_merges_buddies_back(self):
+        allocator = BuddyAllocator(32)
+        first, _ = allocator.allocate(4)
+        second, _ = allocator.allocate(4)
+        self.assertEqual(second, 4)
+        allocator.free(first)
+        self.assertEqual(allocator.free_bases(2), [0])
+        allocator.free(second)
+        self.assertEqual(allocator.free_bases(5), [0])
+        self.assertEqual(allocator.free_memory, 32)
+
+    def test_request_larger_than_memory(self):
+        allocator = BuddyAllocator(32, min_block=2)
+        self.assertIsNone(allocator.order_for(33))
+        self.assertIsNone(allocator.allocate(33))
+        self.assertEqual(allocator.allocate(1), (0, 2))
+
+    def test_memory_must_be_a_power_of_two_of_blocks(self):
+        with self.assertRaises(ValueError):
+            BuddyAllocator(24)
+        with self.assertRaises(ValueError):
+            BuddyAllocator(32, min_block=3)
+
+    def test_random_blocks_never_overlap(self):
+        rnd = random.Random(14)
+        allocator = BuddyAllocator(256, min_block=2)
+        blocks = {}
+        for _ in range(3000):
+            if blocks and rnd.random() < 0.5:
+                base = rnd.choice(list(blocks))
+                self.assertEqual(allocator.free(base), blocks.pop(base))
+            else:
+                allocation = allocator.allocate(rnd.randint(1, 40))
+                if allocation is not None:
+                    base, block_size = allocation
+                    self.assertEqual(base % block_size, 0)
+                    self.assertTrue(all(base + block_size <= other or other + size <= base
+                                        for other, size in blocks.items()))
+                    blocks[base] = block_size
+            self.assertEqual(allocator.free_memory, 256 - sum(blocks.values()))
+        for base in list(blocks):
+            allocator.free(base)
+        self.assertEqual(allocator.free_bases(allocator.max_order), [0])
+
+class TestBuddyMemorySimulator(unittest.TestCase):
+    def test_internal_fragmentation(self):
+        simulator = BuddyMemorySimulator(total_memory=32)
+        simulator.allocate_block("1", 0, 5)
+        simulator.allocate_block("1", 1, 3)
+        state = simulator.display_memory()
+        self.assertEqual(state["Memory State"], [(0, 8, "1", 0, 5), (8, 4, "1", 1, 3)])
+        self.assertEqual(state["Internal Fragmentation"], 4)
+        self.assertEqual(state["Free Lists"], {"4": [12], "16": [16]})
+
+    def test_fifo_evicts_oldest_block_until_it_fits(self):
+        simulator = BuddyMemorySimulator(total_memory=16)
+        for segment_id in range(4):
+            simulator.allocate_block("1", segment_id, 4)
+        self.assertTrue(simulator.allocate_block("2", 0, 8))
+        self.assertEqual(simulator.evictions, 2)
+        self.assertEqual(simulator.last_allocation, (0, 8, "2", 0))
+        self.assertEqual(sorted(simulator.block_table["1"]), [2, 3])
+
+    def test_trace_route(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "buddy-tests"
+        main.sessions.remove("buddy-tests")
+        response = client.post("/simulate_buddy_trace", json={"sequence": ["1:5", "2:3", "1:0", "3:40"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["Accesses"], 1)
+        self.assertEqual(response.json["Failed Allocations"], 1)
+        self.assertEqual(response.json["Internal Fragmentation"], 4)
+
+if __name__ == "__main__":
+    unittest.main()
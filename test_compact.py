@@ -0,0 +1,75 @@
+import json
+import random
+import unittest
+import main
+from compact import EntryArray, PageArray, PageDict, ProcessIds
+from main import MemoryManagementSimulator, VirtualMemorySimulator
+
+class TestCompactStores(unittest.TestCase):
+    def test_page_array_reads_back_tuples(self):
+        frames = PageArray(3, ProcessIds())
+        frames[1] = ("7", 2 ** 36)
+        frames[2] = ("8", -1)
+        self.assertEqual(frames, [None, ("7", 2 ** 36), ("8", -1)])
+        frames[1] = None
+        self.assertIsNone(frames[1])
+
+    def test_entry_array_flags_are_bools(self):
+        entries = EntryArray("qqb")
+        entries.append((0, 5, False))
+        entries[0] = (0, 3, True)
+        self.assertEqual(list(entries), [(0, 3, True)])
+        self.assertIs(entries[0][2], True)
+
+    def test_page_dict(self):
+        disk = PageDict(ProcessIds(), pages_as_values=True)
+        disk[("1", 4)] = ("1", 4)
+        self.assertIn(("1", 4), disk)
+        self.assertNotIn(("2", 4), disk)
+        self.assertEqual(dict(disk.items()), {("1", 4): ("1", 4)})
+        del disk[("1", 4)]
+        self.assertEqual(len(disk), 0)
+
+class TestCompactBackend(unittest.TestCase):
+    def replay(self, simulator, references, virtual=False):
+        if virtual:
+            main.allocate_trace_pages(simulator, references)
+        simulator.replay_trace(references)
+        return json.dumps(simulator.display_memory())
+
+    def test_same_display_as_objects_backend(self):
+        rnd = random.Random(17)
+        references = [(str(rnd.randrange(3)), rnd.randrange(20)) for _ in range(300)]
+        for algorithm in main.PAGE_REPLACEMENT_ALGORITHMS:
+            for simulator_class, sizes, virtual in ((MemoryManagementSimulator, {}, False),
+                                                    (VirtualMemorySimulator, {"swap_size": 64}, True)):
+                states = []
+                for backend in ("objects", "compact"):
+                    simulator = simulator_class(total_memory=16, page_size=1, backend=backend, **sizes)
+                    simulator.set_algorithm(algorithm)
+                    states.append(self.replay(simulator, references, virtual))
+                self.assertEqual(states[0], states[1], (algorithm, simulator_class.__name__))
+
+    def test_compact_backend_is_smaller(self):
+        references = [(str(page_num % 3), page_num % 500) for page_num in range(2000)]
+        footprints = []
+        for backend in ("objects", "compact"):
+            simulator = MemoryManagementSimulator(total_memory=256, page_size=1, backend=backend)
+            simulator.replay_trace(references)
+            footprints.append(simulator.storage_footprint())
+        self.assertLess(footprints[1]["Bytes Per Frame"], footprints[0]["Bytes Per Frame"] / 4)
+        self.assertLess(footprints[1]["Total Bytes"], footprints[0]["Total Bytes"])
+
+    def test_footprint_route(self):
+        client = main.app.test_client()
+        response = client.post("/storage_footprint", json={"mode": "virtual", "sequence": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json), {"objects", "compact"})
+        self.assertEqual(response.json["compact"]["Page Table Entries"], 10)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            MemoryManagementSimulator(backend="numpy")
+
+if __name__ == "__main__":
+    unittest.main()
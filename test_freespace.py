@@ -0,0 +1,127 @@
+import random
+import unittest
+from unittest import mock
+import freespace
+from freespace import FreeSpaceManager, PLACEMENT_STRATEGIES
+from main import SegmentationMemorySimulator
+
+def with_holes(strategy):
+    # Holes at 0 (size 4), 10 (size 8) and 25 (size 6); the rest of 40 units is in use
+    free_space = FreeSpaceManager(40, strategy)
+    for size in (4, 6, 8, 7, 6, 9):
+        free_space.allocate(size)
+    for base, size in ((0, 4), (10, 8), (25, 6)):
+        free_space.free(base, size)
+    return free_space
+
+class TestFreeSpaceManager(unittest.TestCase):
+    def test_first_fit_takes_lowest_address(self):
+        self.assertEqual(with_holes("FIRST_FIT").allocate(5), 10)
+
+    def test_best_fit_takes_smallest_hole(self):
+        self.assertEqual(with_holes("BEST_FIT").allocate(5), 25)
+
+    def test_worst_fit_takes_largest_hole(self):
+        self.assertEqual(with_holes("WORST_FIT").allocate(3), 10)
+
+    def test_next_fit_resumes_after_last_allocation(self):
+        free_space = with_holes("NEXT_FIT")
+        self.assertEqual(free_space.allocate(2), 0)
+        self.assertEqual(free_space.allocate(2), 2)
+        self.assertEqual(free_space.allocate(5), 10)
+        self.assertEqual(free_space.allocate(5), 25)
+        self.assertEqual(free_space.allocate(3), 15)
+
+    def test_free_coalesces_both_neighbours(self):
+        free_space = with_holes("FIRST_FIT")
+        free_space.free(4, 6)
+        free_space.free(18, 7)
+        self.assertEqual(list(free_space), [(0, 31)])
+        self.assertEqual(free_space.total_free, 31)
+        self.assertEqual(list(free_space.by_size), [(31, 0)])
+
+    def test_no_hole_large_enough(self):
+        free_space = with_holes("BEST_FIT")
+        self.assertIsNone(free_space.allocate(9))
+        self.assertEqual(free_space.total_free, 18)
+
+    def test_sizes_must_be_positive(self):
+        for strategy in PLACEMENT_STRATEGIES:
+            free_space = FreeSpaceManager(16, strategy)
+            self.assertEqual(free_space.allocate(16), 0)
+            # A full memory has no holes at all
+            for size in (0, -3):
+                with self.assertRaises(ValueError):
+                    free_space.allocate(size)
+            self.assertIsNone(free_space.allocate(1))
+
+    def test_matches_linear_reference_with_small_chunks(self):
+        # Plain address-ordered list of holes, searched the obvious way
+        def reference_allocate(holes, strategy, size, rover):
+            fits = [i for i, (_, hole_size) in enumerate(holes) if hole_size >= size]
+            if not fits:
+                return None
+            if strategy == "BEST_FIT":
+                i = min(fits, key=lambda i: (holes[i][1], holes[i][0]))
+            elif strategy == "WORST_FIT":
+                i = min(fits, key=lambda i: (-holes[i][1], holes[i][0]))
+            elif strategy == "NEXT_FIT":
+                i = next((i for i in fits if holes[i][0] >= rover), fits[0])
+            else:
+                i = fits[0]
+            base, hole_size = holes[i]
+            holes[i:i + 1] = [(base + size, hole_size - size)] if hole_size > size else []
+            return base
+
+        with mock.patch.object(freespace, "CHUNK_SIZE", 2):
+            for strategy in PLACEMENT_STRATEGIES:
+                rnd = random.Random(strategy)
+                free_space = FreeSpaceManager(2000, strategy)
+                holes, rover, blocks = [(0, 2000)], 0, []
+                for _ in range(1500):
+                    if blocks and rnd.random() < 0.45:
+                        base, size = blocks.pop(rnd.randrange(len(blocks)))
+                        free_space.free(base, size)
+                        holes = sorted(holes + [(base, size)])
+                        merged = [holes[0]]
+                        for hole in holes[1:]:
+                            if merged[-1][0] + merged[-1][1] == hole[0]:
+                                merged[-1] = (merged[-1][0], merged[-1][1] + hole[1])
+                            else:
+                                merged.append(hole)
+                        holes = merged
+                    else:
+                        size = rnd.randint(1, 40)
+                        base = free_space.allocate(size)
+                        self.assertEqual(base, reference_allocate(holes, strategy, size, rover))
+                        if base is not None:
+                            blocks.append((base, size))
+                            rover = base + size
+                    self.assertEqual(list(free_space), holes)
+                    self.assertEqual(list(free_space.by_size), sorted((size, base) for base, size in holes))
+                self.assertEqual(free_space.total_free, sum(size for _, size in holes))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            FreeSpaceManager(32, "RANDOM_FIT")
+
+class TestSegmentationPlacement(unittest.TestCase):
+    def test_best_fit_places_segment_in_smallest_hole(self):
+        simulator = SegmentationMemorySimulator(total_memory=32, placement="BEST_FIT")
+        for segment_id, size in enumerate((8, 4, 6, 14)):
+            simulator.allocate_segmentation("1", segment_id, size)
+        simulator.deallocate_segment("1", 0)
+        simulator.deallocate_segment("1", 2)
+        simulator.allocate_segmentation("1", 4, 5)
+        self.assertEqual(simulator.last_allocation, (12, 5, "1", 4))
+        self.assertEqual(simulator.free_blocks, [(0, 8), (17, 1)])
+
+    def test_zero_size_segment_on_full_memory(self):
+        simulator = SegmentationMemorySimulator(total_memory=8)
+        self.assertTrue(simulator.allocate_segmentation("1", 1, 8))
+        with self.assertRaises(ValueError):
+            simulator.allocate_segmentation("2", 1, 0)
+        self.assertNotIn("2", simulator.segment_table)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,433 @@
+import base64
+import json
+import threading
+import unittest
+import main
+from changes import ChangeLog, apply_state_changes
+from locks import ReadWriteLock
+from main import MemoryManagementSimulator, SegmentationMemorySimulator, VirtualMemorySimulator
+
+class TestPagingSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = MemoryManagementSimulator(total_memory=3, page_size=1)
+
+    def test_fifo_fills_free_frames_in_order(self):
+        for page_num in range(3):
+            self.simulator.allocate_paging("1", page_num)
+        self.assertEqual(self.simulator.memory, [("1", 0), ("1", 1), ("1", 2)])
+        self.assertEqual(self.simulator.page_frames, {("1", 0): 0, ("1", 1): 1, ("1", 2): 2})
+
+    def test_fault_reuses_evicted_frame(self):
+        for page_num in range(3):
+            self.simulator.allocate_paging("1", page_num)
+        self.simulator.allocate_paging("1", 3)
+        self.simulator.simulate_page_request("1", 3)
+        state = self.simulator.display_memory()
+        self.assertEqual(state["Memory Frames"], [["1", 3], ["1", 1], ["1", 2]])
+        self.assertEqual(state["Page Table"]["1"], [(0, -1), (1, 1), (2, 2), (3, 0)])
+        self.assertEqual(state["Total Page Faults"], 1)
+        self.assertNotIn(("1", 0), self.simulator.page_frames)
+        self.assertEqual(self.simulator.page_frames[("1", 3)], 0)
+
+    def test_reset_clears_indexes(self):
+        self.simulator.allocate_paging("1", 0)
+        self.simulator.reset()
+        self.assertEqual(self.simulator.page_frames, {})
+        self.simulator.allocate_paging("2", 5)
+        self.assertEqual(self.simulator.memory[0], ("2", 5))
+
+    def test_lru_evicts_least_recently_used(self):
+        self.simulator.set_algorithm("LRU")
+        for page_num in range(3):
+            self.simulator.allocate_paging("1", page_num)
+        self.simulator.simulate_page_request("1", 0)
+        self.simulator.allocate_paging("1", 3)
+        self.simulator.simulate_page_request("1", 3)
+        self.assertEqual(self.simulator.memory, [("1", 0), ("1", 3), ("1", 2)])
+        self.assertEqual(list(self.simulator.page_access), [2, 0, 1])
+
+    def test_opt_uses_loaded_trace(self):
+        references = [("1", page_num) for page_num in [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]]
+        self.simulator.set_algorithm("OPT")
+        stats = self.simulator.replay_trace(references)
+        # Belady's example: 9 misses with 3 frames, the first 3 fill free frames
+        self.assertEqual(stats["Page Faults"], 6)
+
+    def test_opt_rejects_requests_off_trace(self):
+        self.simulator.set_algorithm("OPT")
+        self.simulator.load_trace([("1", 0), ("1", 1)])
+        self.simulator.allocate_paging("1", 0)
+        self.simulator.simulate_page_request("1", 0, verbose=False)
+        with self.assertRaises(ValueError):
+            self.simulator.allocate_paging("1", 5)
+
+    def test_clock_gives_referenced_pages_a_second_chance(self):
+        self.simulator.set_algorithm("CLOCK")
+        stats = self.simulator.replay_trace([("1", page_num) for page_num in [0, 1, 2, 0, 3, 4]])
+        self.assertEqual(stats["Page Faults"], 2)
+        self.assertEqual(self.simulator.memory, [("1", 3), ("1", 4), ("1", 2)])
+        self.assertGreater(stats["Bookkeeping Operations"], 0)
+
+    def test_arc_keeps_frequently_used_pages(self):
+        self.simulator.set_algorithm("ARC")
+        self.simulator.replay_trace([("1", page_num) for page_num in [0, 0, 1, 2, 3, 4, 5]])
+        self.assertIn(("1", 0), self.simulator.memory)
+        self.assertEqual(list(self.simulator.policy.t2), [("1", 0)])
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            self.simulator.set_algorithm("RANDOM")
+
+class TestSegmentationSimulator(unittest.TestCase):
+    def test_lru_evicts_least_recently_accessed_segment(self):
+        simulator = SegmentationMemorySimulator(total_memory=12)
+        simulator.set_algorithm("LRU")
+        for segment_id in range(3):
+            simulator.allocate_segmentation("1", segment_id, 4)
+        simulator.access_segment("1", 0)
+        self.assertTrue(simulator.allocate_segmentation("1", 3, 4))
+        self.assertEqual([sid for _, _, _, sid in simulator.memory], [0, 3, 2])
+        self.assertEqual(list(simulator.segment_access), [("1", 2), ("1", 0), ("1", 3)])
+
+    def test_fifo_skips_freed_segments(self):
+        simulator = SegmentationMemorySimulator(total_memory=12)
+        for segment_id in range(3):
+            simulator.allocate_segmentation("1", segment_id, 4)
+        simulator.deallocate_segment("1", 1)
+        self.assertEqual(list(simulator.segment_queue), [("1", 0), ("1", 2)])
+        self.assertTrue(simulator.allocate_segmentation("2", 0, 8))
+        self.assertEqual(simulator.memory, [(0, 8, "2", 0), (8, 4, "1", 2)])
+        self.assertIsNone(simulator.find_segment("1", 0))
+
+    def fragmented(self, compaction, threshold=None):
+        # Segments 0 and 2 freed around segment 1: holes (0, 4) and (8, 4)
+        simulator = SegmentationMemorySimulator(total_memory=12)
+        simulator.set_compaction(compaction, threshold)
+        for segment_id in range(3):
+            simulator.allocate_segmentation("1", segment_id, 4)
+        simulator.deallocate_segment("1", 0)
+        simulator.deallocate_segment("1", 2)
+        return simulator
+
+    def test_compaction_on_failure_avoids_failed_allocation(self):
+        self.assertFalse(self.fragmented("NEVER").allocate_segmentation("2", 0, 8))
+        simulator = self.fragmented("ON_FAILURE")
+        self.assertTrue(simulator.allocate_segmentation("2", 0, 8))
+        self.assertEqual(simulator.memory, [(0, 4, "1", 1), (4, 8, "2", 0)])
+        self.assertEqual(simulator.segment_table["1"][1].base_address, 0)
+        self.assertEqual((simulator.compactions, simulator.memory_moved, simulator.evictions), (1, 4, 0))
+
+    def test_compaction_threshold(self):
+        simulator = self.fragmented("THRESHOLD", threshold=0.6)
+        simulator.allocate_segmentation("2", 0, 2)
+        self.assertEqual(simulator.compactions, 0)
+        simulator = self.fragmented("THRESHOLD", threshold=0.4)
+        simulator.allocate_segmentation("2", 0, 2)
+        self.assertEqual(simulator.compactions, 1)
+        self.assertEqual(simulator.free_blocks, [(6, 6)])
+
+    def test_trace_reports_eviction_cost(self):
+        simulator = SegmentationMemorySimulator(total_memory=12)
+        stats = simulator.replay_trace([("1", 0, 4), ("1", 1, 4), ("1", 2, 4), ("1", 3, 8)])
+        self.assertEqual((stats["Evictions"], stats["Memory Evicted"], stats["Compactions"]), (2, 8, 0))
+
+    def test_allocating_existing_segment_is_a_no_op(self):
+        simulator = SegmentationMemorySimulator(total_memory=12)
+        simulator.allocate_segmentation("1", 0, 4)
+        self.assertTrue(simulator.allocate_segmentation("1", 0, 4))
+        self.assertEqual(simulator.memory, [(0, 4, "1", 0)])
+        self.assertEqual(simulator.free_blocks, [(4, 8)])
+
+class TestVirtualMemorySimulator(unittest.TestCase):
+    def test_lru_swaps_out_least_recently_used(self):
+        simulator = VirtualMemorySimulator(total_memory=2, page_size=1, swap_size=4)
+        simulator.set_algorithm("LRU")
+        simulator.allocate_virtual("1", 3)
+        for page_num in [0, 1, 0, 2]:
+            simulator.simulate_virtual_page_request("1", page_num)
+        self.assertEqual(simulator.memory, [("1", 0), ("1", 2)])
+        self.assertEqual(simulator.page_faults, 3)
+        self.assertEqual(simulator.swap_operations, 1)
+
+    def test_opt_swaps_out_page_used_furthest_ahead(self):
+        simulator = VirtualMemorySimulator(total_memory=2, page_size=1, swap_size=4)
+        simulator.allocate_virtual("1", 3)
+        simulator.set_algorithm("OPT")
+        stats = simulator.replay_trace([("1", 0), ("1", 1), ("1", 2), ("1", 0), ("1", 2), ("1", 1)])
+        self.assertEqual(stats["Page Faults"], 4)
+
+    def test_swap_out_reuses_lowest_free_slot(self):
+        simulator = VirtualMemorySimulator(total_memory=1, page_size=1, swap_size=3)
+        simulator.allocate_virtual("1", 3)
+        simulator.simulate_virtual_page_request("1", 2)
+        simulator.simulate_virtual_page_request("1", 0)
+        self.assertEqual(simulator.swap, [None, ("1", 1), ("1", 2)])
+        self.assertEqual(simulator.page_table["1"], [(0, 0, True), (1, 1, False), (2, 2, False)])
+
+    def test_allocate_virtual_keeps_existing_pages(self):
+        simulator = VirtualMemorySimulator(total_memory=2, page_size=1, swap_size=4)
+        simulator.allocate_virtual("1", 2)
+        simulator.allocate_virtual("1", 3)
+        self.assertEqual([entry[0] for entry in simulator.page_table["1"]], [0, 1, 2])
+        self.assertEqual(simulator.swap, [("1", 0), ("1", 1), ("1", 2), None])
+
+    def test_fallback_eviction_loads_requested_page(self):
+        simulator = VirtualMemorySimulator(total_memory=2, page_size=1, swap_size=4)
+        simulator.allocate_virtual("1", 3)
+        for page_num in [0, 1]:
+            simulator.simulate_virtual_page_request("1", page_num)
+        # Switching algorithms clears the queue, so the next fault evicts the first resident page
+        simulator.set_algorithm("LRU")
+        simulator.simulate_virtual_page_request("1", 2)
+        self.assertEqual(simulator.memory, [("1", 2), ("1", 1)])
+        self.assertEqual(simulator.page_table["1"][0], (0, 0, False))
+
+class TestTraceRoutes(unittest.TestCase):
+    def setUp(self):
+        self.client = main.app.test_client()
+        self.client.environ_base["HTTP_X_SESSION_ID"] = "trace-tests"
+        main.sessions.remove("trace-tests")
+        self.session = main.sessions.get("trace-tests")
+
+    def test_paging_trace_matches_single_steps(self):
+        sequence = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+        response = self.client.post("/simulate_trace", json={"sequence": sequence, "bitmap": True, "reset": True})
+        self.assertEqual(response.status_code, 200)
+        stats = response.json
+
+        stepped = MemoryManagementSimulator()
+        stepped.reset()
+        for page_num in sequence:
+            stepped.allocate_paging("1", page_num)
+            stepped.simulate_page_request("1", page_num, verbose=False)
+        self.assertEqual(stats["References"], 20)
+        self.assertEqual(stats["Page Faults"], stepped.page_faults)
+        self.assertEqual(self.session.paging.display_memory(), stepped.display_memory())
+        bits = base64.b64decode(stats["Fault Bitmap"])
+        faults = sum(bin(byte).count("1") for byte in bits)
+        self.assertEqual(faults, stats["Page Faults"])
+
+    def test_virtual_trace_allocates_pages(self):
+        response = self.client.post("/simulate_virtual_trace", json={"sequence": [[2, 0], [2, 1], [2, 0]]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["Page Faults"], 2)
+        self.assertEqual(response.json["Hits"], 1)
+        self.assertEqual(len(self.session.virtual.page_table["2"]), 2)
+
+    def test_segmentation_trace_reports_failures(self):
+        response = self.client.post("/simulate_segmentation_trace", json={"sequence": ["0:16", "1:40", "0:0"], "bitmap": True})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["Failed Allocations"], 1)
+        self.assertEqual(response.json["Accesses"], 1)
+        self.assertEqual(base64.b64decode(response.json["Failure Bitmap"]), bytes([0b010]))
+
+    def test_miss_ratio_curve(self):
+        response = self.client.post("/miss_ratio_curve", json={"sequence": [0, 1, 2, 0, 1, 2], "page_size": 4})
+        self.assertEqual(response.status_code, 200)
+        curve = response.json["Curve"]
+        self.assertEqual([point["Misses"] for point in curve], [6, 6, 3])
+        self.assertEqual(curve[2]["Total Memory"], 12)
+
+    def test_invalid_trace(self):
+        response = self.client.post("/simulate_trace", json={"sequence": "0,1,2"})
+        self.assertEqual(response.status_code, 400)
+
+class TestStateDiffs(unittest.TestCase):
+    def setUp(self):
+        self.client = main.app.test_client()
+        self.client.environ_base["HTTP_X_SESSION_ID"] = "diff-tests"
+        main.sessions.remove("diff-tests")
+
+    def check_diffs(self, display_route, step):
+        state = self.client.get(display_route).json
+        self.assertTrue(state["Full"])
+        for i in range(30):
+            step(i)
+            changes = self.client.get(display_route, query_string={"since": state["Version"]}).json
+            self.assertFalse(changes["Full"])
+            state = apply_state_changes(state, changes)
+            full = self.client.get(display_route).json
+            self.assertEqual(state, json.loads(json.dumps(full)))
+
+    def test_paging_diffs_rebuild_full_state(self):
+        def step(i):
+            self.client.post("/simulate_trace", json={"sequence": [(i * 5) % 11, i % 3]})
+        self.check_diffs("/display_memory", step)
+
+    def test_virtual_diffs_rebuild_full_state(self):
+        def step(i):
+            self.client.post("/simulate_virtual_trace", json={"sequence": [[1, (i * 5) % 11], [2, i % 3]]})
+        self.check_diffs("/display_virtual_memory", step)
+
+    def test_segmentation_diffs_rebuild_full_state(self):
+        def step(i):
+            self.client.post("/simulate_segmentation_trace", json={"sequence": [[i % 4, i % 5, 3 + i % 7]]})
+        self.check_diffs("/display_segmentation_memory", step)
+
+    def test_compacting_segmentation_diffs_rebuild_full_state(self):
+        self.client.post("/set_segmentation_compaction", json={"compaction": "ALWAYS"})
+        def step(i):
+            self.client.post("/simulate_segmentation_trace", json={"sequence": [[i % 4, i % 5, 3 + i % 7]]})
+        self.check_diffs("/display_segmentation_memory", step)
+
+    def test_allocation_diffs_carry_only_changed_entries(self):
+        self.client.post("/simulate_segmentation_trace", json={"sequence": [[1, 1, 16], [1, 2, 16]]})
+        version = self.client.get("/display_segmentation_memory").json["Version"]
+        # Evicts segment 1 at 0 and puts the new one there, leaving a hole at 8
+        self.client.post("/simulate_segmentation_trace", json={"sequence": [[2, 1, 8]]})
+        changes = self.client.get("/display_segmentation_memory", query_string={"since": version}).json
+        self.assertEqual(changes["Memory State"], [[0, [0, 8, "2", 1]]])
+        self.assertEqual(changes["Free Blocks"], [[0, None], [8, [8, 8]]])
+        self.client.post("/simulate_buddy_trace", json={"sequence": [[1, 1, 4], [1, 2, 4]]})
+        version = self.client.get("/display_buddy_memory").json["Version"]
+        self.client.post("/simulate_buddy_trace", json={"sequence": [[2, 1, 8]]})
+        changes = self.client.get("/display_buddy_memory", query_string={"since": version}).json
+        self.assertEqual(changes["Memory State"], [[8, [8, 8, "2", 1, 8]]])
+        # The free 8 at 8 is taken whole; the free 16 at 16 is untouched
+        self.assertEqual(changes["Free Lists"], [[8, None]])
+        self.assertEqual(changes["Free Blocks"], [[8, None]])
+
+    def test_buddy_diffs_rebuild_full_state(self):
+        def step(i):
+            self.client.post("/simulate_buddy_trace", json={"sequence": [[i % 4, i % 5, 1 + i % 9]]})
+        self.check_diffs("/display_buddy_memory", step)
+
+    def test_slab_diffs_rebuild_full_state(self):
+        def step(i):
+            size = 0 if i % 3 == 2 else 16 << (i % 9)
+            self.client.post("/simulate_slab_trace", json={"sequence": [[i % 4, i % 5, size]]})
+        self.check_diffs("/display_slab_memory", step)
+
+    def test_unchanged_state_returns_empty_diff(self):
+        version = self.client.get("/display_memory").json["Version"]
+        changes = self.client.get("/display_memory", query_string={"since": version}).json
+        self.assertEqual(changes["Memory Frames"], [])
+        self.assertEqual(changes["Page Table"], {})
+
+    def test_truncated_log_falls_back_to_full_snapshot(self):
+        simulator = MemoryManagementSimulator()
+        simulator.changes = ChangeLog(limit=4)
+        for page_num in range(6):
+            simulator.allocate_paging("1", page_num)
+        self.assertTrue(simulator.display_memory(since=0)["Full"])
+        self.assertFalse(simulator.display_memory(since=simulator.changes.version - 2)["Full"])
+        simulator.reset()
+        self.assertTrue(simulator.display_memory(since=simulator.changes.version - 1)["Full"])
+
+def parse_event(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+class TestStateEvents(unittest.TestCase):
+    def setUp(self):
+        self.client = main.app.test_client()
+        self.client.environ_base["HTTP_X_SESSION_ID"] = "event-tests"
+        main.sessions.remove("event-tests")
+
+    def test_stream_sends_snapshots_then_diffs(self):
+        response = self.client.get("/events", query_string={"modes": "paging,virtual"}, buffered=False)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        stream = iter(response.response)
+        first = [parse_event(next(stream)) for _ in range(2)]
+        self.assertEqual([kind for kind, _ in first], ["paging", "virtual"])
+        self.assertTrue(all(state["Full"] for _, state in first))
+
+        self.client.post("/simulate_trace", json={"sequence": [3, 5]})
+        kind, state = parse_event(next(stream))
+        self.assertEqual(kind, "paging")
+        self.assertFalse(state["Full"])
+        self.assertEqual(state["Since"], first[0][1]["Version"])
+        self.assertEqual(state["Memory Frames"], [[0, ["1", 3]], [1, ["1", 5]]])
+
+        self.client.post("/end_session")
+        self.assertEqual(list(stream), [])
+        response.close()
+
+    def test_unknown_mode_is_rejected(self):
+        self.assertEqual(self.client.get("/events", query_string={"modes": "tlb"}).status_code, 400)
+
+class TestSessions(unittest.TestCase):
+    def setUp(self):
+        self.client = main.app.test_client()
+
+    def test_sessions_are_isolated(self):
+        self.client.post("/simulate_trace", json={"sequence": [0, 1, 2], "reset": True}, headers={"X-Session-ID": "a"})
+        self.client.post("/reset", headers={"X-Session-ID": "b"})
+        state_a = self.client.get("/display_memory", headers={"X-Session-ID": "a"}).json
+        state_b = self.client.get("/display_memory", headers={"X-Session-ID": "b"}).json
+        self.assertEqual(state_a["Memory Frames"][:3], [["1", 0], ["1", 1], ["1", 2]])
+        self.assertEqual(state_b["Memory Frames"], [None] * 8)
+
+    def test_registry_evicts_least_recently_used(self):
+        registry = main.SessionRegistry(main.create_simulators, max_sessions=2)
+        for session_id in ["a", "b", "a", "c"]:
+            registry.get(session_id)
+            registry.update(session_id)
+        self.assertEqual(list(registry.sessions), ["a", "c"])
+        self.assertEqual(registry.evictions, 1)
+
+    def test_registry_memory_cap_keeps_active_session(self):
+        registry = main.SessionRegistry(main.create_simulators, max_bytes=1)
+        registry.get("a")
+        registry.update("a")
+        registry.get("b")
+        registry.update("b")
+        self.assertEqual(list(registry.sessions), ["b"])
+
+class TestConcurrency(unittest.TestCase):
+    def test_read_write_lock_excludes_writers_from_readers(self):
+        lock = ReadWriteLock()
+        events = []
+        with lock.read_lock():
+            writer = threading.Thread(target=lambda: lock.write_lock().__enter__() or events.append("write"))
+            with lock.read_lock():
+                events.append("read")
+            writer.start()
+            writer.join(0.05)
+            self.assertEqual(events, ["read"])
+        writer.join(1)
+        self.assertEqual(events, ["read", "write"])
+
+    def test_concurrent_writes_and_reads_keep_invariants(self):
+        headers = {"X-Session-ID": "stress"}
+        main.sessions.remove("stress")
+        errors = []
+
+        def check_state(state):
+            resident = {}
+            for frame, page in enumerate(state["Memory Frames"]):
+                if page is not None:
+                    resident[tuple(page)] = frame
+            mapped = {(pid, p_num): f_num for pid, pages in state["Page Table"].items()
+                      for p_num, f_num in pages if f_num != -1}
+            if resident != mapped:
+                errors.append((resident, mapped))
+
+        def writer(seed):
+            client = main.app.test_client()
+            for i in range(40):
+                sequence = [[str(seed), (seed * 7 + i * 3 + j) % 12] for j in range(20)]
+                response = client.post("/simulate_trace", json={"sequence": sequence}, headers=headers)
+                if response.status_code != 200:
+                    errors.append(response.json)
+                if i % 10 == 0:
+                    client.post("/set_algorithm", json={"algorithm": ["FIFO", "LRU", "CLOCK"][seed % 3]}, headers=headers)
+
+        def reader():
+            client = main.app.test_client()
+            for _ in range(60):
+                check_state(client.get("/display_memory", headers=headers).json)
+
+        threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        simulator = main.sessions.get("stress").paging
+        self.assertEqual(simulator.page_frames, {page: frame for frame, page in enumerate(simulator.memory) if page})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import main
+from main import MemoryManagementSimulator
+from page_tables import PAGE_TABLE_ORGANIZATIONS, InvertedPageTable, RadixPageTable, PTE_BYTES
+
+class TestRadixPageTable(unittest.TestCase):
+    def test_walk_reads_one_table_per_level(self):
+        table = RadixPageTable((9, 9, 9, 9))
+        table.map("1", 2 ** 35 + 5, 3)
+        self.assertEqual(table.translate("1", 2 ** 35 + 5), (3, 4))
+        self.assertEqual(table.translate("1", 6), (None, 1))
+        self.assertEqual(table.translate("1", 2 ** 35 + 6), (None, 4))
+        self.assertEqual(table.overhead_bytes(), 4 * 512 * PTE_BYTES)
+
+    def test_neighbouring_pages_share_tables(self):
+        table = RadixPageTable((18, 18))
+        for page_num in range(100):
+            table.map("1", page_num, -1)
+        self.assertEqual(table.overhead_bytes(), 2 * 2 ** 18 * PTE_BYTES)
+        self.assertEqual(table.translate("1", 50), (None, 2))
+
+    def test_page_outside_address_space(self):
+        with self.assertRaises(ValueError):
+            RadixPageTable((18, 18)).map("1", 2 ** 36, 0)
+
+class TestInvertedPageTable(unittest.TestCase):
+    def test_colliding_pages_are_chained(self):
+        table = InvertedPageTable(1)
+        table.anchor_count = 1  # Every page hashes to the same anchor
+        table.anchors = [-1]
+        table.owners, table.links = [None, None], [-1, -1]
+        table.map("1", 7, 0)
+        table.map("2", 7, 1)
+        self.assertEqual(table.translate("1", 7), (0, 3))
+        self.assertEqual(table.translate("2", 7), (1, 2))
+        table.map("2", 7, -1)
+        self.assertEqual(table.translate("2", 7), (None, 2))
+        self.assertEqual(table.translate("1", 7), (0, 2))
+
+class TestPageTableModes(unittest.TestCase):
+    def test_organizations_agree_on_faults(self):
+        references = [("1", page_num * 4099) for page_num in [0, 1, 2, 0, 3, 4, 0, 1, 5]]
+        results = []
+        for organization in PAGE_TABLE_ORGANIZATIONS:
+            simulator = MemoryManagementSimulator(total_memory=3, page_size=1)
+            simulator.set_page_table(organization)
+            stats = simulator.replay_trace(references)
+            results.append((stats["Page Faults"], simulator.display_memory()["Memory Frames"]))
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_switching_rebuilds_translations(self):
+        simulator = MemoryManagementSimulator(total_memory=3, page_size=1)
+        simulator.replay_trace([("1", 0), ("1", 9)])
+        simulator.set_page_table("FOUR_LEVEL")
+        self.assertEqual(simulator.page_walker.translate("1", 9), (1, 4))
+        self.assertFalse(simulator.simulate_page_request("1", 9, verbose=False))
+        self.assertEqual(simulator.page_table_stats()["Average Walk Depth"], 4.0)
+
+    def test_routes(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "page-table-tests"
+        main.sessions.remove("page-table-tests")
+        self.assertEqual(client.post("/set_page_table", json={"organization": "HASHED"}).status_code, 400)
+        self.assertEqual(client.post("/set_page_table", json={"organization": "INVERTED"}).status_code, 200)
+        stats = client.post("/simulate_trace", json={"sequence": [0, 1, 0]}).json
+        self.assertEqual(stats["Page Table Organization"], "INVERTED")
+        self.assertEqual(client.get("/page_table_stats").json["Translations"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+import main
+from main import SlabMemorySimulator
+from slab import SlabAllocator, SlabCache, FramePool
+
+class TestSlabCache(unittest.TestCase):
+    def test_slabs_move_between_lists(self):
+        cache = SlabCache(1024, 4096, FramePool(4))
+        slots = [cache.allocate() for _ in range(5)]
+        self.assertEqual(slots[:4], [(0, 0), (0, 1), (0, 2), (0, 3)])
+        self.assertEqual(slots[4], (1, 0))
+        self.assertEqual([len(cache.lists[state]) for state in ("full", "partial", "empty")], [1, 1, 0])
+        cache.free(1, 0)
+        cache.free(0, 2)
+        self.assertEqual([len(cache.lists[state]) for state in ("full", "partial", "empty")], [0, 1, 1])
+        # Partial slabs are filled before empty ones, reusing the freed slot
+        self.assertEqual(cache.allocate(), (0, 2))
+        self.assertEqual(cache.shrink(), [1])
+        self.assertEqual(cache.pool.used, 1)
+
+    def test_object_larger_than_page(self):
+        with self.assertRaises(ValueError):
+            SlabCache(8192, 4096, FramePool(4))
+
+class TestSlabAllocator(unittest.TestCase):
+    def test_size_classes(self):
+        allocator = SlabAllocator(4, 4096)
+        self.assertEqual(allocator.cache_for(1).object_size, 16)
+        self.assertEqual(allocator.cache_for(17).object_size, 32)
+        self.assertEqual(allocator.cache_for(2048).object_size, 2048)
+        self.assertIsNone(allocator.cache_for(2049))
+        self.assertIsNone(allocator.allocate(5000))
+
+    def test_empty_slabs_are_reaped_when_pool_runs_out(self):
+        allocator = SlabAllocator(2, 4096)
+        small = allocator.allocate(16)
+        large = allocator.allocate(2048)
+        allocator.free(small)
+        released = []
+        self.assertEqual(allocator.allocate(2048, released), 1 * 4096 + 2048)
+        self.assertEqual(allocator.allocate(2048, released), 0)
+        self.assertEqual(released, [0])
+        self.assertIsNone(allocator.allocate(16))
+        self.assertEqual(large, 1 * 4096)
+
+    def test_random_objects_never_overlap(self):
+        rnd = random.Random(15)
+        allocator = SlabAllocator(16, 4096)
+        objects = {}
+        for _ in range(5000):
+            if objects and rnd.random() < 0.5:
+                address = rnd.choice(list(objects))
+                allocator.free(address)
+                del objects[address]
+            else:
+                size = rnd.choice((1, 16, 17, 100, 600, 2048))
+                address = allocator.allocate(size)
+                if address is not None:
+                    objects[address] = allocator.cache_for(size).object_size
+            self.assertEqual(sum(cache.in_use for cache in allocator.caches.values()), len(objects))
+            self.assertEqual(allocator.pool.used, sum(len(cache.slabs) for cache in allocator.caches.values()))
+        spans = sorted((address, address + size) for address, size in objects.items())
+        self.assertTrue(all(end <= start for (_, end), (start, _) in zip(spans, spans[1:])))
+        self.assertTrue(all(start // 4096 == (end - 1) // 4096 for start, end in spans))
+
+class TestSlabMemorySimulator(unittest.TestCase):
+    def test_cache_utilization_and_pages(self):
+        simulator = SlabMemorySimulator(frames=4)
+        for object_id in range(3):
+            simulator.allocate_object("1", object_id, 1000)
+        simulator.allocate_object("1", 3, 20)
+        state = simulator.display_memory()
+        self.assertEqual(state["Pages Used"], 2)
+        self.assertEqual(state["Caches"]["1024"]["Utilization"], 0.75)
+        self.assertEqual(state["Caches"]["32"]["Capacity"], 128)
+        self.assertEqual(state["Memory Frames"][:3], [[1024, 3, 4], [32, 1, 128], None])
+        self.assertTrue(simulator.free_object("1", 3))
+        self.assertEqual(simulator.display_memory()["Caches"]["32"]["Empty Slabs"], 1)
+
+    def test_trace_route(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "slab-tests"
+        main.sessions.remove("slab-tests")
+        response = client.post("/simulate_slab_trace", json={"sequence": ["1:64", "2:64", "1:0", "3:9000"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["Frees"], 1)
+        self.assertEqual(response.json["Failed Allocations"], 1)
+        self.assertEqual(response.json["Caches"]["64"]["Objects"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import main
+
+BELADY_TRACE = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+class TestSweep(unittest.TestCase):
+    def test_fifo_belady_anomaly_is_flagged(self):
+        references = [("1", page_num) for page_num in BELADY_TRACE]
+        result = main.run_sweep(references, "paging", ["FIFO", "LRU", "OPT"], range(1, 6), workers=1)
+        misses = {curve["Algorithm"]: [point["Misses"] for point in curve["Points"]] for curve in result["Curves"]}
+        self.assertEqual(misses, {"FIFO": [12, 12, 9, 10, 5], "LRU": [12, 12, 10, 8, 5], "OPT": [12, 9, 7, 6, 5]})
+        self.assertEqual(result["Belady Anomalies"], [{"Frames": 3, "Misses": 9, "More Frames": 4, "More Misses": 10,
+                                                       "Algorithm": "FIFO", "Page Size": 1}])
+
+    def test_page_sizes_group_addresses(self):
+        references = [("1", address) for address in range(16)] * 2
+        result = main.run_sweep(references, "virtual", ["LRU"], [2], page_sizes=[4, 8], workers=1)
+        points = [curve["Points"][0] for curve in result["Curves"]]
+        self.assertEqual([point["Misses"] for point in points], [8, 2])
+        self.assertEqual([point["Total Memory"] for point in points], [8, 16])
+        self.assertEqual(points[0]["Swap Operations"], 6)
+
+    def test_process_pool_matches_serial_run(self):
+        references = [(str(i % 3), i * 7 % 23) for i in range(300)]
+        serial = main.run_sweep(references, "virtual", ["FIFO", "CLOCK"], [2, 4, 8], workers=1)
+        pooled = main.run_sweep(references, "virtual", ["FIFO", "CLOCK"], [2, 4, 8], workers=2)
+        self.assertEqual(pooled["Workers"], 2)
+        self.assertEqual(serial["Curves"], pooled["Curves"])
+
+    def test_route(self):
+        client = main.app.test_client()
+        response = client.post("/sweep", json={"sequence": BELADY_TRACE, "frames": [3, 4], "algorithms": ["FIFO"],
+                                               "workers": 1})
+        self.assertEqual(len(response.json["Belady Anomalies"]), 1)
+        response = client.post("/sweep", json={"sequence": BELADY_TRACE, "frames": [3], "algorithms": ["MRU"]})
+        self.assertEqual(response.status_code, 400)
+        response = client.post("/sweep", json={"sequence": BELADY_TRACE, "frames": [0, 3]})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
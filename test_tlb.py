@@ -0,0 +1,97 @@
+import random
+import unittest
+import main
+from main import MemoryManagementSimulator, VirtualMemorySimulator
+from tlb import TLB
+
+class TestTLB(unittest.TestCase):
+    def test_lru_within_a_set(self):
+        tlb = TLB(entries=4, associativity=2)  # Even pages in set 0, odd pages in set 1
+        tlb.insert("1", 0, 10)
+        tlb.insert("1", 2, 12)
+        self.assertEqual(tlb.lookup("1", 0), 10)
+        tlb.insert("1", 4, 14)  # Set 0 is full: drops page 2, the least recently used
+        self.assertIsNone(tlb.lookup("1", 2))
+        self.assertEqual(tlb.lookup("1", 4), 14)
+        tlb.insert("1", 1, 11)  # Set 1 is untouched
+        self.assertEqual((tlb.hits, tlb.misses, tlb.evictions), (2, 1, 1))
+
+    def test_random_replacement_stays_within_sets(self):
+        tlb = TLB(entries=8, associativity=4, replacement="RANDOM", seed=3)
+        for page_num in range(40):
+            tlb.insert("1", page_num, page_num)
+            if page_num % 3 == 0:
+                tlb.invalidate("1", page_num)
+        for index, line in enumerate(tlb.lines):
+            self.assertLessEqual(len(line), 4)
+            self.assertEqual(sorted(line), sorted(tlb.ways[index]))
+            self.assertTrue(all(page_num % 2 == index for _, page_num in line))
+
+    def test_flush_on_process_switch(self):
+        tagged, flushed = TLB(entries=4), TLB(entries=4, flush_on_switch=True)
+        for tlb in (tagged, flushed):
+            tlb.lookup("1", 0)
+            tlb.insert("1", 0, 5)
+            tlb.lookup("2", 0)
+            tlb.insert("2", 0, 6)
+        self.assertEqual(tagged.lookup("1", 0), 5)
+        self.assertIsNone(flushed.lookup("1", 0))
+        self.assertEqual(flushed.flushes, 2)
+
+    def test_invalid_configurations(self):
+        with self.assertRaises(ValueError):
+            TLB(entries=6, associativity=4)
+        with self.assertRaises(ValueError):
+            TLB(entries=4, replacement="FIFO")
+
+class TestSimulatorTLB(unittest.TestCase):
+    def test_tlb_does_not_change_faults(self):
+        rng = random.Random(7)
+        references = [(str(rng.randrange(2)), rng.randrange(12)) for _ in range(500)]
+        for make in (lambda: MemoryManagementSimulator(total_memory=4, page_size=1),
+                     lambda: VirtualMemorySimulator(total_memory=4, page_size=1, swap_size=40)):
+            results = []
+            for entries in (0, 4):
+                simulator = make()
+                if isinstance(simulator, VirtualMemorySimulator):
+                    simulator.allocate_virtual("0", 12)
+                    simulator.allocate_virtual("1", 12)
+                simulator.set_algorithm("LRU")
+                simulator.set_tlb(entries, replacement="RANDOM")
+                bitmap = main.TraceBitmap()
+                stats = simulator.replay_trace(references, bitmap)
+                results.append((bitmap.data, simulator.display_memory()["Memory Frames"]))
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(stats["TLB Hits"] + stats["TLB Misses"], len(references))
+            for line in simulator.tlb.lines:
+                for page, frame in line.items():
+                    self.assertEqual(tuple(simulator.memory[frame]), page)
+
+    def test_hits_skip_the_walk(self):
+        simulator = MemoryManagementSimulator(total_memory=4, page_size=1)
+        simulator.set_tlb(2)
+        stats = simulator.replay_trace([("1", 0), ("1", 0), ("1", 0)])
+        self.assertEqual((stats["TLB Hits"], stats["TLB Misses"], stats["TLB Reach"]), (2, 1, 2))
+        self.assertEqual(simulator.translations, 1)
+        state = simulator.display_memory()
+        self.assertEqual((state["TLB Hits"], state["TLB Misses"]), (2, 1))
+        simulator.reset()
+        self.assertEqual(simulator.display_memory()["TLB Hits"], 0)
+
+    def test_routes(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "tlb-tests"
+        main.sessions.remove("tlb-tests")
+        self.assertEqual(client.post("/set_tlb", json={"entries": 6, "associativity": 4}).status_code, 400)
+        response = client.post("/set_virtual_tlb", json={"entries": 8, "associativity": 2})
+        self.assertEqual(response.json["TLB Reach"], 32)
+        client.post("/allocate_virtual", json={"process_id": "1", "num_pages": 2})
+        for _ in range(2):
+            client.post("/simulate_virtual_page_request", json={"process_id": "1", "page_num": 1})
+        state = client.get("/display_virtual_memory").json
+        self.assertEqual((state["TLB Hits"], state["TLB Misses"]), (1, 1))
+        self.assertEqual(client.post("/set_virtual_tlb", json={"entries": 0}).status_code, 200)
+        self.assertEqual(client.get("/display_virtual_memory").json["TLB Hits"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import itertools
+import os
+import tempfile
+import unittest
+import main
+from main import MemoryManagementSimulator
+from traces import (FLAG_RUNS, OP_WRITE, RUN_RECORD, TRACE_HEADER, TRACE_MAGIC, TRACE_VERSION, TraceFile,
+                    read_text_trace, write_trace)
+
+class TestTraceFiles(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "test.trace")
+
+    def test_round_trip(self):
+        references = [("1", 5, 0), ("2", 2 ** 40, OP_WRITE), ("1", -3, 0)] + [("3", page_num, 0) for page_num in range(10)]
+        for compress in (False, True):
+            self.assertEqual(write_trace(self.path, references, compress=compress), len(references))
+            trace = TraceFile(self.path, chunk_references=4)
+            self.assertEqual(len(trace), len(references))
+            self.assertEqual(list(itertools.chain.from_iterable(trace.chunks(with_ops=True))), references)
+            self.assertEqual(list(trace), [(process_id, page_num) for process_id, page_num, _ in references])
+
+    def test_runs_compress_scans_and_repeats(self):
+        references = [("1", 7)] * 1000 + [("1", page_num) for page_num in range(100, 1100)]
+        write_trace(self.path, references, compress=True)
+        trace = TraceFile(self.path, chunk_references=300)
+        self.assertEqual(trace.records, 2)
+        self.assertEqual(os.path.getsize(self.path), TRACE_HEADER.size + 2 * RUN_RECORD.size)
+        self.assertEqual([len(chunk) for chunk in trace.chunks()], [300] * 6 + [200])
+        self.assertEqual(list(trace), references)
+
+    def test_text_traces_and_bad_files(self):
+        self.assertEqual(list(read_text_trace(["1, 2,", "3:4"], process_id=9)), [("9", 1), ("9", 2), ("3", 4)])
+        for reference in (("web", 1), ("-7", 1), (2 ** 32, 1), ("1", 2 ** 63)):
+            with self.assertRaises(ValueError):
+                write_trace(self.path, [reference])
+        with open(self.path, "wb") as f:
+            f.write(b"not a trace at all")
+        with self.assertRaises(ValueError):
+            TraceFile(self.path)
+        # A header whose count disagrees with the records
+        for compress, count in ((False, 4), (False, 6), (True, 1)):
+            write_trace(self.path, [("1", page_num ** 2) for page_num in range(5)], compress=compress)
+            with open(self.path, "r+b") as f:
+                f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FLAG_RUNS if compress else 0, 0, count))
+            with self.assertRaises(ValueError):
+                TraceFile(self.path)
+
+    def test_simulators_replay_trace_files(self):
+        references = [("1", page_num % 5) for page_num in range(50)]
+        write_trace(self.path, references, compress=True)
+        expected = MemoryManagementSimulator(total_memory=3, page_size=1).replay_trace(references)
+        stats = MemoryManagementSimulator(total_memory=3, page_size=1).replay_trace(TraceFile(self.path))
+        self.assertEqual(stats["Page Faults"], expected["Page Faults"])
+
+    def test_upload_and_replay_routes(self):
+        original = main.TRACE_CONFIG["directory"]
+        main.TRACE_CONFIG["directory"] = self.directory
+        self.addCleanup(main.TRACE_CONFIG.__setitem__, "directory", original)
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "trace-tests"
+        main.sessions.remove("trace-tests")
+        write_trace(self.path, [("1", page_num % 4) for page_num in range(40)])
+        with open(self.path, "rb") as f:
+            uploaded = client.post("/upload_trace", data=f.read()).json
+        self.assertEqual(uploaded["References"], 40)
+        stats = client.post("/simulate_virtual_trace", json={"trace_file": uploaded["trace_file"]}).json
+        self.assertEqual((stats["References"], stats["Page Faults"]), (40, 4))
+        sweep = client.post("/sweep", json={"trace_file": uploaded["trace_file"], "frames": [2, 4], "workers": 1}).json
+        self.assertEqual(sweep["References"], 40)
+        self.assertEqual(client.post("/upload_trace", data=io.BytesIO(b"junk")).status_code, 400)
+        self.assertEqual(client.post("/simulate_trace", json={"trace_file": "../test.trace"}).status_code, 400)
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(["test.trace", uploaded["trace_file"]]))
+
+if __name__ == "__main__":
+    unittest.main()
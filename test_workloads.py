@@ -0,0 +1,99 @@
+import collections
+import itertools
+import unittest
+import main
+import workloads
+from workloads import (LoopPages, PhasedPages, SequentialPages, StridedPages, UniformPages, Workload,
+                       ZipfPages, workload_from_spec)
+
+class TestWorkloads(unittest.TestCase):
+    def test_models(self):
+        loop = Workload({"1": LoopPages(4, offset=10)}, seed=1)
+        self.assertEqual([page for _, page in loop.references(6)], [10, 11, 12, 13, 10, 11])
+        strided = Workload({"1": StridedPages(10, stride=3)}, seed=1)
+        self.assertEqual([page for _, page in strided.references(5)], [0, 3, 6, 9, 2])
+        pages = [page for _, page in Workload({"1": SequentialPages(100, run=5)}, seed=1).references(20)]
+        for start in range(0, 20, 5):
+            self.assertEqual(pages[start:start + 5], list(range(pages[start], pages[start] + 5)))
+        uniform = [page for _, page in Workload({"1": UniformPages(8, offset=2)}, seed=1).references(500)]
+        self.assertEqual(set(uniform), set(range(2, 10)))
+
+    def test_zipf_skew(self):
+        counts = collections.Counter(page for _, page in Workload({"1": ZipfPages(100, exponent=1.2)}, seed=3).references(5000))
+        self.assertEqual(counts.most_common(1)[0][0], 0)
+        self.assertGreater(counts[0], 10 * counts[50])
+        self.assertTrue(all(0 <= page < 100 for page in counts))
+
+    def test_phases_shift_the_working_set(self):
+        phased = PhasedPages([(LoopPages(3), 6), (LoopPages(2, offset=50), 4)])
+        pages = [page for _, page in Workload({"1": phased}, seed=1).references(20)]
+        self.assertEqual(pages[:10], [0, 1, 2, 0, 1, 2, 50, 51, 50, 51])
+        self.assertEqual(pages[10:], pages[:10])
+        self.assertEqual(phased.span, 52)
+
+    def test_interleaving_and_replay(self):
+        workload = Workload([("1", LoopPages(5)), ("2", UniformPages(5))], quantum=2, seed=7)
+        references = list(workload.references(8))
+        self.assertEqual([process_id for process_id, _ in references], ["1", "1", "2", "2"] * 2)
+        self.assertEqual(list(workload.references(8)), references)
+        weighted = Workload([("1", LoopPages(5)), ("2", LoopPages(5))], schedule="RANDOM", weights=[1, 0], seed=7)
+        self.assertEqual({process_id for process_id, _ in weighted.references(50)}, {"1"})
+        # Lazy without a count: take what is needed
+        self.assertEqual(len(list(itertools.islice(workload.references(), 1000))), 1000)
+        self.assertEqual(workload.page_counts(), {"1": 5, "2": 5})
+
+    def test_segment_requests_keep_their_size(self):
+        workload = Workload({"1": LoopPages(3)}, seed=1)
+        requests = list(workload.segment_requests(9, min_size=2, max_size=6))
+        sizes = {segment_id: size for _, segment_id, size in requests}
+        self.assertEqual(requests[3:6], requests[:3])
+        self.assertTrue(all(2 <= size <= 6 for size in sizes.values()))
+
+    def test_specs(self):
+        workload = workload_from_spec({
+            "seed": 4, "quantum": 3,
+            "processes": [
+                {"process_id": "7", "model": "ZIPF", "pages": 20, "exponent": 0.8},
+                {"model": "PHASED", "phases": [{"model": "LOOP", "pages": 4, "length": 10},
+                                               {"model": "STRIDED", "pages": 8, "stride": 2, "length": 5}]}
+            ]
+        })
+        self.assertEqual(workload.process_ids, ["7", "2"])
+        self.assertEqual(workload.page_counts(), {"7": 20, "2": 8})
+        for spec in ({"processes": []}, {"processes": [{"model": "BOGUS", "pages": 4}]},
+                     {"processes": [{"model": "LOOP", "pages": 4, "stride": 2}]},
+                     {"processes": [{"model": "LOOP", "pages": 0}]}):
+            with self.assertRaises(ValueError):
+                workload_from_spec(spec)
+
+    @unittest.skipUnless(workloads.numpy, "NumPy is not installed")
+    def test_blocks(self):
+        workload = Workload([("1", LoopPages(7)), ("2", SequentialPages(50, run=4)),
+                             ("3", PhasedPages([(ZipfPages(10), 5), (StridedPages(9, stride=2), 3)]))],
+                            quantum=3, seed=2)
+        blocks = list(workload.blocks(100, block_size=10))
+        self.assertEqual(sum(len(pages) for _, pages in blocks), 100)
+        references = list(workload.block_references(100, block_size=10))
+        # Deterministic models come out the same whether drawn lazily or in blocks
+        lazy = list(workload.references(100))
+        self.assertEqual([r for r in references if r[0] == "1"], [r for r in lazy if r[0] == "1"])
+        scans = [page for process_id, page in references if process_id == "2"]
+        for start in range(0, len(scans) - 3, 4):
+            self.assertEqual(scans[start:start + 4], list(range(scans[start], scans[start] + 4)))
+
+    def test_routes_replay_workloads(self):
+        client = main.app.test_client()
+        client.environ_base["HTTP_X_SESSION_ID"] = "workload-tests"
+        main.sessions.remove("workload-tests")
+        spec = {"seed": 5, "processes": [{"model": "LOOP", "pages": 4}, {"model": "ZIPF", "pages": 6}]}
+        stats = client.post("/simulate_virtual_trace", json={"workload": spec, "references": 200, "reset": True}).json
+        self.assertEqual(stats["References"], 200)
+        stats = client.post("/simulate_segmentation_trace", json={"workload": spec, "references": 50, "max_size": 2}).json
+        self.assertEqual(stats["Requests"], 50)
+        sweep = client.post("/sweep", json={"workload": spec, "references": 300, "frames": [2, 4], "workers": 1}).json
+        self.assertEqual(sweep["References"], 300)
+        self.assertEqual(client.post("/simulate_trace", json={"workload": spec, "references": 0}).status_code, 400)
+        self.assertEqual(client.post("/simulate_trace", json={"workload": {"processes": "x"}, "references": 5}).status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
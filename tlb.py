@@ -0,0 +1,119 @@
+import collections
+import random
+
+# How a full TLB set picks the entry to drop
+TLB_REPLACEMENTS = ("LRU", "RANDOM")
+
+class TLB:
+    """Set-associative translation cache from (process_id, page_num) to frame.
+
+    A page goes to set page_num % sets. Entries are tagged with their
+    process, so other processes' translations stay valid across a switch
+    unless flush_on_switch is set. Every set is an OrderedDict from page to
+    frame kept in least to most recently used order, so a lookup, fill or
+    invalidation is O(1). RANDOM keeps an indexable list of each set's pages
+    alongside it for picking a victim in O(1).
+    """
+    def __init__(self, entries=16, associativity=None, replacement="LRU", flush_on_switch=False, seed=None):
+        associativity = entries if associativity is None else associativity
+        if entries <= 0:
+            raise ValueError("TLB entries must be positive")
+        if associativity <= 0 or entries % associativity:
+            raise ValueError("TLB associativity must divide the number of entries")
+        if replacement not in TLB_REPLACEMENTS:
+            raise ValueError(f"TLB replacement must be one of {', '.join(TLB_REPLACEMENTS)}")
+        self.entries = entries
+        self.associativity = associativity
+        self.sets = entries // associativity
+        self.replacement = replacement
+        self.flush_on_switch = flush_on_switch
+        self.random = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.flush()
+        self.current_process = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.evictions = 0
+
+    def flush(self):
+        self.lines = [collections.OrderedDict() for _ in range(self.sets)]  # set -> {page: frame}
+        self.ways = [[] for _ in range(self.sets)]  # For RANDOM: set -> its pages
+        self.slots = {}  # For RANDOM: page -> index in its set's ways
+
+    def lookup(self, process_id, page_num):
+        # Frame for the page, or None on a miss
+        if process_id != self.current_process:
+            if self.flush_on_switch and self.current_process is not None:
+                self.flush()
+                self.flushes += 1
+            self.current_process = process_id
+        page = (process_id, page_num)
+        line = self.lines[page_num % self.sets]
+        frame = line.get(page)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.replacement == "LRU":
+            line.move_to_end(page)
+        return frame
+
+    def insert(self, process_id, page_num, frame):
+        # Fill the page's set after a miss, dropping an entry if the set is full
+        page = (process_id, page_num)
+        index = page_num % self.sets
+        line = self.lines[index]
+        if page in line:
+            line[page] = frame
+            return
+        if len(line) >= self.associativity:
+            self.evictions += 1
+            if self.replacement == "LRU":
+                line.popitem(last=False)
+            else:
+                ways = self.ways[index]
+                slot = self.random.randrange(len(ways))
+                del line[ways[slot]]
+                del self.slots[ways[slot]]
+                ways[slot] = page
+                self.slots[page] = slot
+                line[page] = frame
+                return
+        line[page] = frame
+        if self.replacement == "RANDOM":
+            self.slots[page] = len(self.ways[index])
+            self.ways[index].append(page)
+
+    def invalidate(self, process_id, page_num):
+        # Drop the page's translation when it leaves its frame
+        page = (process_id, page_num)
+        index = page_num % self.sets
+        if self.lines[index].pop(page, None) is None or self.replacement != "RANDOM":
+            return
+        ways = self.ways[index]
+        slot = self.slots.pop(page)
+        last = ways.pop()
+        if last != page:
+            ways[slot] = last
+            self.slots[last] = slot
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self, page_size):
+        return {
+            "TLB Entries": self.entries,
+            "TLB Associativity": self.associativity,
+            "TLB Replacement": self.replacement,
+            "TLB Flush On Switch": self.flush_on_switch,
+            "TLB Reach": self.entries * page_size,  # Memory the TLB maps without a walk
+            "TLB Hits": self.hits,
+            "TLB Misses": self.misses,
+            "TLB Hit Ratio": self.hit_ratio(),
+            "TLB Flushes": self.flushes,
+            "TLB Evictions": self.evictions
+        }
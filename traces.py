@@ -0,0 +1,236 @@
+import itertools
+import mmap
+import os
+import shutil
+import struct
+
+# Binary page reference traces: a header, then fixed-width little-endian records.
+#   header: magic, version, flags, reserved, number of references
+#   plain record: process ID, page number, operation
+#   run record: process ID, first page, operation, page delta, references in the run
+# A run expands to count references of one process and operation whose pages
+# step by delta, so repeated pages (delta 0) and sequential scans (delta 1)
+# take one record however long they are.
+TRACE_MAGIC = b"PGTR"
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct("<4sBBHQ")
+PLAIN_RECORD = struct.Struct("<IqB")
+RUN_RECORD = struct.Struct("<IqBhI")
+FLAG_RUNS = 1
+
+# Operations a record can carry; the simulators treat every reference as a read
+OP_READ = 0
+OP_WRITE = 1
+
+MAX_RUN = 2 ** 32 - 1
+MAX_PROCESS = 2 ** 32 - 1
+MIN_PAGE, MAX_PAGE = -2 ** 63, 2 ** 63 - 1
+MIN_DELTA, MAX_DELTA = -2 ** 15, 2 ** 15 - 1
+
+def _records(references):
+    # (process_id, page_num, op) for references given with or without an operation
+    for reference in references:
+        if len(reference) == 2:
+            process_id, page_num = reference
+            op = OP_READ
+        else:
+            process_id, page_num, op = reference
+        try:
+            process = int(process_id)
+        except ValueError:
+            raise ValueError(f"Trace files hold numeric process IDs, not {process_id!r}") from None
+        if not 0 <= process <= MAX_PROCESS:
+            raise ValueError(f"Trace process IDs must be between 0 and {MAX_PROCESS}, not {process}")
+        page_num = int(page_num)
+        if not MIN_PAGE <= page_num <= MAX_PAGE:
+            raise ValueError(f"Page {page_num} does not fit in a trace record")
+        yield process, page_num, op
+
+def _runs(records):
+    # Group records into (process, page, op, delta, count) runs
+    run = None
+    for process, page_num, op in records:
+        if run is not None:
+            run_process, first, run_op, delta, count = run
+            if process == run_process and op == run_op and count < MAX_RUN:
+                if count == 1 and MIN_DELTA <= page_num - first <= MAX_DELTA:
+                    run = (process, first, op, page_num - first, 2)
+                    continue
+                if count > 1 and page_num == first + delta * count:
+                    run = (process, first, op, delta, count + 1)
+                    continue
+            yield run
+        run = (process, page_num, op, 0, 1)
+    if run is not None:
+        yield run
+
+def write_trace(path, references, compress=False, buffer_records=65536):
+    """Write (process_id, page_num[, op]) references to a binary trace file.
+
+    References are streamed, so any iterable works in constant memory.
+    With compress, records are delta/run-length runs. Returns the number
+    of references written.
+    """
+    record = RUN_RECORD if compress else PLAIN_RECORD
+    records = _records(references)
+    if compress:
+        records = _runs(records)
+    total = 0
+    with open(path, "wb") as f:
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FLAG_RUNS if compress else 0, 0, 0))
+        while True:
+            batch = list(itertools.islice(records, buffer_records))
+            if not batch:
+                break
+            f.write(b"".join(record.pack(*fields) for fields in batch))
+            total += sum(fields[4] for fields in batch) if compress else len(batch)
+        f.seek(0)
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FLAG_RUNS if compress else 0, 0, total))
+    return total
+
+def concatenate_traces(paths, destination):
+    """Join trace files of one kind, plain or run records, into one in order.
+
+    Records are copied as they are, so runs are not merged across files.
+    Returns the number of references written.
+    """
+    kinds = set()
+    total = 0
+    with open(destination, "wb") as out:
+        out.write(bytes(TRACE_HEADER.size))
+        for path in paths:
+            with open(path, "rb") as f:
+                compressed, references = read_header(f.read(TRACE_HEADER.size))
+                kinds.add(compressed)
+                shutil.copyfileobj(f, out)
+            total += references
+        if len(kinds) > 1:
+            raise ValueError("Cannot join plain and run-record traces")
+        compressed = kinds.pop() if kinds else False
+        out.seek(0)
+        out.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FLAG_RUNS if compressed else 0, 0, total))
+    return total
+
+def read_header(header):
+    """(compressed, references) from the first TRACE_HEADER.size bytes of a trace."""
+    if len(header) < TRACE_HEADER.size:
+        raise ValueError("Trace file is shorter than its header")
+    magic, version, flags, _, references = TRACE_HEADER.unpack_from(header)
+    if magic != TRACE_MAGIC:
+        raise ValueError("Not a binary page trace")
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version}")
+    return bool(flags & FLAG_RUNS), references
+
+class TraceFile:
+    """Memory-mapped binary trace, read in chunks without copying the file.
+
+    Iterating yields (process_id, page_num) references with process IDs as
+    strings, as the simulators expect, so a TraceFile can be handed
+    straight to replay_trace. The file is mapped only while it is being
+    read, and only one chunk of references is materialized at a time, so
+    memory use does not grow with the trace. A TraceFile pickles as its
+    path, so it can be passed to worker processes.
+    """
+    def __init__(self, path, chunk_references=65536):
+        self.path = path
+        self.chunk_references = chunk_references
+        with open(path, "rb") as f:
+            self.compressed, self.references = read_header(f.read(TRACE_HEADER.size))
+            size = os.fstat(f.fileno()).st_size
+        self.record = RUN_RECORD if self.compressed else PLAIN_RECORD
+        if (size - TRACE_HEADER.size) % self.record.size:
+            raise ValueError("Trace file ends in a partial record")
+        self.records = (size - TRACE_HEADER.size) // self.record.size
+        # Every run holds at least one reference, and a plain record exactly one
+        if self.references < self.records or not self.compressed and self.references != self.records:
+            raise ValueError(f"Trace header says {self.references} references but the file holds {self.records} records")
+
+    def __len__(self):
+        return self.references
+
+    def __getstate__(self):
+        return {"path": self.path, "chunk_references": self.chunk_references}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["chunk_references"])
+
+    def record_chunks(self):
+        # Raw record tuples, one chunk of the mapped file at a time
+        if not self.records:
+            return
+        step = self.chunk_references * self.record.size
+        end = TRACE_HEADER.size + self.records * self.record.size
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(TRACE_HEADER.size, end, step):
+                    # Views are released before yielding, so the map can close if the reader stops early
+                    with view[offset:min(offset + step, end)] as chunk:
+                        records = list(self.record.iter_unpack(chunk))
+                    yield records
+
+    def chunks(self, with_ops=False):
+        """Lists of up to chunk_references (process_id, page_num) references.
+
+        With with_ops the references are (process_id, page_num, op). Long
+        runs are split across chunks, so no chunk outgrows the limit.
+        """
+        limit = self.chunk_references
+        names = {}  # Process number -> its string ID, built once per process
+        chunk = []
+        for records in self.record_chunks():
+            for fields in records:
+                process_id = names.get(fields[0])
+                if process_id is None:
+                    process_id = names[fields[0]] = str(fields[0])
+                if not self.compressed:
+                    chunk.append((process_id, fields[1], fields[2]) if with_ops else (process_id, fields[1]))
+                    if len(chunk) == limit:
+                        yield chunk
+                        chunk = []
+                    continue
+                _, first, op, delta, count = fields
+                done = 0
+                while done < count:
+                    take = min(count - done, limit - len(chunk))
+                    if with_ops:
+                        chunk.extend((process_id, first + delta * i, op) for i in range(done, done + take))
+                    else:
+                        chunk.extend((process_id, first + delta * i) for i in range(done, done + take))
+                    done += take
+                    if len(chunk) == limit:
+                        yield chunk
+                        chunk = []
+        if chunk:
+            yield chunk
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.chunks())
+
+def read_text_trace(lines, process_id=1):
+    """References from lines of comma-separated text, as typed into the visualizer.
+
+    Entries are page numbers for process_id or process:page pairs.
+    """
+    for line in lines:
+        for item in line.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if ":" in item:
+                process, page_num = item.split(":")
+                yield process.strip(), int(page_num)
+            else:
+                yield str(process_id), int(item)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert a comma-separated page trace to the binary trace format")
+    parser.add_argument("source", help="text trace: page numbers or process:page pairs, separated by commas or lines")
+    parser.add_argument("destination")
+    parser.add_argument("--process-id", default=1, help="process of entries given as bare page numbers")
+    parser.add_argument("--compress", action="store_true", help="write delta/run-length records")
+    args = parser.parse_args()
+    with open(args.source) as source:
+        written = write_trace(args.destination, read_text_trace(source, args.process_id), args.compress)
+    print(f"Wrote {written} references to {args.destination}")
@@ -0,0 +1,361 @@
+import bisect
+import itertools
+import random
+import zlib
+
+try:
+    import numpy
+except ImportError:  # Only workload blocks need NumPy; lazy references work without it
+    numpy = None
+
+# Page reference models: a Workload interleaves one of these per process.
+# Each model is a stream with its own state, reset with a seed before use.
+class PageModel:
+    """Base for the page models: pages offset to offset + pages - 1, drawn one at a time or in blocks."""
+    def __init__(self, pages, offset=0):
+        if pages <= 0:
+            raise ValueError("A workload model needs at least one page")
+        if offset < 0:
+            raise ValueError("Page offset must not be negative")
+        self.pages = pages
+        self.offset = offset
+        self.reset()
+
+    @property
+    def span(self):
+        # Pages a process needs for every reference to land: 0 to the highest page
+        return self.offset + self.pages
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        self.np_rng = numpy.random.default_rng(seed) if numpy is not None else None
+        self.position = 0  # References drawn since the reset
+
+    def next(self):
+        page = self.offset + self._page()
+        self.position += 1
+        return page
+
+    def block(self, count):
+        """The next count pages as a NumPy array."""
+        if self.np_rng is None:
+            raise ImportError("NumPy is needed for workload blocks")
+        pages = self.offset + self._block(count)
+        self.position += count
+        return pages
+
+class UniformPages(PageModel):
+    """Every page equally likely."""
+    def _page(self):
+        return self.rng.randrange(self.pages)
+
+    def _block(self, count):
+        return self.np_rng.integers(0, self.pages, count)
+
+class ZipfPages(PageModel):
+    """Page k is referenced in proportion to 1 / (k + 1) ** exponent; page 0 is the hottest.
+
+    Sampling inverts the cumulative weights with a binary search, so a
+    reference costs O(log pages) whatever the exponent.
+    """
+    def __init__(self, pages, exponent=1.0, offset=0):
+        if exponent < 0:
+            raise ValueError("Zipf exponent must not be negative")
+        self.exponent = exponent
+        self.cumulative = list(itertools.accumulate((rank + 1) ** -exponent for rank in range(pages)))
+        self.cumulative_array = numpy.array(self.cumulative) if numpy is not None else None
+        super().__init__(pages, offset)
+
+    def _page(self):
+        return min(bisect.bisect_right(self.cumulative, self.rng.random() * self.cumulative[-1]), self.pages - 1)
+
+    def _block(self, count):
+        draws = self.np_rng.random(count) * self.cumulative[-1]
+        return numpy.minimum(numpy.searchsorted(self.cumulative_array, draws, side="right"), self.pages - 1)
+
+class SequentialPages(PageModel):
+    """Scans of run consecutive pages, each starting at a random page."""
+    def __init__(self, pages, run=64, offset=0):
+        if run <= 0:
+            raise ValueError("Scan run must be at least one page")
+        self.run = min(run, pages)
+        super().__init__(pages, offset)
+
+    def reset(self, seed=None):
+        super().reset(seed)
+        self.next_page = 0
+        self.left = 0  # Pages left in the current scan
+
+    def _page(self):
+        if not self.left:
+            self.next_page = self.rng.randrange(self.pages - self.run + 1)
+            self.left = self.run
+        page = self.next_page
+        self.next_page += 1
+        self.left -= 1
+        return page
+
+    def _block(self, count):
+        # Finish the current scan, then start as many new ones as the block needs
+        head = numpy.arange(self.next_page, self.next_page + min(self.left, count))
+        rest = count - len(head)
+        self.next_page += len(head)
+        self.left -= len(head)
+        if not rest:
+            return head
+        scans = -(-rest // self.run)
+        starts = self.np_rng.integers(0, self.pages - self.run + 1, scans)
+        tail = (starts[:, None] + numpy.arange(self.run)).ravel()[:rest]
+        self.left = scans * self.run - rest
+        self.next_page = int(tail[-1]) + 1
+        return numpy.concatenate((head, tail))
+
+class LoopPages(PageModel):
+    """Pages 0 to pages - 1 over and over."""
+    def _page(self):
+        return self.position % self.pages
+
+    def _block(self, count):
+        return (self.position + numpy.arange(count)) % self.pages
+
+class StridedPages(PageModel):
+    """Every stride-th page, wrapping around the pages."""
+    def __init__(self, pages, stride=1, offset=0):
+        if stride <= 0:
+            raise ValueError("Stride must be positive")
+        self.stride = stride
+        super().__init__(pages, offset)
+
+    def _page(self):
+        return self.position * self.stride % self.pages
+
+    def _block(self, count):
+        return (self.position % self.pages + numpy.arange(count)) * self.stride % self.pages
+
+class PhasedPages:
+    """Cycles through (model, length) phases, so the working set shifts every phase.
+
+    Give the phases different offsets to move the working set to new pages.
+    """
+    def __init__(self, phases):
+        if not phases or any(length <= 0 for _, length in phases):
+            raise ValueError("Phases need a model and a positive length each")
+        self.phases = phases
+        self.reset()
+
+    @property
+    def span(self):
+        return max(model.span for model, _ in self.phases)
+
+    def reset(self, seed=None):
+        for i, (model, _) in enumerate(self.phases):
+            model.reset(None if seed is None else seed * 31 + i)
+        self.phase = 0
+        self.left = self.phases[0][1]  # References left in the current phase
+
+    def _advance(self, count):
+        self.left -= count
+        if not self.left:
+            self.phase = (self.phase + 1) % len(self.phases)
+            self.left = self.phases[self.phase][1]
+
+    def next(self):
+        page = self.phases[self.phase][0].next()
+        self._advance(1)
+        return page
+
+    def block(self, count):
+        parts = []
+        while count:
+            take = min(count, self.left)
+            parts.append(self.phases[self.phase][0].block(take))
+            self._advance(take)
+            count -= take
+        return numpy.concatenate(parts)
+
+WORKLOAD_MODELS = {
+    "UNIFORM": UniformPages,
+    "ZIPF": ZipfPages,
+    "SEQUENTIAL": SequentialPages,
+    "LOOP": LoopPages,
+    "STRIDED": StridedPages,
+    "PHASED": PhasedPages,
+}
+
+WORKLOAD_SCHEDULES = ("ROUND_ROBIN", "RANDOM")
+
+class Workload:
+    """Page references from several processes, each following its own model.
+
+    The schedule picks the process for each burst of quantum references:
+    in turn (ROUND_ROBIN) or at random in proportion to weights (RANDOM).
+    references() yields (process_id, page_num) pairs lazily and blocks()
+    yields NumPy arrays, so neither holds the trace in memory. Every call
+    starts the streams over from the seed, so with a seed the same
+    workload can be replayed as often as needed.
+    """
+    def __init__(self, processes, schedule="ROUND_ROBIN", quantum=1, weights=None, seed=None):
+        processes = list(processes.items()) if isinstance(processes, dict) else list(processes)
+        if not processes:
+            raise ValueError("A workload needs at least one process")
+        if schedule not in WORKLOAD_SCHEDULES:
+            raise ValueError(f"Schedule must be one of {', '.join(WORKLOAD_SCHEDULES)}")
+        if quantum <= 0:
+            raise ValueError("Quantum must be at least one reference")
+        if weights is not None and (len(weights) != len(processes) or min(weights) < 0 or not sum(weights)):
+            raise ValueError("Weights need one non-negative value per process, not all zero")
+        self.process_ids = [str(process_id) for process_id, _ in processes]
+        self.models = [model for _, model in processes]
+        self.schedule = schedule
+        self.quantum = quantum
+        self.weights = weights or [1] * len(processes)
+        self.seed = seed
+
+    def page_counts(self):
+        # Pages each process needs, for allocate_virtual before a Virtual Memory replay
+        return {process_id: model.span for process_id, model in zip(self.process_ids, self.models)}
+
+    def _reset(self):
+        for i, model in enumerate(self.models):
+            model.reset(None if self.seed is None else self.seed * 1000003 + i)
+        return random.Random(self.seed)
+
+    def references(self, count=None):
+        """(process_id, page_num) pairs, count of them or without end."""
+        rng = self._reset()
+        processes = range(len(self.models))
+        produced = 0
+        for turn in itertools.count():
+            if self.schedule == "ROUND_ROBIN":
+                process = turn % len(self.models)
+            else:
+                process = rng.choices(processes, self.weights)[0]
+            process_id, model = self.process_ids[process], self.models[process]
+            burst = self.quantum if count is None else min(self.quantum, count - produced)
+            for _ in range(burst):
+                yield process_id, model.next()
+            produced += burst
+            if count is not None and produced >= count:
+                return
+
+    def blocks(self, count, block_size=65536):
+        """(process indexes, pages) NumPy array pairs covering count references.
+
+        Index i stands for process_ids[i]. Blocks are rounded up to whole
+        quanta, and each process's pages are drawn with one vectorized call.
+        """
+        if numpy is None:
+            raise ImportError("NumPy is needed for workload blocks")
+        self._reset()
+        schedule_rng = numpy.random.default_rng(self.seed)
+        probabilities = numpy.array(self.weights, dtype=float) / sum(self.weights)
+        block_size = max(block_size // self.quantum, 1) * self.quantum
+        turns = 0
+        for start in range(0, count, block_size):
+            size = min(block_size, count - start)
+            bursts = -(-size // self.quantum)
+            if self.schedule == "ROUND_ROBIN":
+                order = (turns + numpy.arange(bursts)) % len(self.models)
+            else:
+                order = schedule_rng.choice(len(self.models), bursts, p=probabilities)
+            turns += bursts
+            owners = numpy.repeat(order, self.quantum)[:size]
+            pages = numpy.empty(size, dtype=numpy.int64)
+            for process, model in enumerate(self.models):
+                mask = owners == process
+                drawn = int(mask.sum())
+                if drawn:
+                    pages[mask] = model.block(drawn)
+            yield owners, pages
+
+    def block_references(self, count, block_size=65536):
+        # references() generated in NumPy blocks, for consumers that take (process_id, page_num) pairs
+        process_ids = numpy.array(self.process_ids, dtype=object)
+        for owners, pages in self.blocks(count, block_size):
+            yield from zip(process_ids[owners].tolist(), pages.tolist())
+
+    def segment_requests(self, count=None, min_size=1, max_size=8):
+        """(process_id, segment_id, size) requests for the Segmentation simulator.
+
+        Pages become segment IDs. Each segment always asks for the same
+        size, between min_size and max_size, taken from a hash of its name.
+        """
+        if not 0 < min_size <= max_size:
+            raise ValueError("Segment sizes need 0 < min_size <= max_size")
+        sizes = max_size - min_size + 1
+        for process_id, segment_id in self.references(count):
+            size = min_size + zlib.crc32(f"{process_id}:{segment_id}".encode()) % sizes
+            yield process_id, segment_id, size
+
+class WorkloadTrace:
+    """count references of a workload, replayable like a trace file.
+
+    Iterating replays the workload from the start, so routes that read a
+    trace twice (allocating Virtual Memory pages, then replaying) see the
+    same references both times. A workload without a seed is given one.
+    With segment_sizes (min_size, max_size) iterating yields segment
+    requests instead.
+    """
+    def __init__(self, workload, count, segment_sizes=None):
+        if count < 0:
+            raise ValueError("Reference count must not be negative")
+        if workload.seed is None:
+            workload.seed = random.randrange(2 ** 32)
+        self.workload = workload
+        self.count = count
+        self.segment_sizes = segment_sizes
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if self.segment_sizes is not None:
+            return self.workload.segment_requests(self.count, *self.segment_sizes)
+        return self.workload.references(self.count)
+
+def model_from_spec(spec):
+    """A page model from its JSON form, e.g. {"model": "ZIPF", "pages": 1000, "exponent": 1.2}.
+
+    PHASED takes "phases": a list of model specs with a "length" each.
+    """
+    name = spec.get("model")
+    if name not in WORKLOAD_MODELS:
+        raise ValueError(f"Workload model must be one of {', '.join(WORKLOAD_MODELS)}")
+    if name == "PHASED":
+        phases = spec.get("phases")
+        if not isinstance(phases, list):
+            raise ValueError("PHASED needs a list of 'phases'")
+        return PhasedPages([(model_from_spec(phase), int(phase.get("length", 0))) for phase in phases])
+    parameters = {key: value for key, value in spec.items() if key not in ("model", "process_id", "length")}
+    try:
+        return WORKLOAD_MODELS[name](**parameters)
+    except TypeError as e:
+        raise ValueError(f"Bad parameters for {name}: {e}") from None
+
+def workload_from_spec(spec):
+    """A Workload from its JSON form: {"processes": [{"process_id": "1", "model": ...}, ...], "seed": 1, ...}."""
+    processes = spec.get("processes")
+    if not isinstance(processes, list) or not processes:
+        raise ValueError("A workload needs a list of 'processes'")
+    return Workload(
+        [(process.get("process_id", i + 1), model_from_spec(process)) for i, process in enumerate(processes)],
+        schedule=spec.get("schedule", "ROUND_ROBIN"),
+        quantum=int(spec.get("quantum", 1)),
+        weights=spec.get("weights"),
+        seed=spec.get("seed")
+    )
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from traces import write_trace
+    parser = argparse.ArgumentParser(description="Write a generated workload to a binary trace file")
+    parser.add_argument("spec", help="JSON workload spec, as taken by workload_from_spec")
+    parser.add_argument("destination")
+    parser.add_argument("--references", type=int, required=True)
+    parser.add_argument("--compress", action="store_true", help="write delta/run-length records")
+    args = parser.parse_args()
+    with open(args.spec) as f:
+        workload = workload_from_spec(json.load(f))
+    written = write_trace(args.destination, workload.references(args.references), args.compress)
+    print(f"Wrote {written} references to {args.destination}")